@@ -6,12 +6,59 @@ Version complète prête à l'emploi
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Optional, Union
+from event_store import PlayerEventIndex
 
 
 class AdvancedMetrics:
     """Calcule des métriques avancées de football"""
     
+    # Poids du score d'efficacité (normalisation : taux /100, matchs /30, le reste /10)
+    EFFICIENCY_WEIGHTS = {
+        'goals_per_90': 0.15,
+        'xG_per_90': 0.10,
+        'assists_per_90': 0.10,
+        'key_passes_per_90': 0.08,
+        'pass_completion_rate': 0.10,
+        'dribble_success_rate': 0.08,
+        'tackles_per_90': 0.08,
+        'interceptions_per_90': 0.08,
+        'shot_accuracy': 0.08,
+        'matches_played': 0.05
+    }
+    
+    # Pondérations prédéfinies par poste (clés : postes de select_features)
+    EFFICIENCY_PROFILES = {
+        'all': EFFICIENCY_WEIGHTS,
+        'forward': {
+            'goals_per_90': 0.30,
+            'xG_per_90': 0.20,
+            'shot_accuracy': 0.15,
+            'assists_per_90': 0.10,
+            'key_passes_per_90': 0.10,
+            'dribble_success_rate': 0.10,
+            'matches_played': 0.05
+        },
+        'midfielder': {
+            'key_passes_per_90': 0.20,
+            'pass_completion_rate': 0.20,
+            'assists_per_90': 0.15,
+            'dribble_success_rate': 0.10,
+            'tackles_per_90': 0.10,
+            'interceptions_per_90': 0.10,
+            'xG_per_90': 0.10,
+            'matches_played': 0.05
+        },
+        'defender': {
+            'tackles_per_90': 0.25,
+            'interceptions_per_90': 0.25,
+            'pass_completion_rate': 0.20,
+            'clearances_per_90': 0.15,
+            'blocks_per_90': 0.10,
+            'matches_played': 0.05
+        },
+    }
+    
     @staticmethod
     def calculate_progressive_actions(events: pd.DataFrame) -> Dict:
         """Calcule les actions progressives"""
@@ -118,8 +165,8 @@ class AdvancedMetrics:
         return metrics
     
     @staticmethod
-    def calculate_zones_activity(events: pd.DataFrame, player: str) -> Dict:
-        """Calcule l'activité par zone du terrain"""
+    def calculate_zones_activity(events: Union[pd.DataFrame, PlayerEventIndex], player: str) -> Dict:
+        """Calcule l'activité par zone du terrain (events : DataFrame ou index par joueur)"""
         zones = {
             'defensive_third': 0,
             'middle_third': 0,
@@ -127,7 +174,10 @@ class AdvancedMetrics:
         }
         
         try:
-            player_events = events[events['player'] == player].copy()
+            if isinstance(events, PlayerEventIndex):
+                player_events = events.player_events(player)
+            else:
+                player_events = events[events['player'] == player].copy()
             
             if 'location' in player_events.columns:
                 for idx, event in player_events.iterrows():
@@ -172,55 +222,186 @@ class AdvancedMetrics:
         return round(xA, 2)
     
     @staticmethod
-    def calculate_player_efficiency_score(stats: pd.Series) -> float:
+    def efficiency_scale(metric: str) -> float:
+        """Valeur d'une métrique correspondant au maximum du score (taux : 100, matchs : 30, sinon 10)"""
+        if 'rate' in metric or 'accuracy' in metric:
+            return 100.0
+        if metric == 'matches_played':
+            return 30.0
+        return 10.0
+    
+    @staticmethod
+    def calculate_player_efficiency_score(stats: pd.Series, weights: Optional[Dict[str, float]] = None) -> float:
         """Score d'efficacité global (0-100)"""
         try:
-            weights = {
-                'goals_per_90': 0.15,
-                'xG_per_90': 0.10,
-                'assists_per_90': 0.10,
-                'key_passes_per_90': 0.08,
-                'pass_completion_rate': 0.10,
-                'dribble_success_rate': 0.08,
-                'tackles_per_90': 0.08,
-                'interceptions_per_90': 0.08,
-                'shot_accuracy': 0.08,
-                'matches_played': 0.05
-            }
-            
             score = 0.0
-            for metric, weight in weights.items():
+            for metric, weight in (weights or AdvancedMetrics.EFFICIENCY_WEIGHTS).items():
                 if metric in stats.index and pd.notna(stats.get(metric)):
                     value = float(stats[metric])
-                    
-                    if 'rate' in metric or 'accuracy' in metric:
-                        normalized = min(value / 100, 1)
-                    elif metric == 'matches_played':
-                        normalized = min(value / 30, 1)
-                    else:
-                        normalized = min(value / 10, 1)
-                    
+                    normalized = min(value / AdvancedMetrics.efficiency_scale(metric), 1)
                     score += normalized * weight * 100
             
             return round(score, 1)
         except Exception as e:
             print(f"Erreur efficiency score: {e}")
             return 50.0
+    
+    @staticmethod
+    def normalized_efficiency_inputs(df: pd.DataFrame, metrics: List[str]) -> np.ndarray:
+        """
+        Matrice (joueurs x métriques) des valeurs normalisées du score d'efficacité
+        Métrique absente ou valeur manquante : 0 (aucune contribution)
+        """
+        values = np.zeros((len(df), len(metrics)))
+        for position, metric in enumerate(metrics):
+            if metric in df.columns:
+                values[:, position] = pd.to_numeric(df[metric], errors='coerce').to_numpy(dtype=float)
+        
+        scales = np.array([AdvancedMetrics.efficiency_scale(metric) for metric in metrics])
+        normalized = np.minimum(values / scales, 1.0) if len(metrics) else values
+        return np.nan_to_num(normalized, nan=0.0)
+    
+    @staticmethod
+    def calculate_efficiency_score_matrix(df: pd.DataFrame,
+                                          weight_sets: Optional[Dict[str, Dict[str, float]]] = None) -> pd.DataFrame:
+        """
+        Scores d'efficacité de tous les joueurs pour plusieurs pondérations en une passe
+        
+        Args:
+            df: Stats par joueur
+            weight_sets: {nom: {métrique: poids}} (défaut: EFFICIENCY_PROFILES)
+        
+        Returns:
+            Une colonne par pondération (index de df)
+        """
+        weight_sets = weight_sets or AdvancedMetrics.EFFICIENCY_PROFILES
+        metrics = list(dict.fromkeys(metric for weights in weight_sets.values() for metric in weights))
+        
+        # Matrice des poids (métriques x pondérations) : un seul produit matriciel
+        weight_matrix = np.array([[weights.get(metric, 0.0) for weights in weight_sets.values()]
+                                  for metric in metrics]).reshape(len(metrics), len(weight_sets))
+        scores = AdvancedMetrics.normalized_efficiency_inputs(df, metrics) @ weight_matrix * 100
+        
+        return pd.DataFrame(scores, index=df.index, columns=list(weight_sets)).round(1)
+    
+    @staticmethod
+    def calculate_efficiency_scores(df: pd.DataFrame, weights: Optional[Dict[str, float]] = None) -> pd.Series:
+        """Score d'efficacité (0-100) de toutes les lignes en une passe"""
+        scores = AdvancedMetrics.calculate_efficiency_score_matrix(
+            df, {'efficiency_score': weights or AdvancedMetrics.EFFICIENCY_WEIGHTS}
+        )
+        return scores['efficiency_score']
+    
+    @staticmethod
+    def _x_coordinate(events: pd.DataFrame, column: str) -> pd.Series:
+        """Abscisse d'une colonne de position (colonne <col>_x du parseur rapide, sinon listes [x, y])"""
+        if f'{column}_x' in events.columns:
+            return pd.to_numeric(events[f'{column}_x'], errors='coerce')
+        if column not in events.columns:
+            return pd.Series(np.nan, index=events.index)
+        return events[column].map(
+            lambda loc: float(loc[0]) if isinstance(loc, (list, tuple, np.ndarray)) and len(loc) > 0 else np.nan
+        ).astype(float)
+    
+    @staticmethod
+    def _key_pass_xa(events: pd.DataFrame) -> pd.Series:
+        """
+        xG du tir créé par chaque passe clé (0 pour les autres événements)
+        Lien shot_key_pass_id -> id si disponible, sinon premier tir parmi les 3 événements
+        suivants du même match
+        """
+        xa = pd.Series(0.0, index=events.index)
+        if 'pass_shot_assist' not in events.columns or 'shot_statsbomb_xg' not in events.columns:
+            return xa
+        
+        key_passes = (events['type'] == 'Pass') & (events['pass_shot_assist'] == True)
+        if not key_passes.any():
+            return xa
+        
+        shot_xg = pd.to_numeric(events['shot_statsbomb_xg'], errors='coerce')
+        shots = events['type'] == 'Shot'
+        
+        if 'shot_key_pass_id' in events.columns and 'id' in events.columns:
+            linked = shots & events['shot_key_pass_id'].notna()
+            xg_by_pass = shot_xg[linked].groupby(events.loc[linked, 'shot_key_pass_id']).first()
+            xa[key_passes] = events.loc[key_passes, 'id'].map(xg_by_pass).fillna(0.0).values
+            return xa
+        
+        # Fenêtre de 3 événements dans l'ordre du match
+        match = events['match_id'] if 'match_id' in events.columns else pd.Series(0, index=events.index)
+        found = pd.Series(False, index=events.index)
+        for offset in range(1, 4):
+            next_shot = shots.groupby(match, sort=False).shift(-offset).fillna(False).astype(bool)
+            next_xg = shot_xg.groupby(match, sort=False).shift(-offset)
+            first = key_passes & next_shot & ~found
+            xa[first] = next_xg[first].fillna(0.0)
+            found |= first
+        return xa
+    
+    @staticmethod
+    def calculate_all_players(events: pd.DataFrame) -> pd.DataFrame:
+        """
+        Métriques avancées de tous les joueurs en une passe (opérations groupées)
+        
+        Args:
+            events: Événements de toute la saison (un seul DataFrame, colonne 'player')
+        
+        Returns:
+            Une ligne par joueur (index : joueur) : actions progressives, pressing,
+            créativité, activité par zone, xA
+        """
+        events = events[events['player'].notna()]
+        if events.empty:
+            return pd.DataFrame()
+        
+        event_type = events['type']
+        passes = event_type == 'Pass'
+        pressures = event_type == 'Pressure'
+        start_x = AdvancedMetrics._x_coordinate(events, 'location')
+        
+        def flag(column: str) -> pd.Series:
+            return passes & (events[column] == True) if column in events.columns else pd.Series(False, index=events.index)
+        
+        counts = pd.DataFrame({
+            'progressive_passes': passes & (AdvancedMetrics._x_coordinate(events, 'pass_end_location') - start_x > 10),
+            'progressive_carries': (event_type == 'Carry') & (AdvancedMetrics._x_coordinate(events, 'carry_end_location') - start_x > 5),
+            'pressures': pressures,
+            'successful_pressures': pressures & events['pressure_outcome'].notna() if 'pressure_outcome' in events.columns else False,
+            'through_balls': flag('pass_through_ball'),
+            'switches_of_play': flag('pass_switch'),
+            'located_actions': start_x.notna(),
+            'attacking_third_actions': start_x >= 80,
+            'xA': AdvancedMetrics._key_pass_xa(events),
+        }, index=events.index)
+        
+        per_player = counts.groupby(events['player'], sort=False, observed=True).sum()
+        per_player = per_player.astype({col: int for col in per_player.columns if col != 'xA'})
+        
+        per_player['pressure_success_rate'] = (
+            per_player['successful_pressures'] / per_player['pressures'].replace(0, np.nan) * 100
+        ).fillna(0.0)
+        per_player['attacking_third_pct'] = (
+            per_player['attacking_third_actions'] / per_player['located_actions'].replace(0, np.nan) * 100
+        ).round(1).fillna(0.0)
+        per_player['xA'] = per_player['xA'].round(2)
+        per_player.index.name = 'player'
+        
+        return per_player
 
 
-def add_advanced_metrics_to_dataframe(df: pd.DataFrame, all_events: Dict) -> pd.DataFrame:
+def add_advanced_metrics_to_dataframe(df: pd.DataFrame,
+                                      all_events: Union[pd.DataFrame, PlayerEventIndex, Dict[str, pd.DataFrame]]) -> pd.DataFrame:
     """
     Ajoute les métriques avancées au DataFrame
     
     Args:
         df: DataFrame avec stats de base
-        all_events: Dict {player_name: events_df}
+        all_events: Événements de la saison en un seul DataFrame (ex:
+            FootballRecruitmentAnalyzer.load_season_events), PlayerEventIndex ou dict {player_name: events_df}
     
     Returns:
-        DataFrame enrichi
+        DataFrame enrichi (joueurs sans événements : valeurs inchangées, 0 par défaut)
     """
-    advanced = AdvancedMetrics()
-    
     # Initialiser les colonnes
     new_columns = [
         'progressive_passes', 'progressive_carries', 'pressures_per_90',
@@ -232,40 +413,32 @@ def add_advanced_metrics_to_dataframe(df: pd.DataFrame, all_events: Dict) -> pd.
         if col not in df.columns:
             df[col] = 0.0
     
-    for idx, row in df.iterrows():
-        player = row['player']
-        matches = row.get('matches_played', 1)
+    try:
+        if isinstance(all_events, PlayerEventIndex):
+            all_events = all_events.events
+        elif isinstance(all_events, dict):
+            frames = [events.assign(player=player) for player, events in all_events.items() if len(events) > 0]
+            all_events = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
         
-        if player in all_events:
-            try:
-                events = all_events[player]
-                
-                # Métriques progressives
-                progressive = advanced.calculate_progressive_actions(events)
-                df.at[idx, 'progressive_passes'] = progressive['progressive_passes']
-                df.at[idx, 'progressive_carries'] = progressive['progressive_carries']
-                
-                # Métriques défensives
-                defensive = advanced.calculate_defensive_metrics(events)
-                df.at[idx, 'pressures_per_90'] = (defensive['pressures'] / matches) if matches > 0 else 0
-                df.at[idx, 'pressure_success_rate'] = defensive['pressure_success_rate']
-                
-                # Métriques de créativité
-                creativity = advanced.calculate_creativity_metrics(events)
-                df.at[idx, 'through_balls'] = creativity['through_balls']
-                df.at[idx, 'switches_of_play'] = creativity['switches_of_play']
-                
-                # Zones
-                zones = advanced.calculate_zones_activity(events, player)
-                df.at[idx, 'attacking_third_pct'] = zones.get('attacking_third', 0)
-                
-                # xA
-                df.at[idx, 'xA'] = advanced.calculate_expected_assists(events)
-                
-                # Score d'efficacité
-                df.at[idx, 'efficiency_score'] = advanced.calculate_player_efficiency_score(row)
-            except Exception as e:
-                print(f"Erreur pour {player}: {e}")
+        if all_events is None or all_events.empty:
+            return df
+        
+        per_player = AdvancedMetrics.calculate_all_players(all_events)
+        if per_player.empty:
+            return df
+        
+        # Une seule jointure sur le nom du joueur
+        joined = df[['player']].join(per_player, on='player')
+        matched = df['player'].isin(per_player.index)
+        
+        matches = df['matches_played'] if 'matches_played' in df.columns else pd.Series(1, index=df.index)
+        joined['pressures_per_90'] = (joined['pressures'] / matches.where(matches > 0)).fillna(0.0)
+        joined['efficiency_score'] = AdvancedMetrics.calculate_efficiency_scores(df)
+        
+        for col in new_columns:
+            df[col] = joined[col].where(matched, df[col])
+    except Exception as e:
+        print(f"Erreur métriques avancées: {e}")
     
     return df
 
@@ -286,9 +286,14 @@ class AdvancedPlayerAnalyzer:
     def predict_future_performance(self, 
                                    player_name: str,
                                    df: pd.DataFrame,
-                                   months_ahead: int = 6) -> Dict:
+                                   months_ahead: int = 6,
+                                   form_stats: Optional[pd.DataFrame] = None) -> Dict:
         """
         Prédit la performance future d'un joueur
+        
+        Args:
+            form_stats: Forme du moment (PlayerFormStore.form_table) : la tendance
+                combine alors le modèle et la dynamique récente (EWM vs moyenne)
         """
         if not self.is_fitted:
             print("❌ Système non entraîné")
@@ -321,15 +326,22 @@ class AdvancedPlayerAnalyzer:
             # Moyenne pondérée
             ensemble_pred = (rf_pred * 0.5 + gb_pred * 0.5)
             
-            # 5. Tendance (simplifiée)
+            # 5. Tendance : écart modèle / saison, + dynamique récente si disponible
             current_goals = player_data['goals_per_90'].values[0]
             trend = ensemble_pred - current_goals
             
+            form_row = None
+            if form_stats is not None and 'goals_form_delta' in form_stats.columns:
+                form_rows = form_stats[form_stats['player'] == player_name]
+                if not form_rows.empty:
+                    form_row = form_rows.iloc[0]
+                    trend = 0.5 * trend + 0.5 * form_row['goals_form_delta']
+            
             # 6. Prédiction future avec facteur temps
             decay_factor = 0.95 ** (months_ahead / 6)  # Décroissance avec le temps
             future_pred = current_goals + (trend * decay_factor)
             
-            return {
+            prediction = {
                 'player': player_name,
                 'current_goals_per_90': round(current_goals, 3),
                 'predicted_goals_per_90': round(ensemble_pred, 3),
@@ -338,6 +350,12 @@ class AdvancedPlayerAnalyzer:
                 'confidence': round(85 * decay_factor, 1)
             }
             
+            if form_row is not None:
+                prediction['recent_goals_per_90'] = round(float(form_row['goals_ewm']), 3)
+                prediction['form_delta'] = round(float(form_row['goals_form_delta']), 3)
+            
+            return prediction
+            
         except Exception as e:
             print(f"❌ Erreur prédiction: {e}")
             return {"error": str(e)}
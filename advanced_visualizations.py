@@ -23,12 +23,13 @@ class AdvancedPlayerVisualizations:
     @staticmethod
     def create_complete_player_profile(player_data: pd.Series, 
                                        league_data: pd.DataFrame,
-                                       player_name: str) -> plt.Figure:
+                                       player_name: str,
+                                       spatial_grid=None) -> plt.Figure:
         """
         📊 PROFIL COMPLET : Combinaison de 6 graphiques
         - Radar chart (performances globales)
         - Bar chart comparatif (vs moyenne ligue)
-        - Heatmap positions
+        - Heatmap positions (grille haute résolution si spatial_grid, voir spatial_grid.py)
         - Timeline progression
         - Distribution stats clés
         - Tableau récapitulatif
@@ -52,7 +53,7 @@ class AdvancedPlayerVisualizations:
             # 3. HEATMAP POSITIONS (en haut à droite)
             ax_heat = fig.add_subplot(gs[0, 2])
             AdvancedPlayerVisualizations._create_position_heatmap(
-                ax_heat, player_data
+                ax_heat, player_data, spatial_grid, player_name
             )
             
             # 4. STATS PAR CATÉGORIE (milieu gauche)
@@ -193,9 +194,14 @@ class AdvancedPlayerVisualizations:
             print(f"⚠️ Erreur barres: {e}")
     
     @staticmethod
-    def _create_position_heatmap(ax, player_data):
-        """Heatmap des zones d'activité (9 zones)"""
+    def _create_position_heatmap(ax, player_data, spatial_grid=None, player_name=None):
+        """Heatmap des zones d'activité (grille nx x ny si disponible, sinon 9 zones)"""
         try:
+            player_name = player_name or player_data.get('player')
+            if spatial_grid is not None and player_name in spatial_grid:
+                AdvancedPlayerVisualizations._create_grid_heatmap(ax, spatial_grid, player_name)
+                return
+            
             zones = [
                 ['zone_att_left', 'zone_att_center', 'zone_att_right'],
                 ['zone_mid_left', 'zone_mid_center', 'zone_mid_right'],
@@ -246,6 +252,28 @@ class AdvancedPlayerVisualizations:
         except Exception as e:
             print(f"⚠️ Erreur heatmap: {e}")
     
+    @staticmethod
+    def _create_grid_heatmap(ax, spatial_grid, player_name: str):
+        """Heatmap haute résolution sur le terrain (part de l'activité par case, %)"""
+        grid = spatial_grid.player_grid(player_name, normalize=True)
+        nx, ny = spatial_grid.shape
+        
+        # x horizontal (attaque vers la droite), y de haut en bas comme StatsBomb
+        im = ax.imshow(grid.T, cmap='YlOrRd', aspect='auto', interpolation='nearest',
+                       extent=[0, 120, 80, 0], vmin=0)
+        
+        # Tiers et surfaces
+        for x in (40, 80):
+            ax.axvline(x, color='white', linewidth=1, alpha=0.7)
+        ax.add_patch(Rectangle((0, 18), 18, 44, fill=False, edgecolor='white', linewidth=1))
+        ax.add_patch(Rectangle((102, 18), 18, 44, fill=False, edgecolor='white', linewidth=1))
+        
+        ax.set_xticks([20, 60, 100])
+        ax.set_xticklabels(['Défense', 'Milieu', 'Attaque'])
+        ax.set_yticks([])
+        ax.set_title(f'Heatmap - Activité {nx}×{ny} (%)', fontweight='bold')
+        plt.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
+    
     @staticmethod
     def _create_category_breakdown(ax, player_data):
         """Graphique par catégories (Attaque, Création, Défense)"""
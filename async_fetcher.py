@@ -0,0 +1,339 @@
+# async_fetcher.py
+"""
+Téléchargement asynchrone des données StatsBomb open-data
+- Session HTTP unique (connexions réutilisées) et nombre de requêtes simultanées limité
+- Reprise avec backoff exponentiel et budget global de tentatives
+- Cache disque miroir de l'arbre open-data (lisible par LocalOpenDataSource)
+  avec requêtes conditionnelles (ETag / If-Modified-Since)
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import warnings
+warnings.filterwarnings('ignore')
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+    print("⚠️ aiohttp non installé - Téléchargement asynchrone désactivé")
+
+try:
+    import fcntl
+except ImportError:  # Windows : fusion de l'index sans verrou
+    fcntl = None
+
+OPEN_DATA_BASE_URL = 'https://raw.githubusercontent.com/statsbomb/open-data/master/'
+
+# Codes HTTP pour lesquels une nouvelle tentative a un sens
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def run_sync(coro):
+    """Exécute une coroutine depuis du code synchrone (y compris si une boucle tourne déjà)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    # Boucle déjà active dans ce thread : exécution dans un thread dédié
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+class AsyncOpenDataFetcher:
+    """Télécharge des fichiers open-data en parallèle vers un cache disque"""
+    
+    CACHE_INDEX = 'http_cache.json'
+    
+    def __init__(self,
+                 cache_dir: str,
+                 base_url: str = OPEN_DATA_BASE_URL,
+                 max_concurrency: int = 16,
+                 max_retries: int = 4,
+                 retry_budget: int = 50,
+                 backoff_base: float = 0.5,
+                 timeout: float = 60.0,
+                 max_age: Optional[float] = 24 * 3600):
+        """
+        Args:
+            cache_dir: Racine du cache (les fichiers sont écrits sous <cache_dir>/data/...)
+            base_url: URL de base du dépôt open-data
+            max_concurrency: Nombre maximum de requêtes simultanées
+            max_retries: Tentatives supplémentaires maximum par fichier
+            retry_budget: Tentatives supplémentaires maximum pour tout un lot
+            backoff_base: Délai initial du backoff exponentiel (secondes)
+            timeout: Délai maximum par requête (secondes)
+            max_age: Âge en dessous duquel un fichier en cache est utilisé sans requête
+                (None : toujours revalider)
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp est requis pour le téléchargement asynchrone")
+        
+        self.cache_dir = cache_dir
+        self.base_url = base_url.rstrip('/') + '/'
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_budget = retry_budget
+        self.backoff_base = backoff_base
+        self.timeout = timeout
+        self.max_age = max_age
+        
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._load_index()
+    
+    def _index_path(self) -> str:
+        return os.path.join(self.cache_dir, self.CACHE_INDEX)
+    
+    def _load_index(self) -> Dict:
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_index(self):
+        """
+        Écrit l'index fusionné avec celui sur disque (autres process : workers, sessions) :
+        pour chaque fichier, l'entrée vérifiée le plus récemment l'emporte
+        """
+        # Verrou consultatif : la relecture et le remplacement ne s'entrelacent pas
+        with open(self._index_path() + '.lock', 'w') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            
+            merged = self._load_index()
+            for relative_path, entry in self._index.items():
+                current = merged.get(relative_path)
+                if current is None or entry.get('checked_at', 0) >= current.get('checked_at', 0):
+                    merged[relative_path] = entry
+            self._index = merged
+            
+            # Fichier temporaire propre au process : pas de collision entre écrivains
+            tmp_path = f"{self._index_path()}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f)
+            os.replace(tmp_path, self._index_path())
+    
+    def cache_path(self, relative_path: str) -> str:
+        """Chemin local d'un fichier (ex: 'data/events/7298.json')"""
+        return os.path.join(self.cache_dir, *relative_path.split('/'))
+    
+    def _is_fresh(self, relative_path: str) -> bool:
+        entry = self._index.get(relative_path)
+        if entry is None or self.max_age is None or not os.path.isfile(self.cache_path(relative_path)):
+            return False
+        return time.time() - entry.get('checked_at', 0) < self.max_age
+    
+    def _known_status(self, relative_path: str) -> Optional[str]:
+        """Statut connu sans requête : 'cached' (frais), 'missing' (404 récent) ou None"""
+        if self._is_fresh(relative_path):
+            return 'cached'
+        entry = self._index.get(relative_path)
+        if entry and entry.get('missing') and self.max_age is not None \
+                and time.time() - entry.get('checked_at', 0) < self.max_age:
+            return 'missing'
+        return None
+    
+    def _write_file(self, relative_path: str, content: bytes):
+        path = self.cache_path(relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        
+        # Écriture atomique : un lecteur ne voit jamais un fichier partiel
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    
+    async def _fetch_one(self, session: 'aiohttp.ClientSession', semaphore: asyncio.Semaphore,
+                         relative_path: str, state: Dict) -> str:
+        """
+        Télécharge un fichier (ou le revalide) vers le cache
+        
+        Returns:
+            'cached', 'downloaded', 'not_modified', 'missing' ou 'failed'
+        """
+        known = self._known_status(relative_path)
+        if known is not None:
+            return known
+        
+        headers = {}
+        entry = self._index.get(relative_path)
+        if entry and os.path.isfile(self.cache_path(relative_path)):
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        
+        attempt = 0
+        while True:
+            retry_after = None
+            try:
+                async with semaphore:
+                    async with session.get(self.base_url + relative_path, headers=headers) as response:
+                        if response.status == 304:
+                            self._index[relative_path]['checked_at'] = time.time()
+                            return 'not_modified'
+                        
+                        if response.status == 404:
+                            # Mémorisé : pas de nouvelle requête avant max_age (ex: match sans 360)
+                            self._index[relative_path] = {'missing': True, 'checked_at': time.time()}
+                            return 'missing'
+                        
+                        if response.status == 200:
+                            content = await response.read()
+                            self._write_file(relative_path, content)
+                            self._index[relative_path] = {
+                                'etag': response.headers.get('ETag'),
+                                'last_modified': response.headers.get('Last-Modified'),
+                                'checked_at': time.time(),
+                                'size': len(content),
+                            }
+                            state['bytes'] += len(content)
+                            return 'downloaded'
+                        
+                        if response.status not in RETRY_STATUSES:
+                            state['errors'][relative_path] = f"HTTP {response.status}"
+                            return 'failed'
+                        
+                        retry_after = response.headers.get('Retry-After')
+                        error = f"HTTP {response.status}"
+            
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = f"{type(e).__name__}: {e}"
+            
+            # Nouvelle tentative : limite par fichier et budget global du lot
+            if attempt >= self.max_retries or state['retries_left'] <= 0:
+                state['errors'][relative_path] = error
+                return 'failed'
+            
+            attempt += 1
+            state['retries_left'] -= 1
+            state['retries'] += 1
+            
+            delay = self.backoff_base * (2 ** (attempt - 1)) + random.uniform(0, self.backoff_base)
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            await asyncio.sleep(delay)
+    
+    async def fetch_many_async(self, relative_paths: List[str]) -> Dict:
+        """Version asynchrone de fetch_many"""
+        state = {'retries_left': self.retry_budget, 'retries': 0, 'bytes': 0, 'errors': {}}
+        start = time.perf_counter()
+        
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            statuses = await asyncio.gather(*[
+                self._fetch_one(session, semaphore, path, state) for path in relative_paths
+            ])
+        
+        self._save_index()
+        
+        summary = {status: 0 for status in ['downloaded', 'not_modified', 'cached', 'missing', 'failed']}
+        for status in statuses:
+            summary[status] += 1
+        
+        summary.update({
+            'files': dict(zip(relative_paths, statuses)),
+            'retries': state['retries'],
+            'bytes': state['bytes'],
+            'errors': state['errors'],
+            'duration': time.perf_counter() - start,
+        })
+        return summary
+    
+    def fetch_many(self, relative_paths: List[str]) -> Dict:
+        """
+        Télécharge une liste de fichiers (chemins relatifs au dépôt, ex: 'data/events/7298.json')
+        
+        Returns:
+            Résumé : nombre de fichiers par statut, statut par fichier,
+            tentatives, octets téléchargés, erreurs, durée
+        """
+        return run_sync(self.fetch_many_async(list(relative_paths)))
+    
+    def fetch_file(self, relative_path: str) -> str:
+        """
+        Télécharge (si besoin) un fichier et retourne son statut
+        Revalidation impossible (hors ligne...) avec une copie en cache : 'stale', la copie est utilisée.
+        IOError seulement si aucune copie locale n'existe
+        """
+        known = self._known_status(relative_path)
+        if known is not None:
+            return known
+        
+        summary = self.fetch_many([relative_path])
+        status = summary['files'][relative_path]
+        if status == 'failed':
+            error = summary['errors'].get(relative_path)
+            if os.path.isfile(self.cache_path(relative_path)):
+                print(f"⚠️ {relative_path} non revalidé ({error}) - copie en cache utilisée")
+                return 'stale'
+            raise IOError(f"Échec du téléchargement de {relative_path}: {error}")
+        return status
+    
+    @staticmethod
+    def matches_path(competition_id: int, season_id: int) -> str:
+        return f"data/matches/{competition_id}/{season_id}.json"
+    
+    def fetch_season(self, competition_id: int, season_id: int,
+                     lineups: bool = True, three_sixty: bool = False) -> Dict:
+        """
+        Télécharge tous les fichiers d'une saison (matchs, événements, compositions, 360)
+        three_sixty=True : freeze frames des seuls matchs avec match_status_360 'available'
+        
+        Returns:
+            Résumé de fetch_many (+ 'match_ids')
+        """
+        matches_file = self.matches_path(competition_id, season_id)
+        status = self.fetch_file(matches_file)
+        if status == 'missing':
+            raise FileNotFoundError(f"Saison inconnue: {competition_id}/{season_id}")
+        
+        with open(self.cache_path(matches_file), 'rb') as f:
+            matches = json.load(f)
+        match_ids = [match['match_id'] for match in matches]
+        
+        paths = [f"data/events/{match_id}.json" for match_id in match_ids]
+        if lineups:
+            paths += [f"data/lineups/{match_id}.json" for match_id in match_ids]
+        if three_sixty:
+            # Seulement les matchs annoncés avec des données 360
+            paths += [f"data/three-sixty/{match['match_id']}.json" for match in matches
+                      if match.get('match_status_360') == 'available']
+        
+        summary = self.fetch_many(paths)
+        summary['match_ids'] = match_ids
+        return summary
+    
+    def probe_seasons(self, seasons: List[Tuple[int, int]]) -> Dict[Tuple[int, int], Optional[bool]]:
+        """
+        Teste en parallèle l'existence de combinaisons competition/saison
+        (les fichiers de matchs trouvés restent en cache)
+        
+        Returns:
+            (competition_id, season_id) -> True / False / None (erreur réseau)
+        """
+        paths = [self.matches_path(c, s) for c, s in seasons]
+        summary = self.fetch_many(paths)
+        
+        results = {}
+        for season, path in zip(seasons, paths):
+            status = summary['files'][path]
+            results[season] = None if status == 'failed' else status != 'missing'
+        return results
+
+
+if __name__ == "__main__":
+    print("✅ Module async_fetcher.py chargé avec succès!")
+    print("Classe disponible: AsyncOpenDataFetcher")
+    print(f"Téléchargement asynchrone: {'✅ OUI' if AIOHTTP_AVAILABLE else '❌ NON'}")
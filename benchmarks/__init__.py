@@ -0,0 +1,5 @@
+# benchmarks/__init__.py
+"""
+Benchmarks reproductibles hors ligne (saisons synthétiques au format StatsBomb)
+Lancement depuis la racine du dépôt : python -m benchmarks.run_benchmarks
+"""
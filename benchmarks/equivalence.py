@@ -0,0 +1,369 @@
+# benchmarks/equivalence.py
+"""
+Harnais d'équivalence pour les extracteurs optimisés
+Exécute l'implémentation de référence et une implémentation candidate sur les mêmes
+matchs (synthétiques ou en cache) et compare les sorties colonne par colonne
+
+Exemple (depuis la racine du dépôt) :
+    python -m benchmarks.equivalence --reference ultra \\
+        --candidate mon_module:extract_all_metrics_fast
+    python -m benchmarks.equivalence --reference ultra --save-golden golden_ultra.parquet
+    python -m benchmarks.equivalence --candidate mon_module:extract --golden golden_ultra.parquet
+    python -m benchmarks.equivalence --store --statsbombpy-parser   # store colonnaire vs source
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import SyntheticStatsBombGenerator
+from event_sources import EventSource, NullEventSource, get_event_source
+from football_recruitment_app import FootballRecruitmentAnalyzer
+from season_store import SeasonEventStore
+from ultra_advanced_metrics import UltraAdvancedMetricsExtractor
+import warnings
+warnings.filterwarnings('ignore')
+
+# Clés d'une ligne de stats par match
+ROW_KEYS = ['match_id', 'player']
+
+
+# Références sans grille xT / modèle xG persistés : sorties indépendantes du dossier courant
+def _normal_extractor(events: pd.DataFrame, match_id: int) -> pd.DataFrame:
+    return FootballRecruitmentAnalyzer(NullEventSource(), use_default_models=False) \
+        ._calculate_match_stats(events, match_id)
+
+
+def _ultra_extractor(events: pd.DataFrame, match_id: int) -> pd.DataFrame:
+    return UltraAdvancedMetricsExtractor.extract_all_metrics(events, match_id, use_default_models=False)
+
+
+# Implémentations de référence (comportement actuel)
+REFERENCE_EXTRACTORS = {
+    'normal': _normal_extractor,
+    'ultra': _ultra_extractor,
+}
+
+
+def resolve_extractor(spec: str) -> Callable:
+    """
+    Extracteur depuis 'normal', 'ultra' ou 'module:attribut' (ex: 'mon_module:Classe.methode')
+    Signature attendue : (events, match_id) -> DataFrame de stats par joueur
+    """
+    if spec in REFERENCE_EXTRACTORS:
+        return REFERENCE_EXTRACTORS[spec]
+    
+    module_name, _, attribute = spec.partition(':')
+    if not attribute:
+        raise ValueError(f"Extracteur inconnu: '{spec}' (attendu normal, ultra ou module:attribut)")
+    
+    target = importlib.import_module(module_name)
+    for name in attribute.split('.'):
+        target = getattr(target, name)
+    return target
+
+
+def synthetic_matches(n_teams: int = 6, n_matches: Optional[int] = None, seed: int = 42,
+                      fast_parser: bool = True, **generator_options) -> Dict[int, pd.DataFrame]:
+    """
+    Matchs synthétiques au format sb.events : match_id -> événements
+    fast_parser=False : aplatissement statsbombpy (drapeaux True / NaN en objets)
+    """
+    generator = SyntheticStatsBombGenerator(n_teams=n_teams, with_360=False, seed=seed, **generator_options)
+    return generator.season_event_frames(n_matches, fast_parser=fast_parser)
+
+
+def cached_matches(competition_id: int, season_id: int, limit: Optional[int] = None,
+                   source: Optional[EventSource] = None) -> Dict[int, pd.DataFrame]:
+    """Matchs d'une saison lus depuis une source (miroir local ou cache disque de préférence)"""
+    source = source or get_event_source()
+    match_ids = source.matches(competition_id, season_id)['match_id'].tolist()[:limit]
+    return {match_id: source.events(match_id) for match_id in match_ids}
+
+
+def store_roundtrip(matches: Dict[int, pd.DataFrame]) -> Dict[int, pd.DataFrame]:
+    """Mêmes matchs écrits dans un store colonnaire temporaire puis relus (season_store.py)"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = SeasonEventStore.write(os.path.join(tmp_dir, 'store'), matches)
+        return {match_id: store.match_events(match_id).copy() for match_id in matches}
+
+
+def run_extractor(extractor: Callable, matches: Dict[int, pd.DataFrame]) -> Dict:
+    """
+    Exécute un extracteur sur tous les matchs
+    
+    Returns:
+        {'output': DataFrame concaténé, 'seconds': durée totale}
+    """
+    outputs = []
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for match_id, events in matches.items():
+            # Copie : un extracteur ne doit pas influencer l'autre en modifiant les événements
+            outputs.append(extractor(events.copy(), match_id))
+    seconds = time.perf_counter() - start
+    
+    outputs = [df for df in outputs if df is not None and not df.empty]
+    output = pd.concat(outputs, ignore_index=True) if outputs else pd.DataFrame()
+    return {'output': output, 'seconds': seconds}
+
+
+def _sorted_by_keys(df: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    if df.empty:
+        return df
+    return df.sort_values(keys, kind='mergesort').reset_index(drop=True)
+
+
+def compare_frames(reference: pd.DataFrame,
+                   candidate: pd.DataFrame,
+                   keys: Optional[List[str]] = None,
+                   atol: float = 1e-9,
+                   rtol: float = 1e-7) -> Dict:
+    """
+    Compare deux sorties d'extracteur ligne à ligne (alignées sur les clés)
+    
+    Returns:
+        Rapport : lignes manquantes / en trop, colonnes manquantes / en trop,
+        par colonne commune : écart absolu maximum et nombre de valeurs différentes,
+        'equivalent' (aucune différence hors tolérance)
+    """
+    keys = keys or ROW_KEYS
+    report = {
+        'rows_reference': len(reference),
+        'rows_candidate': len(candidate),
+        'missing_columns': sorted(set(reference.columns) - set(candidate.columns)),
+        'extra_columns': sorted(set(candidate.columns) - set(reference.columns)),
+        'duplicate_keys': 0,
+        'missing_rows': 0,
+        'extra_rows': 0,
+        'columns': {},
+    }
+    
+    if reference.empty or candidate.empty:
+        report['equivalent'] = reference.empty and candidate.empty
+        return report
+    
+    reference = _sorted_by_keys(reference, keys)
+    candidate = _sorted_by_keys(candidate, keys)
+    report['duplicate_keys'] = int(reference.duplicated(keys).sum() + candidate.duplicated(keys).sum())
+    
+    merged = reference.merge(candidate, on=keys, how='outer', suffixes=('__ref', '__cand'), indicator=True)
+    report['missing_rows'] = int((merged['_merge'] == 'left_only').sum())
+    report['extra_rows'] = int((merged['_merge'] == 'right_only').sum())
+    both = merged[merged['_merge'] == 'both']
+    
+    common = [c for c in reference.columns if c in candidate.columns and c not in keys]
+    for col in common:
+        ref_values = both[f'{col}__ref']
+        cand_values = both[f'{col}__cand']
+        
+        if pd.api.types.is_numeric_dtype(ref_values) and pd.api.types.is_numeric_dtype(cand_values):
+            ref_array = ref_values.to_numpy(dtype=float)
+            cand_array = cand_values.to_numpy(dtype=float)
+            equal = np.isclose(ref_array, cand_array, atol=atol, rtol=rtol, equal_nan=True)
+            diff = np.abs(ref_array - cand_array)
+            # NaN d'un seul côté : différence infinie
+            diff[np.isnan(ref_array) != np.isnan(cand_array)] = np.inf
+            max_abs = float(np.nanmax(diff)) if len(diff) and not np.isnan(diff).all() else 0.0
+        else:
+            equal = (ref_values.astype(str) == cand_values.astype(str)).to_numpy()
+            max_abs = None
+        
+        report['columns'][col] = {'max_abs_diff': max_abs, 'mismatches': int((~equal).sum())}
+    
+    report['mismatched_columns'] = sorted(c for c, r in report['columns'].items() if r['mismatches'])
+    report['equivalent'] = not (report['missing_columns'] or report['extra_columns'] or
+                                report['missing_rows'] or report['extra_rows'] or
+                                report['duplicate_keys'] or report['mismatched_columns'])
+    return report
+
+
+class EquivalenceHarness:
+    """Compare une implémentation candidate à la référence sur les mêmes matchs"""
+    
+    def __init__(self,
+                 reference: Callable,
+                 candidate: Callable,
+                 atol: float = 1e-9,
+                 rtol: float = 1e-7,
+                 keys: Optional[List[str]] = None):
+        """
+        Args:
+            reference: Extracteur de référence (events, match_id) -> DataFrame
+            candidate: Extracteur candidat, même signature
+            atol / rtol: Tolérances numériques (np.isclose)
+            keys: Clés d'alignement des lignes (défaut: match_id, player)
+        """
+        self.reference = reference
+        self.candidate = candidate
+        self.atol = atol
+        self.rtol = rtol
+        self.keys = keys or ROW_KEYS
+    
+    def run(self, matches: Dict[int, pd.DataFrame]) -> Dict:
+        """
+        Returns:
+            Rapport de compare_frames + durées et accélération ('speedup' = référence / candidat)
+        """
+        reference = run_extractor(self.reference, matches)
+        candidate = run_extractor(self.candidate, matches)
+        return self._report(reference['output'], candidate['output'], matches,
+                            reference['seconds'], candidate['seconds'])
+    
+    def run_against_golden(self, matches: Dict[int, pd.DataFrame], golden_path: str) -> Dict:
+        """Compare le candidat à une sortie de référence enregistrée (save_golden)"""
+        golden = load_golden(golden_path)
+        candidate = run_extractor(self.candidate, matches)
+        return self._report(golden, candidate['output'], matches, None, candidate['seconds'])
+    
+    def run_store_roundtrip(self, matches: Dict[int, pd.DataFrame]) -> Dict:
+        """
+        Référence sur les événements de la source, candidat sur les mêmes événements relus
+        depuis un store colonnaire : le store doit être interchangeable avec sa source
+        """
+        stored = store_roundtrip(matches)
+        reference = run_extractor(self.reference, matches)
+        candidate = run_extractor(self.candidate, stored)
+        return self._report(reference['output'], candidate['output'], matches,
+                            reference['seconds'], candidate['seconds'])
+    
+    def _report(self, reference: pd.DataFrame, candidate: pd.DataFrame, matches: Dict,
+                reference_seconds: Optional[float], candidate_seconds: float) -> Dict:
+        report = compare_frames(reference, candidate, self.keys, self.atol, self.rtol)
+        report.update({
+            'matches': len(matches),
+            'events': int(sum(len(events) for events in matches.values())),
+            'reference_seconds': reference_seconds,
+            'candidate_seconds': candidate_seconds,
+            'speedup': (reference_seconds / candidate_seconds
+                        if reference_seconds is not None and candidate_seconds > 0 else None),
+        })
+        return report
+
+
+def save_golden(output: pd.DataFrame, path: str) -> str:
+    """Enregistre une sortie de référence (Parquet, ou CSV si l'extension est .csv)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if path.endswith('.csv'):
+        output.to_csv(path, index=False)
+    else:
+        output.to_parquet(path, index=False)
+    return path
+
+
+def load_golden(path: str) -> pd.DataFrame:
+    if path.endswith('.csv'):
+        return pd.read_csv(path)
+    return pd.read_parquet(path)
+
+
+def print_report(report: Dict, top: int = 15):
+    """Affiche un rapport d'équivalence"""
+    print("\n" + "=" * 72)
+    status = "✅ ÉQUIVALENT" if report['equivalent'] else "❌ DIFFÉRENCES"
+    print(f"🔬 {status} - {report['matches']} matchs, {report['events']} événements")
+    print("=" * 72)
+    print(f"Lignes: référence {report['rows_reference']}, candidat {report['rows_candidate']} "
+          f"(manquantes {report['missing_rows']}, en trop {report['extra_rows']}, "
+          f"clés dupliquées {report['duplicate_keys']})")
+    
+    if report['missing_columns']:
+        print(f"⚠️ Colonnes manquantes ({len(report['missing_columns'])}): {', '.join(report['missing_columns'][:top])}")
+    if report['extra_columns']:
+        print(f"⚠️ Colonnes en trop ({len(report['extra_columns'])}): {', '.join(report['extra_columns'][:top])}")
+    
+    mismatched = report.get('mismatched_columns', [])
+    if mismatched:
+        print(f"{'colonne':<40}{'valeurs ≠':>10}{'écart max':>16}")
+        worst = sorted(mismatched, key=lambda c: -report['columns'][c]['mismatches'])
+        for col in worst[:top]:
+            entry = report['columns'][col]
+            max_abs = f"{entry['max_abs_diff']:.3g}" if entry['max_abs_diff'] is not None else 'texte'
+            print(f"{col:<40}{entry['mismatches']:>10}{max_abs:>16}")
+    else:
+        compared = len(report['columns'])
+        largest = max((e['max_abs_diff'] or 0.0 for e in report['columns'].values()), default=0.0)
+        print(f"{compared} colonnes comparées, écart absolu max {largest:.3g}")
+    
+    if report['reference_seconds'] is not None:
+        print(f"⏱️  Référence {report['reference_seconds']:.3f}s, candidat {report['candidate_seconds']:.3f}s "
+              f"-> accélération x{report['speedup']:.2f}")
+    else:
+        print(f"⏱️  Candidat {report['candidate_seconds']:.3f}s")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Équivalence d'un extracteur candidat avec la référence")
+    parser.add_argument('--reference', default='ultra',
+                        help="Référence : normal, ultra ou module:attribut (défaut: ultra)")
+    parser.add_argument('--candidate', default=None,
+                        help="Candidat : module:attribut (ex: mon_module:extract_fast)")
+    parser.add_argument('--season', default=None, metavar='COMPETITION:SAISON',
+                        help="Matchs en cache / miroir local au lieu de matchs synthétiques")
+    parser.add_argument('--open-data', default=None, metavar='DOSSIER',
+                        help="Checkout local de statsbomb/open-data")
+    parser.add_argument('--limit', type=int, default=None, help="Nombre maximum de matchs")
+    parser.add_argument('--teams', type=int, default=6, help="Équipes de la saison synthétique")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--atol', type=float, default=1e-9)
+    parser.add_argument('--rtol', type=float, default=1e-7)
+    parser.add_argument('--save-golden', default=None, metavar='FICHIER',
+                        help="Enregistre la sortie de référence sur ces matchs")
+    parser.add_argument('--golden', default=None, metavar='FICHIER',
+                        help="Compare le candidat à une sortie enregistrée au lieu de relancer la référence")
+    parser.add_argument('--store', action='store_true',
+                        help="Candidat (défaut: la référence) sur les événements relus d'un store colonnaire")
+    parser.add_argument('--statsbombpy-parser', action='store_true',
+                        help="Événements aplatis comme statsbombpy (sans FastEventParser)")
+    args = parser.parse_args(argv)
+    
+    fast_parser = not args.statsbombpy_parser
+    if args.season:
+        competition_id, season_id = (int(v) for v in args.season.split(':'))
+        source = get_event_source(args.open_data)
+        if hasattr(source, 'fast_parser'):
+            source.fast_parser = fast_parser
+        matches = cached_matches(competition_id, season_id, args.limit, source)
+    else:
+        matches = synthetic_matches(args.teams, args.limit, args.seed, fast_parser)
+    
+    reference = resolve_extractor(args.reference)
+    
+    if args.save_golden:
+        result = run_extractor(reference, matches)
+        print(f"💾 Sortie de référence ({len(result['output'])} lignes, {result['seconds']:.2f}s): "
+              f"{save_golden(result['output'], args.save_golden)}")
+        if not args.candidate:
+            return 0
+    
+    if args.store:
+        candidate = resolve_extractor(args.candidate) if args.candidate else reference
+        report = EquivalenceHarness(reference, candidate, args.atol, args.rtol).run_store_roundtrip(matches)
+        print_report(report)
+        return 0 if report['equivalent'] else 1
+    
+    if not args.candidate:
+        parser.error("--candidate est requis (sauf avec --save-golden ou --store)")
+    
+    harness = EquivalenceHarness(reference, resolve_extractor(args.candidate), args.atol, args.rtol)
+    if args.golden:
+        report = harness.run_against_golden(matches, args.golden)
+    else:
+        report = harness.run(matches)
+    
+    print_report(report)
+    return 0 if report['equivalent'] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
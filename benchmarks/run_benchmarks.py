@@ -0,0 +1,369 @@
+# benchmarks/run_benchmarks.py
+"""
+Benchmarks reproductibles sur des matchs synthétiques (sans réseau)
+Résultats écrits en JSON et comparés à une référence (détection des régressions)
+
+Exemple (depuis la racine du dépôt) :
+    python -m benchmarks.run_benchmarks --save-baseline        # fixe la référence
+    python -m benchmarks.run_benchmarks                        # compare à la référence
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import sklearn
+
+from benchmarks.synthetic import SyntheticStatsBombGenerator
+from event_sources import NullEventSource
+from football_recruitment_app import FootballRecruitmentAnalyzer
+from ultra_advanced_metrics import UltraAdvancedMetricsExtractor
+from advanced_metrics import add_advanced_metrics_to_dataframe
+from spatial_grid import SpatialGrid
+from expected_goals import ExpectedGoalsModel, XG_COLUMN
+from recommendation_system import PlayerRecommendationSystem
+from advanced_ml_system import AdvancedPlayerAnalyzer
+from advanced_visualizations import AdvancedPlayerVisualizations
+import warnings
+warnings.filterwarnings('ignore')
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_RESULTS_DIR = os.path.join(BENCHMARKS_DIR, 'results')
+DEFAULT_BASELINE_PATH = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+
+# Écart (médiane) au-delà duquel un cas est signalé comme régression / amélioration
+DEFAULT_TOLERANCE = 0.25
+
+# Écart absolu minimum (secondes) : évite de signaler le bruit des cas très courts
+MIN_DELTA_SECONDS = 0.005
+
+
+def time_call(func: Callable, repeat: int = 3, warmup: int = 1) -> Dict:
+    """
+    Chronomètre une fonction (sorties console masquées)
+    
+    Returns:
+        Durées en secondes : min, médiane, moyenne, max sur `repeat` essais
+    """
+    samples = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            func()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+    
+    return {
+        'repeat': repeat,
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'mean': statistics.mean(samples),
+        'max': max(samples),
+    }
+
+
+def environment_info() -> Dict:
+    """Versions et machine (les résultats ne sont comparables qu'à environnement égal)"""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': multiprocessing.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'scikit-learn': sklearn.__version__,
+    }
+
+
+class BenchmarkSuite:
+    """Cas de benchmark sur une saison synthétique"""
+    
+    CASES = [
+        'calculate_match_stats',
+        'extract_all_metrics',
+        'aggregate_season_stats',
+        'add_advanced_metrics',
+        'spatial_grid',
+        'xg_scoring',
+        'find_similar_players',
+        'recommend_by_profile',
+        'advanced_fit',
+        'complete_player_profile',
+    ]
+    
+    def __init__(self,
+                 n_teams: int = 8,
+                 n_matches: Optional[int] = None,
+                 players_per_team: int = 16,
+                 possessions_per_match: int = 160,
+                 event_mix: Optional[Dict[str, float]] = None,
+                 seed: int = 42,
+                 repeat: int = 3):
+        """
+        Args:
+            n_teams: Équipes de la saison synthétique
+            n_matches: Nombre de matchs utilisés (tous si None : n*(n-1)/2)
+            players_per_team: Effectif par équipe
+            possessions_per_match: Possessions par match
+            event_mix: Probabilités des actions (SyntheticStatsBombGenerator.DEFAULT_EVENT_MIX)
+            seed: Graine du générateur
+            repeat: Nombre d'essais chronométrés par cas
+        """
+        self.config = {
+            'n_teams': n_teams,
+            'n_matches': n_matches,
+            'players_per_team': players_per_team,
+            'possessions_per_match': possessions_per_match,
+            'event_mix': dict(SyntheticStatsBombGenerator.DEFAULT_EVENT_MIX, **(event_mix or {})),
+            'seed': seed,
+            'repeat': repeat,
+        }
+        self.generator = SyntheticStatsBombGenerator(
+            n_teams=n_teams, players_per_team=players_per_team,
+            possessions_per_match=possessions_per_match, event_mix=event_mix,
+            with_360=False, seed=seed
+        )
+        self.repeat = repeat
+        self.events = {}
+        self.analyzer = None
+        self.match_stats = None
+        self.player_stats = None
+        self.features = []
+        self.target_player = None
+    
+    def prepare(self):
+        """Génère la saison et les entrées des cas en aval (stats par match / par joueur)"""
+        self.events = self.generator.season_event_frames(self.config['n_matches'])
+        
+        # Aucune donnée n'est lue depuis la source : source vide (pas d'accès réseau)
+        # Ni grille xT ni modèle xG persistés : mesures indépendantes du dossier courant
+        self.analyzer = FootballRecruitmentAnalyzer(NullEventSource(), use_default_models=False)
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.match_stats = pd.concat(
+                [UltraAdvancedMetricsExtractor.extract_all_metrics(events, match_id, use_default_models=False)
+                 for match_id, events in self.events.items()],
+                ignore_index=True
+            )
+            self.player_stats = self.analyzer._aggregate_season_stats(self.match_stats, min_matches=1)
+        
+        self.analyzer.player_stats = self.player_stats
+        self.features = self.analyzer.select_features('all')
+        self.target_player = self.player_stats.sort_values('matches_played', ascending=False)['player'].iloc[0]
+    
+    def data_summary(self) -> Dict:
+        return {
+            'matches': len(self.events),
+            'events': int(sum(len(events) for events in self.events.values())),
+            'player_match_rows': len(self.match_stats),
+            'players': len(self.player_stats),
+            'features': len(self.player_stats.columns),
+        }
+    
+    def _case_functions(self) -> Dict[str, Callable]:
+        analyzer = self.analyzer
+        player_stats = self.player_stats
+        season_events = pd.concat(self.events.values(), ignore_index=True)
+        
+        recommender = PlayerRecommendationSystem()
+        with contextlib.redirect_stdout(io.StringIO()):
+            recommender.fit(player_stats, self.features)
+        profile = player_stats[recommender.features].quantile(0.9).to_dict()
+        
+        # xG local : entraîné hors chrono, appliqué à toute la saison sans shot_statsbomb_xg
+        xg_model = ExpectedGoalsModel.fit(season_events, validation_fraction=0)
+        season_without_xg = season_events.drop(columns=[XG_COLUMN])
+        
+        advanced = AdvancedPlayerAnalyzer()
+        player_data = player_stats[player_stats['player'] == self.target_player].iloc[0]
+        
+        def _complete_profile():
+            fig = AdvancedPlayerVisualizations.create_complete_player_profile(
+                player_data=player_data, league_data=player_stats, player_name=self.target_player
+            )
+            plt.close(fig)
+        
+        return {
+            'calculate_match_stats': lambda: [analyzer._calculate_match_stats(events, match_id)
+                                              for match_id, events in self.events.items()],
+            'extract_all_metrics': lambda: [UltraAdvancedMetricsExtractor.extract_all_metrics(
+                                                events, match_id, use_default_models=False)
+                                            for match_id, events in self.events.items()],
+            'aggregate_season_stats': lambda: analyzer._aggregate_season_stats(self.match_stats),
+            'add_advanced_metrics': lambda: add_advanced_metrics_to_dataframe(player_stats.copy(), season_events),
+            'spatial_grid': lambda: SpatialGrid.from_events(season_events, 24, 16),
+            'xg_scoring': lambda: xg_model.fill_missing(season_without_xg),
+            'find_similar_players': lambda: analyzer.find_similar_players(self.target_player, top_n=10),
+            'recommend_by_profile': lambda: recommender.recommend_by_profile(profile, player_stats, top_n=10),
+            'advanced_fit': lambda: advanced.fit(player_stats, self.features),
+            'complete_player_profile': _complete_profile,
+        }
+    
+    def run(self, cases: Optional[List[str]] = None,
+            progress_callback: Optional[Callable[[str, Dict], None]] = None) -> Dict:
+        """
+        Exécute les cas demandés (tous si None)
+        
+        Returns:
+            {'created_at', 'config', 'environment', 'data', 'cases': {cas: durées}}
+        """
+        if self.analyzer is None:
+            self.prepare()
+        
+        functions = self._case_functions()
+        results = {}
+        for name in cases or self.CASES:
+            if name not in functions:
+                print(f"⚠️ Cas inconnu: {name}")
+                continue
+            results[name] = time_call(functions[name], self.repeat)
+            if progress_callback:
+                progress_callback(name, results[name])
+        
+        return {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'config': self.config,
+            'environment': environment_info(),
+            'data': self.data_summary(),
+            'cases': results,
+        }
+
+
+def save_results(results: Dict, path: str) -> str:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def load_results(path: str) -> Optional[Dict]:
+    if not os.path.isfile(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_results(results: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE) -> pd.DataFrame:
+    """
+    Compare les médianes à la référence
+    
+    Returns:
+        DataFrame : case, baseline_s, current_s, ratio, status
+        ('regression', 'improvement', 'ok', 'new')
+    """
+    rows = []
+    for name, timing in results['cases'].items():
+        reference = baseline.get('cases', {}).get(name)
+        if reference is None:
+            rows.append({'case': name, 'baseline_s': None, 'current_s': timing['median'],
+                         'ratio': None, 'status': 'new'})
+            continue
+        
+        ratio = timing['median'] / reference['median'] if reference['median'] > 0 else float('inf')
+        if abs(timing['median'] - reference['median']) < MIN_DELTA_SECONDS:
+            status = 'ok'
+        elif ratio > 1 + tolerance:
+            status = 'regression'
+        elif ratio < 1 - tolerance:
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append({'case': name, 'baseline_s': reference['median'], 'current_s': timing['median'],
+                     'ratio': ratio, 'status': status})
+    return pd.DataFrame(rows)
+
+
+def print_comparison(comparison: pd.DataFrame, baseline: Dict, results: Dict):
+    icons = {'regression': '❌', 'improvement': '🚀', 'ok': '✅', 'new': '🆕'}
+    
+    print("\n" + "=" * 80)
+    print(f"📊 COMPARAISON À LA RÉFÉRENCE ({baseline.get('created_at', '?')})")
+    print("=" * 80)
+    if baseline.get('config') != results['config']:
+        print("⚠️ Configuration différente de la référence : comparaison indicative")
+    if baseline.get('environment') != results['environment']:
+        print("⚠️ Environnement différent de la référence (machine / versions)")
+    
+    print(f"{'cas':<28}{'référence (s)':>15}{'actuel (s)':>13}{'ratio':>9}")
+    for row in comparison.itertuples():
+        baseline_s = f"{row.baseline_s:.4f}" if row.baseline_s is not None else '-'
+        ratio = f"{row.ratio:.2f}x" if row.ratio is not None else '-'
+        print(f"{row.case:<28}{baseline_s:>15}{row.current_s:>13.4f}{ratio:>9}  {icons[row.status]} {row.status}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks sur données synthétiques StatsBomb")
+    parser.add_argument('--teams', type=int, default=8,
+                        help="Équipes de la saison synthétique (8 : 28 matchs)")
+    parser.add_argument('--matches', type=int, default=None,
+                        help="Limiter le nombre de matchs")
+    parser.add_argument('--players', type=int, default=16,
+                        help="Joueurs par équipe")
+    parser.add_argument('--possessions', type=int, default=160,
+                        help="Possessions par match")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Essais chronométrés par cas")
+    parser.add_argument('--case', dest='cases', action='append', choices=BenchmarkSuite.CASES,
+                        help="Cas à exécuter (option répétable, tous par défaut)")
+    parser.add_argument('--output', default=None,
+                        help="Fichier de résultats (défaut: benchmarks/results/<date>.json)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH,
+                        help="Référence pour la comparaison")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Écrit aussi les résultats comme nouvelle référence")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Écart relatif toléré sur la médiane (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+    
+    suite = BenchmarkSuite(n_teams=args.teams, n_matches=args.matches, players_per_team=args.players,
+                           possessions_per_match=args.possessions, seed=args.seed, repeat=args.repeat)
+    
+    print("⏳ Génération de la saison synthétique...")
+    suite.prepare()
+    data = suite.data_summary()
+    print(f"✅ {data['matches']} matchs, {data['events']} événements, {data['players']} joueurs")
+    
+    results = suite.run(
+        args.cases,
+        progress_callback=lambda name, timing: print(f"  {name:<28} médiane {timing['median']:.4f}s "
+                                                     f"(min {timing['min']:.4f}s)")
+    )
+    
+    output = args.output or os.path.join(
+        DEFAULT_RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    print(f"💾 Résultats: {save_results(results, output)}")
+    
+    if args.save_baseline:
+        print(f"📌 Nouvelle référence: {save_results(results, args.baseline)}")
+        return 0
+    
+    baseline = load_results(args.baseline)
+    if baseline is None:
+        print(f"⚠️ Pas de référence ({args.baseline}) - lancer avec --save-baseline")
+        return 0
+    
+    comparison = compare_results(results, baseline, args.tolerance)
+    print_comparison(comparison, baseline, results)
+    return 1 if (comparison['status'] == 'regression').any() else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,409 @@
+# benchmarks/synthetic.py
+"""
+Génération de matchs synthétiques au format StatsBomb open-data
+(événements imbriqués, coordonnées, lineups, frames 360) - reproductible (graine)
+"""
+
+import json
+import os
+import uuid
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from fast_event_parser import FastEventParser, statsbombpy_frame
+import warnings
+warnings.filterwarnings('ignore')
+
+
+class SyntheticStatsBombGenerator:
+    """Génère des matchs au format JSON StatsBomb (événements, lineups, 360)"""
+    
+    # Répartition des actions (probabilités)
+    DEFAULT_EVENT_MIX = {
+        'pressure': 0.25,       # action sous pression (événement Pressure adverse)
+        'carry': 0.15,          # conduite de balle
+        'dribble': 0.07,        # dribble (+ Dribbled Past adverse)
+        'pass_failure': 0.18,   # passe ratée (interception / récupération)
+        'shot': 0.12,           # fin de possession par un tir
+    }
+    
+    POSITIONS = ['Goalkeeper', 'Right Back', 'Right Center Back', 'Left Center Back', 'Left Back',
+                 'Right Defensive Midfield', 'Left Defensive Midfield', 'Right Wing',
+                 'Center Attacking Midfield', 'Left Wing', 'Center Forward']
+    TYPE_IDS = {
+        'Starting XI': 35, 'Half Start': 18, 'Half End': 34, 'Pass': 30, 'Ball Receipt*': 42,
+        'Carry': 43, 'Pressure': 17, 'Shot': 16, 'Goal Keeper': 23, 'Duel': 4, 'Dribble': 14,
+        'Dribbled Past': 39, 'Interception': 10, 'Ball Recovery': 2, 'Clearance': 9, 'Block': 6,
+        'Foul Committed': 22, 'Foul Won': 21, 'Miscontrol': 38, 'Dispossessed': 3,
+        'Substitution': 19, 'Error': 37, 'Offside': 8, 'Shield': 28, '50/50': 33,
+    }
+    
+    def __init__(self,
+                 n_teams: int = 8,
+                 players_per_team: int = 16,
+                 possessions_per_match: int = 160,
+                 event_mix: Optional[Dict[str, float]] = None,
+                 with_360: bool = True,
+                 competition_id: int = 9001,
+                 season_id: int = 1,
+                 seed: int = 42):
+        """
+        Args:
+            n_teams: Nombre d'équipes (calendrier aller simple : n*(n-1)/2 matchs)
+            players_per_team: Effectif par équipe (11 titulaires + remplaçants)
+            possessions_per_match: Possessions par match (~8 événements chacune)
+            event_mix: Probabilités des actions (voir DEFAULT_EVENT_MIX)
+            with_360: Génère aussi les frames 360
+            seed: Graine (mêmes paramètres + même graine = mêmes matchs)
+        """
+        self.n_teams = n_teams
+        self.players_per_team = players_per_team
+        self.possessions_per_match = possessions_per_match
+        self.event_mix = dict(self.DEFAULT_EVENT_MIX, **(event_mix or {}))
+        self.with_360 = with_360
+        self.competition_id = competition_id
+        self.season_id = season_id
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.teams = [
+            {'id': 100 + t, 'name': f'Team {chr(65 + t)}',
+             'players': [{'id': 1000 * (t + 1) + p, 'name': f'Player {chr(65 + t)}{p:02d}'}
+                         for p in range(players_per_team)]}
+            for t in range(n_teams)
+        ]
+        self._uuid_counter = 0
+    
+    def _uuid(self) -> str:
+        self._uuid_counter += 1
+        return str(uuid.UUID(int=(self.competition_id << 64) + (self.season_id << 48) + self._uuid_counter))
+    
+    @staticmethod
+    def _ref(obj_id: int, name: str) -> Dict:
+        return {'id': obj_id, 'name': name}
+    
+    def _type(self, name: str) -> Dict:
+        return self._ref(self.TYPE_IDS.get(name, 0), name)
+    
+    def _clip(self, x: float, y: float):
+        return [round(float(np.clip(x, 0.1, 119.9)), 1), round(float(np.clip(y, 0.1, 79.9)), 1)]
+    
+    def match_list(self) -> List[Dict]:
+        """Calendrier aller simple entre toutes les équipes"""
+        matches = []
+        match_id = self.competition_id * 100000 + self.season_id * 1000
+        day = 0
+        for i in range(self.n_teams):
+            for j in range(i + 1, self.n_teams):
+                match_id += 1
+                day += 1
+                matches.append({
+                    'match_id': match_id,
+                    'match_date': str((pd.Timestamp('2023-08-01') + pd.Timedelta(days=day)).date()),
+                    'kick_off': '20:00:00.000',
+                    'competition': {'competition_id': self.competition_id, 'country_name': 'Synthland',
+                                    'competition_name': 'Synthetic League'},
+                    'season': {'season_id': self.season_id, 'season_name': f'{2022 + self.season_id}'},
+                    'home_team': {'home_team_id': self.teams[i]['id'], 'home_team_name': self.teams[i]['name']},
+                    'away_team': {'away_team_id': self.teams[j]['id'], 'away_team_name': self.teams[j]['name']},
+                    'home_score': 0, 'away_score': 0,
+                    'match_status': 'available',
+                    'match_status_360': 'available' if self.with_360 else 'unscheduled',
+                    'last_updated': '2024-01-01T00:00:00',
+                    'match_week': day,
+                    'metadata': {'data_version': '1.1.0'},
+                })
+        return matches
+    
+    def match_events(self, match: Dict) -> Dict[str, List[Dict]]:
+        """Événements, lineups et frames 360 d'un match"""
+        home = next(t for t in self.teams if t['id'] == match['home_team']['home_team_id'])
+        away = next(t for t in self.teams if t['id'] == match['away_team']['away_team_id'])
+        rng = self.rng
+        mix = self.event_mix
+        events, frames = [], []
+        state = {'index': 0, 'minute': 0, 'second': 0, 'period': 1}
+        lineups = {}
+        for team in (home, away):
+            lineups[team['id']] = team['players'][:11]
+        
+        def add(type_name, team, player=None, location=None, extra=None, possession=0, poss_team=None,
+                under_pressure=False):
+            state['index'] += 1
+            state['second'] += int(rng.integers(1, 6))
+            if state['second'] >= 60:
+                state['minute'] += state['second'] // 60
+                state['second'] %= 60
+            if state['minute'] >= 45 and state['period'] == 1:
+                state['period'] = 2
+            ev = {
+                'id': self._uuid(),
+                'index': state['index'],
+                'period': state['period'],
+                'timestamp': f"00:{state['minute'] % 60:02d}:{state['second']:02d}.000",
+                'minute': state['minute'],
+                'second': state['second'],
+                'type': self._type(type_name),
+                'possession': possession,
+                'possession_team': self._ref(poss_team['id'], poss_team['name']) if poss_team else self._ref(team['id'], team['name']),
+                'play_pattern': self._ref(1, 'Regular Play'),
+                'team': self._ref(team['id'], team['name']),
+                'duration': round(float(rng.random() * 2), 3),
+            }
+            if player is not None:
+                ev['player'] = self._ref(player['id'], player['name'])
+                pos_idx = team['players'].index(player) % 11
+                ev['position'] = self._ref(pos_idx + 1, self.POSITIONS[pos_idx])
+            if location is not None:
+                ev['location'] = location
+            if under_pressure:
+                ev['under_pressure'] = True
+            if extra:
+                ev.update(extra)
+            events.append(ev)
+            return ev
+        
+        for team in (home, away):
+            add('Starting XI', team, extra={'tactics': {'formation': 433, 'lineup': [
+                {'player': self._ref(p['id'], p['name']), 'position': self._ref(i + 1, self.POSITIONS[i]),
+                 'jersey_number': i + 1} for i, p in enumerate(team['players'][:11])]}})
+        
+        # Remplacements à l'heure de jeu : un remplaçant par équipe
+        subs_done = False
+        
+        for possession in range(1, self.possessions_per_match + 1):
+            if not subs_done and possession > self.possessions_per_match * 0.6:
+                subs_done = True
+                for team in (home, away):
+                    out_p = lineups[team['id']][int(rng.integers(5, 11))]
+                    in_p = team['players'][11 + int(rng.integers(0, max(1, self.players_per_team - 11)))]
+                    add('Substitution', team, out_p, extra={'substitution': {
+                        'outcome': self._ref(103, 'Tactical'), 'replacement': self._ref(in_p['id'], in_p['name'])}},
+                        possession=possession)
+                    lineups[team['id']] = [in_p if p is out_p else p for p in lineups[team['id']]]
+            
+            team = home if rng.random() < 0.5 else away
+            opp = away if team is home else home
+            players = lineups[team['id']]
+            opp_players = lineups[opp['id']]
+            
+            x, y = float(rng.uniform(5, 60)), float(rng.uniform(5, 75))
+            carrier = players[int(rng.integers(1, 11))]
+            n_actions = int(rng.integers(1, 9))
+            last_pass = None
+            
+            for a in range(n_actions):
+                pressured = rng.random() < mix['pressure']
+                if pressured:
+                    presser = opp_players[int(rng.integers(1, 11))]
+                    add('Pressure', opp, presser, self._clip(120 - x, 80 - y), possession=possession, poss_team=team,
+                        extra={'counterpress': True} if rng.random() < 0.2 else None)
+                
+                action = rng.random()
+                if action < mix['carry']:
+                    # Conduite de balle
+                    nx, ny = x + rng.normal(6, 6), y + rng.normal(0, 6)
+                    add('Carry', team, carrier, self._clip(x, y), possession=possession, under_pressure=pressured,
+                        extra={'carry': {'end_location': self._clip(nx, ny)}})
+                    x, y = self._clip(nx, ny)
+                    continue
+                if action < mix['carry'] + mix['dribble']:
+                    # Dribble
+                    complete = rng.random() < 0.55
+                    add('Dribble', team, carrier, self._clip(x, y), possession=possession, under_pressure=pressured,
+                        extra={'dribble': dict({'outcome': self._ref(8 if complete else 9, 'Complete' if complete else 'Incomplete')},
+                                               **({'nutmeg': True} if rng.random() < 0.05 else {}))})
+                    add('Dribbled Past', opp, opp_players[int(rng.integers(1, 11))], self._clip(120 - x, 80 - y),
+                        possession=possession, poss_team=team)
+                    if not complete:
+                        break
+                    continue
+                
+                # Passe
+                length = float(abs(rng.normal(18, 10))) + 2
+                angle = float(rng.normal(0.3, 1.1))
+                nx, ny = x + length * np.cos(angle), y + length * np.sin(angle)
+                end = self._clip(nx, ny)
+                fail = rng.random() < mix['pass_failure']
+                recipient = players[int(rng.integers(1, 11))]
+                while recipient is carrier:
+                    recipient = players[int(rng.integers(1, 11))]
+                height = ['Ground Pass', 'Low Pass', 'High Pass'][int(rng.choice(3, p=[0.7, 0.15, 0.15]))]
+                pass_body = {'recipient': self._ref(recipient['id'], recipient['name']),
+                             'length': round(length, 2), 'angle': round(angle, 3),
+                             'height': self._ref(1, height), 'end_location': end,
+                             'body_part': self._ref(40, 'Right Foot')}
+                if fail:
+                    pass_body['outcome'] = self._ref(9, 'Incomplete')
+                if rng.random() < 0.04:
+                    pass_body['cross'] = True
+                if rng.random() < 0.02:
+                    pass_body['switch'] = True
+                if rng.random() < 0.02:
+                    pass_body['through_ball'] = True
+                if a == 0 and rng.random() < 0.05:
+                    pass_body['type'] = self._ref(62, ['Corner', 'Free Kick', 'Throw-in'][int(rng.integers(0, 3))])
+                last_pass = add('Pass', team, carrier, self._clip(x, y), possession=possession,
+                                under_pressure=pressured, extra={'pass': pass_body})
+                if fail:
+                    if rng.random() < 0.5:
+                        add('Interception', opp, opp_players[int(rng.integers(1, 11))], self._clip(120 - end[0], 80 - end[1]),
+                            possession=possession, poss_team=team,
+                            extra={'interception': {'outcome': self._ref(4, 'Won')}})
+                    else:
+                        add('Ball Recovery', opp, opp_players[int(rng.integers(1, 11))], self._clip(120 - end[0], 80 - end[1]),
+                            possession=possession, poss_team=team)
+                    break
+                receipt = add('Ball Receipt*', team, recipient, end, possession=possession)
+                carrier = recipient
+                x, y = end
+                last_pass = (last_pass, receipt)
+            else:
+                # Fin de possession : tir ou perte de balle
+                if rng.random() < mix['shot'] * 4 or x > 95:
+                    sx, sy = self._clip(max(x, 85) + rng.uniform(0, 20), 40 + rng.normal(0, 9))
+                    dist = np.hypot(120 - sx, 40 - sy)
+                    xg = float(np.clip(np.exp(-dist / 9) * rng.uniform(0.5, 1.4), 0.01, 0.95))
+                    r = rng.random()
+                    outcome = 'Goal' if r < xg else ['Saved', 'Off T', 'Blocked', 'Post', 'Wayward'][int(rng.choice(5, p=[0.35, 0.35, 0.2, 0.03, 0.07]))]
+                    body = ['Right Foot', 'Left Foot', 'Head', 'Other'][int(rng.choice(4, p=[0.5, 0.3, 0.18, 0.02]))]
+                    shot_body = {'statsbomb_xg': round(xg, 5), 'end_location': [120.0, round(40 + rng.normal(0, 4), 1), 1.0],
+                                 'outcome': self._ref(97, outcome), 'type': self._ref(87, 'Open Play' if rng.random() < 0.85 else 'Free Kick'),
+                                 'body_part': self._ref(40, body), 'technique': self._ref(93, 'Volley' if rng.random() < 0.08 else 'Normal')}
+                    if rng.random() < 0.2:
+                        shot_body['first_time'] = True
+                    if isinstance(last_pass, tuple):
+                        pass_ev = last_pass[0]
+                        pass_ev['pass']['shot_assist'] = True
+                        if outcome == 'Goal':
+                            del pass_ev['pass']['shot_assist']
+                            pass_ev['pass']['goal_assist'] = True
+                        shot_body['key_pass_id'] = pass_ev['id']
+                    shooter = carrier
+                    ff = []
+                    for p in opp_players[:11]:
+                        px, py = (119 if p is opp_players[0] else rng.uniform(sx - 10, 120)), rng.uniform(20, 60)
+                        ff.append({'location': self._clip(px, py), 'player': self._ref(p['id'], p['name']),
+                                   'position': self._ref(1, 'Goalkeeper' if p is opp_players[0] else 'Center Back'),
+                                   'teammate': False})
+                    shot_body['freeze_frame'] = ff
+                    shot = add('Shot', team, shooter, [sx, sy], possession=possession, extra={'shot': shot_body})
+                    if isinstance(last_pass, tuple):
+                        last_pass[0]['pass']['assisted_shot_id'] = shot['id']
+                    gk_type = 'Goal Conceded' if outcome == 'Goal' else ('Shot Saved' if outcome == 'Saved' else 'Shot Faced')
+                    add('Goal Keeper', opp, opp_players[0], [1.0, 40.0], possession=possession, poss_team=team,
+                        extra={'goalkeeper': {'type': self._ref(33, gk_type)}})
+                    if outcome == 'Blocked':
+                        add('Block', opp, opp_players[int(rng.integers(1, 11))], self._clip(120 - sx + 2, 80 - sy),
+                            possession=possession, poss_team=team)
+                else:
+                    r = rng.random()
+                    if r < 0.4:
+                        won = rng.random() < 0.5
+                        add('Duel', opp, opp_players[int(rng.integers(1, 11))], self._clip(120 - x, 80 - y),
+                            possession=possession, poss_team=team,
+                            extra={'duel': {'type': self._ref(11, 'Tackle'),
+                                            'outcome': self._ref(4, 'Won' if won else 'Lost In Play')}})
+                    elif r < 0.55:
+                        add('Duel', team, carrier, self._clip(x, y), possession=possession,
+                            extra={'duel': {'type': self._ref(10, 'Aerial Lost')}})
+                    elif r < 0.7:
+                        add('Clearance', opp, opp_players[int(rng.integers(1, 5))], self._clip(120 - x, 80 - y),
+                            possession=possession, poss_team=team)
+                    elif r < 0.8:
+                        add('Foul Committed', opp, opp_players[int(rng.integers(1, 11))], self._clip(120 - x, 80 - y),
+                            possession=possession, poss_team=team,
+                            extra={'foul_committed': {'card': self._ref(7, 'Yellow Card')}} if rng.random() < 0.15 else None)
+                        add('Foul Won', team, carrier, self._clip(x, y), possession=possession)
+                    elif r < 0.9:
+                        add('Miscontrol', team, carrier, self._clip(x, y), possession=possession)
+                    else:
+                        add('Dispossessed', team, carrier, self._clip(x, y), possession=possession)
+        
+        lineups_json = []
+        for team in (home, away):
+            lineups_json.append({'team_id': team['id'], 'team_name': team['name'], 'lineup': [
+                {'player_id': p['id'], 'player_name': p['name'], 'player_nickname': None,
+                 'jersey_number': i + 1, 'country': {'id': 1, 'name': 'Synthland'}}
+                for i, p in enumerate(team['players'])]})
+        
+        if self.with_360:
+            for ev in events:
+                if ev['type']['name'] in ('Pass', 'Shot', 'Ball Receipt*', 'Carry') and 'location' in ev:
+                    bx, by = ev['location']
+                    ff = [{'teammate': True, 'actor': True, 'keeper': False, 'location': [bx, by]}]
+                    for k in range(int(rng.integers(6, 15))):
+                        mate = rng.random() < 0.45
+                        keeper = (not mate) and k == 0
+                        loc = [119.0, 40.0] if keeper else self._clip(bx + rng.normal(8, 18), by + rng.normal(0, 18))
+                        ff.append({'teammate': bool(mate), 'actor': False, 'keeper': bool(keeper), 'location': loc})
+                    frames.append({'event_uuid': ev['id'], 'visible_area': [0, 0, 120, 0, 120, 80, 0, 80, 0, 0],
+                                   'freeze_frame': ff})
+        
+        return {'events': events, 'lineups': lineups_json, 'frames': frames}
+    
+    def competitions_entry(self, matches: List[Dict]) -> Dict:
+        return {'competition_id': self.competition_id, 'season_id': self.season_id,
+                'country_name': 'Synthland', 'competition_name': 'Synthetic League',
+                'competition_gender': 'male', 'competition_youth': False, 'competition_international': False,
+                'season_name': f'{2022 + self.season_id}',
+                'match_updated': '2024-01-01T00:00:00', 'match_updated_360': '2024-01-01T00:00:00' if self.with_360 else None,
+                'match_available_360': '2024-01-01T00:00:00' if self.with_360 else None,
+                'match_available': '2024-01-01T00:00:00'}
+    
+    def write_open_data_tree(self, root: str, max_matches: Optional[int] = None) -> List[int]:
+        """Écrit un arbre <root>/data/... identique au dépôt statsbomb/open-data"""
+        data = os.path.join(root, 'data')
+        for sub in ('matches', 'events', 'lineups', 'three-sixty'):
+            os.makedirs(os.path.join(data, sub), exist_ok=True)
+        matches = self.match_list()[:max_matches]
+        
+        comp_path = os.path.join(data, 'competitions.json')
+        competitions = []
+        if os.path.exists(comp_path):
+            with open(comp_path) as f:
+                competitions = [c for c in json.load(f)
+                                if (c['competition_id'], c['season_id']) != (self.competition_id, self.season_id)]
+        competitions.append(self.competitions_entry(matches))
+        with open(comp_path, 'w') as f:
+            json.dump(competitions, f)
+        
+        os.makedirs(os.path.join(data, 'matches', str(self.competition_id)), exist_ok=True)
+        with open(os.path.join(data, 'matches', str(self.competition_id), f'{self.season_id}.json'), 'w') as f:
+            json.dump(matches, f)
+        
+        for match in matches:
+            content = self.match_events(match)
+            with open(os.path.join(data, 'events', f"{match['match_id']}.json"), 'w') as f:
+                json.dump(content['events'], f)
+            with open(os.path.join(data, 'lineups', f"{match['match_id']}.json"), 'w') as f:
+                json.dump(content['lineups'], f)
+            if self.with_360:
+                with open(os.path.join(data, 'three-sixty', f"{match['match_id']}.json"), 'w') as f:
+                    json.dump(content['frames'], f)
+        return [m['match_id'] for m in matches]
+    
+    def season_raw_events(self, n_matches: Optional[int] = None) -> Dict[int, List[Dict]]:
+        """JSON brut des événements : match_id -> liste d'événements"""
+        return {match['match_id']: self.match_events(match)['events']
+                for match in self.match_list()[:n_matches]}
+    
+    def season_event_frames(self, n_matches: Optional[int] = None,
+                            fast_parser: bool = True) -> Dict[int, pd.DataFrame]:
+        """
+        Événements au format sb.events : match_id -> DataFrame
+        (colonnes dict/listes : tactics, *_location, shot_freeze_frame...)
+        """
+        frames = {}
+        for match_id, raw in self.season_raw_events(n_matches).items():
+            if fast_parser:
+                frames[match_id] = FastEventParser.events_frame(raw, match_id)
+            else:
+                frames[match_id] = statsbombpy_frame(raw, match_id)
+        return frames
+
+
+if __name__ == "__main__":
+    print("✅ Module benchmarks/synthetic.py chargé avec succès!")
+    print("Classe disponible: SyntheticStatsBombGenerator")
@@ -0,0 +1,258 @@
+# competition_catalog.py
+"""
+Catalogue des compétitions StatsBomb disponibles
+Index local (JSON) : nombre de matchs, taille des fichiers d'événements,
+dates de mise à jour et estimation du temps de chargement par saison
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from event_sources import EventSource, get_event_source
+import warnings
+warnings.filterwarnings('ignore')
+
+DEFAULT_CATALOG_PATH = os.path.join('datasets', 'competition_catalog.json')
+
+
+def _json_value(value):
+    """Valeur sérialisable (NaN -> None)"""
+    return None if value is None or (isinstance(value, float) and pd.isna(value)) else value
+
+
+class CompetitionCatalog:
+    """Index des saisons disponibles et de leur coût de chargement"""
+    
+    # Débit par défaut (octets d'événements JSON traités par seconde, fetch + extraction)
+    # remplacé par la médiane des chargements observés dès qu'il y en a
+    DEFAULT_THROUGHPUT = {'normal': 3_000_000, 'ultra': 500_000}
+    
+    # Taille moyenne d'un fichier d'événements quand elle est inconnue (source réseau sans cache)
+    DEFAULT_MATCH_BYTES = 3_000_000
+    
+    # Nombre d'observations conservées par mode
+    MAX_OBSERVATIONS = 20
+    
+    def __init__(self, seasons: List[Dict], built_at: Optional[str] = None,
+                 source: Optional[str] = None, observed_throughput: Optional[Dict] = None):
+        self.seasons = seasons
+        self.built_at = built_at
+        self.source = source
+        self.observed_throughput = observed_throughput or {'normal': [], 'ultra': []}
+        self._by_key = {(s['competition_id'], s['season_id']): s for s in seasons}
+    
+    @classmethod
+    def build(cls, source: Optional[EventSource] = None,
+              progress_callback: Optional[Callable[[int, int], None]] = None) -> 'CompetitionCatalog':
+        """
+        Construit le catalogue : listing des compétitions lu une fois,
+        puis fichier de matchs de chaque saison
+        
+        Args:
+            source: Source des événements (source par défaut si None)
+            progress_callback: Appelé avec (saisons traitées, total)
+        
+        Returns:
+            CompetitionCatalog
+        """
+        source = source or get_event_source()
+        competitions = source.competitions()
+        
+        pairs = list(zip(competitions['competition_id'].astype(int), competitions['season_id'].astype(int)))
+        
+        # Test groupé (téléchargement parallèle des fichiers de matchs avec la source asynchrone)
+        availability = source.has_seasons(pairs)
+        
+        seasons = []
+        for i, row in enumerate(competitions.to_dict('records')):
+            key = (int(row['competition_id']), int(row['season_id']))
+            entry = {
+                'competition_id': key[0],
+                'season_id': key[1],
+                'competition_name': _json_value(row.get('competition_name')),
+                'country_name': _json_value(row.get('country_name')),
+                'season_name': _json_value(row.get('season_name')),
+                'competition_gender': _json_value(row.get('competition_gender')),
+                'match_updated': _json_value(row.get('match_updated')),
+                'match_available_360': _json_value(row.get('match_available_360')),
+                'available': bool(availability.get(key)),
+                'match_count': 0,
+                'matches_360': 0,
+                'event_bytes': None,
+                'last_match_updated': None,
+                'first_match_date': None,
+                'last_match_date': None,
+            }
+            
+            if entry['available']:
+                try:
+                    entry.update(cls._season_details(source, *key))
+                except Exception as e:
+                    print(f"⚠️ Saison {key}: {e}")
+                    entry['available'] = False
+            
+            seasons.append(entry)
+            if progress_callback:
+                progress_callback(i + 1, len(competitions))
+        
+        return cls(seasons,
+                   built_at=datetime.now().isoformat(timespec='seconds'),
+                   source=source.describe())
+    
+    @staticmethod
+    def _season_details(source: EventSource, competition_id: int, season_id: int) -> Dict:
+        """Volumes et dates d'une saison (fichier de matchs + tailles des fichiers d'événements)"""
+        matches = source.matches(competition_id, season_id)
+        details = {'match_count': len(matches)}
+        
+        if matches.empty:
+            return details
+        
+        if 'match_status_360' in matches.columns:
+            details['matches_360'] = int((matches['match_status_360'] == 'available').sum())
+        if 'last_updated' in matches.columns:
+            details['last_match_updated'] = _json_value(matches['last_updated'].dropna().max())
+        if 'match_date' in matches.columns:
+            details['first_match_date'] = _json_value(matches['match_date'].min())
+            details['last_match_date'] = _json_value(matches['match_date'].max())
+        
+        sizes = [source.event_file_size(match_id) for match_id in matches['match_id']]
+        if all(size is not None for size in sizes):
+            details['event_bytes'] = int(sum(sizes))
+        
+        return details
+    
+    @classmethod
+    def load(cls, path: str = DEFAULT_CATALOG_PATH) -> Optional['CompetitionCatalog']:
+        """Charge l'index local (None s'il n'existe pas)"""
+        if not os.path.isfile(path):
+            return None
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        return cls(data['seasons'], data.get('built_at'), data.get('source'),
+                   data.get('observed_throughput'))
+    
+    def save(self, path: str = DEFAULT_CATALOG_PATH) -> str:
+        """Écrit l'index local"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        data = {
+            'built_at': self.built_at,
+            'source': self.source,
+            'observed_throughput': self.observed_throughput,
+            'seasons': self.seasons,
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        return path
+    
+    def get(self, competition_id: int, season_id: int) -> Optional[Dict]:
+        return self._by_key.get((competition_id, season_id))
+    
+    def available_seasons(self) -> List[Dict]:
+        """Saisons disponibles, triées par compétition puis saison"""
+        seasons = [s for s in self.seasons if s['available'] and s['match_count'] > 0]
+        return sorted(seasons, key=lambda s: (s['competition_name'] or '', s['season_name'] or ''))
+    
+    def options(self) -> Dict[str, Tuple[int, int]]:
+        """Libellés pour un sélecteur -> (competition_id, season_id)"""
+        seasons = self.available_seasons()
+        names = [f"{s['competition_name']} {s['season_name']}" for s in seasons]
+        
+        options = {}
+        for name, season in zip(names, seasons):
+            # Même nom dans plusieurs pays (ex: Premier League) : pays ajouté
+            if names.count(name) > 1:
+                name = f"{name} ({season['country_name']})"
+            options[name] = (season['competition_id'], season['season_id'])
+        return options
+    
+    def throughput(self, ultra: bool = False) -> float:
+        """Débit de chargement (octets/s) : médiane observée, sinon valeur par défaut"""
+        mode = 'ultra' if ultra else 'normal'
+        observed = self.observed_throughput.get(mode) or []
+        return statistics.median(observed) if observed else self.DEFAULT_THROUGHPUT[mode]
+    
+    def season_bytes(self, competition_id: int, season_id: int) -> Optional[int]:
+        """Taille des événements de la saison (estimée si inconnue)"""
+        season = self.get(competition_id, season_id)
+        if season is None:
+            return None
+        if season['event_bytes'] is not None:
+            return season['event_bytes']
+        return season['match_count'] * self.DEFAULT_MATCH_BYTES
+    
+    def estimate_load_seconds(self, competition_id: int, season_id: int,
+                              ultra: bool = False, max_workers: int = 1) -> Optional[float]:
+        """Durée de chargement estimée (None si la saison n'est pas au catalogue)"""
+        size = self.season_bytes(competition_id, season_id)
+        if size is None:
+            return None
+        return size / self.throughput(ultra) / max(1, max_workers)
+    
+    def record_load(self, competition_id: int, season_id: int, ultra: bool, seconds: float):
+        """Enregistre la durée d'un chargement réel pour affiner les estimations"""
+        size = self.season_bytes(competition_id, season_id)
+        if not size or seconds <= 0:
+            return
+        
+        observations = self.observed_throughput.setdefault('ultra' if ultra else 'normal', [])
+        observations.append(size / seconds)
+        del observations[:-self.MAX_OBSERVATIONS]
+    
+    def to_frame(self) -> pd.DataFrame:
+        """Catalogue en DataFrame (avec estimations en secondes)"""
+        df = pd.DataFrame(self.seasons)
+        if df.empty:
+            return df
+        
+        df['event_mb'] = df['event_bytes'].astype(float) / 1e6
+        df['estimate_normal_s'] = [self.estimate_load_seconds(c, s, False)
+                                   for c, s in zip(df['competition_id'], df['season_id'])]
+        df['estimate_ultra_s'] = [self.estimate_load_seconds(c, s, True)
+                                  for c, s in zip(df['competition_id'], df['season_id'])]
+        return df
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Construit le catalogue local des saisons StatsBomb")
+    parser.add_argument('--open-data', default=None, metavar='DOSSIER',
+                        help="Checkout local de statsbomb/open-data (défaut: $STATSBOMB_OPEN_DATA, sinon réseau)")
+    parser.add_argument('--output', default=DEFAULT_CATALOG_PATH,
+                        help="Fichier d'index à écrire")
+    args = parser.parse_args(argv)
+    
+    previous = CompetitionCatalog.load(args.output)
+    
+    start = time.perf_counter()
+    catalog = CompetitionCatalog.build(get_event_source(args.open_data))
+    if previous is not None:
+        catalog.observed_throughput = previous.observed_throughput
+    catalog.save(args.output)
+    
+    df = catalog.to_frame()
+    available = df[df['available']] if not df.empty else df
+    print(f"✅ Catalogue: {len(available)}/{len(df)} saisons disponibles "
+          f"({time.perf_counter() - start:.1f}s) -> {args.output}")
+    
+    for _, row in available.iterrows():
+        size = f"{row['event_mb']:.0f} Mo" if pd.notna(row['event_mb']) else "taille ?"
+        print(f"  ({row['competition_id']}, {row['season_id']}) {row['competition_name']} {row['season_name']}: "
+              f"{row['match_count']} matchs, {size}, ~{row['estimate_normal_s']:.0f}s normal / "
+              f"~{row['estimate_ultra_s']:.0f}s ULTRA")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
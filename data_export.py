@@ -0,0 +1,208 @@
+# data_export.py
+"""
+Export des données joueurs
+Formats colonnaires (Parquet, Arrow IPC) produits directement depuis le DataFrame
+et CSV en streaming par blocs de lignes
+"""
+
+import pandas as pd
+import gzip
+import os
+import tempfile
+from typing import Iterator, List, Optional
+import warnings
+warnings.filterwarnings('ignore')
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+    print("⚠️ pyarrow non installé - Export Parquet/Arrow désactivé")
+
+
+class DataExporter:
+    """Exporte le DataFrame des joueurs sans aller-retour CSV"""
+    
+    CSV_CHUNK_SIZE = 5000
+    PARQUET_COMPRESSIONS = ['zstd', 'snappy', 'gzip', 'none']
+    ARROW_COMPRESSIONS = ['zstd', 'lz4', 'none']
+    
+    # Colonnes texte répétitives : encodées en dictionnaire
+    CATEGORICAL_COLUMNS = ['player', 'team', 'competition', 'season']
+    
+    @staticmethod
+    def build_arrow_schema(df: pd.DataFrame, float32: bool = False) -> 'pa.Schema':
+        """
+        Construit un schéma typé pour l'export
+        
+        Args:
+            df: DataFrame à exporter
+            float32: Stocke les métriques décimales en float32 (fichier 2x plus petit)
+        
+        Returns:
+            Schéma Arrow (dictionnaires pour les noms, int32 pour les compteurs)
+        """
+        fields = []
+        
+        for col in df.columns:
+            dtype = df[col].dtype
+            
+            if col in DataExporter.CATEGORICAL_COLUMNS or isinstance(dtype, pd.CategoricalDtype):
+                arrow_type = pa.dictionary(pa.int32(), pa.string())
+            elif pd.api.types.is_bool_dtype(dtype):
+                arrow_type = pa.bool_()
+            elif pd.api.types.is_integer_dtype(dtype):
+                # Compteurs de matchs/événements : int32 suffit largement
+                arrow_type = pa.int32()
+            elif pd.api.types.is_float_dtype(dtype):
+                arrow_type = pa.float32() if float32 else pa.float64()
+            elif pd.api.types.is_datetime64_any_dtype(dtype):
+                arrow_type = pa.timestamp('ms')
+            else:
+                arrow_type = pa.string()
+            
+            fields.append(pa.field(str(col), arrow_type))
+        
+        return pa.schema(fields)
+    
+    @staticmethod
+    def to_arrow_table(df: pd.DataFrame,
+                       columns: Optional[List[str]] = None,
+                       float32: bool = False) -> 'pa.Table':
+        """Convertit le DataFrame (projection de colonnes) en table Arrow typée"""
+        if not ARROW_AVAILABLE:
+            raise ImportError("pyarrow est requis pour l'export Parquet/Arrow")
+        
+        if columns:
+            missing = [c for c in columns if c not in df.columns]
+            if missing:
+                raise ValueError(f"Colonnes inconnues: {missing}")
+            df = df[columns]
+        
+        schema = DataExporter.build_arrow_schema(df, float32=float32)
+        
+        # Les colonnes objet hétérogènes sont converties en texte avant le cast
+        arrays = []
+        for field in schema:
+            values = df[field.name]
+            if pa.types.is_string(field.type) or pa.types.is_dictionary(field.type):
+                values = values.astype(object).where(values.notna(), None)
+                values = values.map(lambda v: v if v is None else str(v))
+            arrays.append(pa.array(values, from_pandas=True).cast(field.type))
+        
+        return pa.Table.from_arrays(arrays, schema=schema)
+    
+    @staticmethod
+    def export_parquet(df: pd.DataFrame,
+                       columns: Optional[List[str]] = None,
+                       compression: str = 'zstd',
+                       float32: bool = False) -> bytes:
+        """
+        Exporte en Parquet (en mémoire)
+        
+        Args:
+            df: DataFrame à exporter
+            columns: Colonnes à conserver (toutes si None)
+            compression: 'zstd', 'snappy', 'gzip' ou 'none'
+            float32: Stocke les métriques décimales en float32
+        
+        Returns:
+            Contenu du fichier Parquet
+        """
+        if compression not in DataExporter.PARQUET_COMPRESSIONS:
+            raise ValueError(f"Compression Parquet inconnue: {compression}")
+        
+        table = DataExporter.to_arrow_table(df, columns, float32)
+        sink = pa.BufferOutputStream()
+        pq.write_table(table, sink, compression=None if compression == 'none' else compression)
+        return sink.getvalue().to_pybytes()
+    
+    @staticmethod
+    def export_arrow_ipc(df: pd.DataFrame,
+                         columns: Optional[List[str]] = None,
+                         compression: str = 'zstd',
+                         float32: bool = False) -> bytes:
+        """
+        Exporte au format Arrow IPC / Feather v2 (en mémoire)
+        
+        Args:
+            df: DataFrame à exporter
+            columns: Colonnes à conserver (toutes si None)
+            compression: 'zstd', 'lz4' ou 'none'
+            float32: Stocke les métriques décimales en float32
+        
+        Returns:
+            Contenu du fichier Arrow IPC
+        """
+        if compression not in DataExporter.ARROW_COMPRESSIONS:
+            raise ValueError(f"Compression Arrow inconnue: {compression}")
+        
+        table = DataExporter.to_arrow_table(df, columns, float32)
+        options = pa.ipc.IpcWriteOptions(compression=None if compression == 'none' else compression)
+        
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    @staticmethod
+    def iter_csv_chunks(df: pd.DataFrame,
+                        columns: Optional[List[str]] = None,
+                        chunk_size: int = CSV_CHUNK_SIZE) -> Iterator[str]:
+        """
+        Génère le CSV bloc par bloc (en-tête avec le premier bloc)
+        Le texte complet n'est jamais construit en mémoire
+        """
+        if columns:
+            df = df[columns]
+        
+        if len(df) == 0:
+            yield df.to_csv(index=False)
+            return
+        
+        for start in range(0, len(df), chunk_size):
+            chunk = df.iloc[start:start + chunk_size]
+            yield chunk.to_csv(index=False, header=(start == 0))
+    
+    @staticmethod
+    def write_csv_stream(df: pd.DataFrame,
+                         output_path: Optional[str] = None,
+                         columns: Optional[List[str]] = None,
+                         compress: bool = False,
+                         chunk_size: int = CSV_CHUNK_SIZE) -> str:
+        """
+        Écrit le CSV par blocs dans un fichier, compressé en gzip à la volée
+        
+        Args:
+            df: DataFrame à exporter
+            output_path: Fichier de sortie (fichier temporaire si None)
+            columns: Colonnes à conserver (toutes si None)
+            compress: Compression gzip pendant l'écriture
+            chunk_size: Nombre de lignes par bloc
+            
+        Returns:
+            Chemin du fichier écrit (à supprimer par l'appelant si temporaire)
+        """
+        if output_path is None:
+            suffix = '.csv.gz' if compress else '.csv'
+            fd, output_path = tempfile.mkstemp(suffix=suffix, prefix='football_export_')
+            os.close(fd)
+        
+        if compress:
+            handle = gzip.open(output_path, 'wt', encoding='utf-8', newline='')
+        else:
+            handle = open(output_path, 'w', encoding='utf-8', newline='')
+        
+        with handle:
+            for chunk in DataExporter.iter_csv_chunks(df, columns, chunk_size):
+                handle.write(chunk)
+        
+        return output_path
+
+
+if __name__ == "__main__":
+    print("✅ Module data_export.py chargé avec succès!")
+    print("Classe disponible: DataExporter")
+    print(f"Export Parquet/Arrow: {'✅ OUI' if ARROW_AVAILABLE else '❌ NON'}")
@@ -0,0 +1,130 @@
+# event_store.py
+"""
+Index des événements par joueur et par type d'événement
+Les événements sont triés une fois par (joueur, type) : chaque vue joueur ou
+joueur + type est une tranche contiguë (offsets), sans masque sur tout le DataFrame
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Iterator, List, Optional, Tuple
+import warnings
+warnings.filterwarnings('ignore')
+
+
+class PlayerEventIndex:
+    """
+    Événements d'un match ou d'une saison partitionnés par joueur puis par type
+    
+    Dans une tranche joueur, les événements sont groupés par type (ordre chronologique
+    conservé à l'intérieur d'un type) ; chronological=True rétablit l'ordre d'origine.
+    Les index d'origine du DataFrame sont conservés.
+    """
+    
+    def __init__(self, events: pd.DataFrame, player_col: str = 'player', type_col: str = 'type'):
+        """
+        Args:
+            events: Événements (format sb.events) ; lignes sans joueur ignorées
+            player_col: Colonne joueur
+            type_col: Colonne type d'événement
+        """
+        self.player_col = player_col
+        self.type_col = type_col
+        
+        positions = np.flatnonzero(events[player_col].notna().to_numpy())
+        player_codes, self.players = pd.factorize(events[player_col].iloc[positions], sort=False)
+        if type_col in events.columns:
+            type_codes, self.types = pd.factorize(events[type_col].iloc[positions], sort=False)
+        else:
+            type_codes, self.types = np.zeros(len(positions), dtype=np.int64), pd.Index([None])
+        
+        # Tri unique : joueur, type, puis position d'origine (tri stable)
+        order = np.lexsort((positions, type_codes, player_codes))
+        self.events = events.iloc[positions[order]]
+        self._positions = positions[order]
+        player_codes = player_codes[order]
+        type_codes = type_codes[order]
+        
+        n_players = len(self.players)
+        self._player_offsets = np.searchsorted(player_codes, np.arange(n_players + 1))
+        self._player_lookup = {player: code for code, player in enumerate(self.players)}
+        self._type_lookup = {event_type: code for code, event_type in enumerate(self.types)}
+        
+        # Offsets par couple (joueur, type) : bornes des tranches contiguës
+        pair_codes = player_codes.astype(np.int64) * max(len(self.types), 1) + type_codes
+        starts = np.flatnonzero(np.r_[True, pair_codes[1:] != pair_codes[:-1]]) if len(pair_codes) else np.array([], dtype=np.int64)
+        stops = np.r_[starts[1:], len(pair_codes)]
+        self._pair_offsets = {
+            (int(player_codes[start]), int(type_codes[start])): (int(start), int(stop))
+            for start, stop in zip(starts, stops)
+        }
+        
+        # Premier événement chronologique de chaque joueur (ligne dans self.events)
+        if n_players:
+            block_sizes = np.diff(self._player_offsets)
+            first_positions = np.minimum.reduceat(self._positions, self._player_offsets[:-1])
+            self._first_rows = np.flatnonzero(self._positions == np.repeat(first_positions, block_sizes))
+        else:
+            self._first_rows = np.array([], dtype=np.int64)
+    
+    def __len__(self) -> int:
+        return len(self.players)
+    
+    def __contains__(self, player) -> bool:
+        return player in self._player_lookup
+    
+    def __iter__(self) -> Iterator:
+        return iter(self.players)
+    
+    def player_bounds(self, player) -> Tuple[int, int]:
+        """Bornes (début, fin) de la tranche du joueur dans self.events ; (0, 0) si inconnu"""
+        code = self._player_lookup.get(player)
+        if code is None:
+            return 0, 0
+        return int(self._player_offsets[code]), int(self._player_offsets[code + 1])
+    
+    def type_bounds(self, player, event_type: str) -> Tuple[int, int]:
+        """Bornes de la tranche (joueur, type) dans self.events ; (0, 0) si aucune"""
+        code = self._player_lookup.get(player)
+        type_code = self._type_lookup.get(event_type)
+        if code is None or type_code is None:
+            return 0, 0
+        return self._pair_offsets.get((code, type_code), (0, 0))
+    
+    def player_events(self, player, chronological: bool = False) -> pd.DataFrame:
+        """Événements du joueur (tranche, sans parcours du DataFrame complet)"""
+        start, stop = self.player_bounds(player)
+        view = self.events.iloc[start:stop]
+        if chronological:
+            return view.iloc[np.argsort(self._positions[start:stop], kind='stable')]
+        return view
+    
+    def type_events(self, player, event_type: str) -> pd.DataFrame:
+        """Événements d'un type pour un joueur, dans l'ordre chronologique"""
+        start, stop = self.type_bounds(player, event_type)
+        return self.events.iloc[start:stop]
+    
+    def type_count(self, player, event_type: str) -> int:
+        start, stop = self.type_bounds(player, event_type)
+        return stop - start
+    
+    def type_counts(self) -> pd.DataFrame:
+        """Nombre d'événements par joueur (lignes) et par type (colonnes)"""
+        counts = np.zeros((len(self.players), len(self.types)), dtype=np.int64)
+        for (code, type_code), (start, stop) in self._pair_offsets.items():
+            counts[code, type_code] = stop - start
+        return pd.DataFrame(counts, index=pd.Index(self.players, name=self.player_col), columns=list(self.types))
+    
+    def first_values(self, column: str) -> pd.Series:
+        """Valeur de la colonne au premier événement chronologique de chaque joueur (ex: équipe)"""
+        values = self.events[column].to_numpy()[self._first_rows] if len(self._first_rows) else []
+        return pd.Series(values, index=pd.Index(self.players, name=self.player_col), name=column)
+    
+    def as_dict(self, players: Optional[List] = None) -> Dict[str, pd.DataFrame]:
+        """{joueur: événements} (tranches), format des anciens consommateurs par joueur"""
+        return {player: self.player_events(player) for player in (self.players if players is None else players)}
+
+
+if __name__ == "__main__":
+    print("✅ Module event_store.py chargé avec succès!")
+    print("Classe disponible: PlayerEventIndex")
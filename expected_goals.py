@@ -0,0 +1,259 @@
+# expected_goals.py
+"""
+Modèle xG local (gradient boosting) pour les sources sans shot_statsbomb_xg
+Entraîné sur les tirs en cache (distance, angle, surface de contact, type de tir, pression,
+première intention), écrit sur disque et appliqué par lot à tous les tirs d'un match ou
+d'une saison : seuls les tirs sans xG (absent ou nul) reçoivent la prédiction locale.
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+import numpy as np
+import joblib
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.metrics import brier_score_loss, log_loss
+from sklearn.model_selection import train_test_split
+
+from event_sources import get_event_source
+from pitch import GOAL_CENTER_Y, GOAL_WIDTH, GOAL_X, SHOOTOUT_PERIOD, event_column, point_xy
+import warnings
+warnings.filterwarnings('ignore')
+
+
+DEFAULT_XG_PATH = os.path.join('datasets', 'expected_goals.joblib')
+
+XG_COLUMN = 'shot_statsbomb_xg'
+
+# Variables du modèle (pied = référence pour la surface, jeu ouvert pour le type)
+FEATURES = ['distance', 'angle', 'header', 'other_body_part', 'free_kick', 'penalty',
+            'corner', 'under_pressure', 'first_time']
+
+_DEFAULT_MODELS = {}  # (chemin, date de modification) -> modèle chargé
+
+
+def _flag(events: pd.DataFrame, column: str) -> np.ndarray:
+    """Colonne booléenne StatsBomb (True ou absente) en 0 / 1"""
+    return (event_column(events, column).to_numpy(dtype=object) == True).astype(float)
+
+
+def shot_features(shots: pd.DataFrame) -> pd.DataFrame:
+    """
+    Variables du modèle pour chaque tir (index des tirs, colonnes FEATURES)
+    
+    - distance : distance au centre du but (yards)
+    - angle : angle d'ouverture entre les deux poteaux (radians)
+    """
+    x, y = point_xy(shots, 'location')
+    dx = GOAL_X - x
+    dy = GOAL_CENTER_Y - y
+    angle = np.arctan2(GOAL_WIDTH * dx, dx ** 2 + dy ** 2 - (GOAL_WIDTH / 2) ** 2)
+    
+    body_part = event_column(shots, 'shot_body_part').to_numpy(dtype=object)
+    shot_type = event_column(shots, 'shot_type').to_numpy(dtype=object)
+    return pd.DataFrame({
+        'distance': np.hypot(dx, dy),
+        'angle': np.where(angle < 0, angle + np.pi, angle),
+        'header': (body_part == 'Head').astype(float),
+        'other_body_part': (body_part == 'Other').astype(float),
+        'free_kick': (shot_type == 'Free Kick').astype(float),
+        'penalty': (shot_type == 'Penalty').astype(float),
+        'corner': (shot_type == 'Corner').astype(float),
+        'under_pressure': _flag(shots, 'under_pressure'),
+        'first_time': _flag(shots, 'shot_first_time'),
+    }, index=shots.index)
+
+
+class ExpectedGoalsModel:
+    """
+    Probabilité de but de chaque tir (HistGradientBoostingClassifier sur FEATURES)
+    Remplace shot_statsbomb_xg quand la source ne le fournit pas
+    """
+    
+    def __init__(self, estimator: HistGradientBoostingClassifier, fitted_at: Optional[str] = None,
+                 seasons: Optional[List[Tuple[int, int]]] = None, metrics: Optional[Dict] = None):
+        """
+        Args:
+            estimator: Classifieur entraîné (0 = pas de but, 1 = but)
+            seasons: Saisons (competition_id, season_id) ayant servi à l'entraînement
+            metrics: Tirs, buts et scores sur l'échantillon de validation
+        """
+        self.estimator = estimator
+        self.fitted_at = fitted_at
+        self.seasons = [tuple(season) for season in seasons or []]
+        self.metrics = metrics or {}
+    
+    @staticmethod
+    def training_shots(events: pd.DataFrame) -> pd.DataFrame:
+        """Tirs exploitables pour l'entraînement (position connue, hors séance de tirs au but)"""
+        shots = events[event_column(events, 'type').to_numpy(dtype=object) == 'Shot']
+        x, _ = point_xy(shots, 'location')
+        keep = np.isfinite(x) & (event_column(shots, 'period', 1).to_numpy() != SHOOTOUT_PERIOD)
+        return shots[keep]
+    
+    @classmethod
+    def fit(cls, events: Union[pd.DataFrame, List[pd.DataFrame]],
+            seasons: Optional[List[Tuple[int, int]]] = None,
+            validation_fraction: float = 0.2, random_state: int = 42) -> 'ExpectedGoalsModel':
+        """
+        Entraîne le modèle sur les tirs d'un ou plusieurs lots d'événements (ex: une saison chacun)
+        Les scores (log loss, Brier) sont mesurés sur validation_fraction des tirs, puis le
+        modèle final est entraîné sur tous les tirs
+        """
+        batches = [events] if isinstance(events, pd.DataFrame) else list(events)
+        frames = [cls.training_shots(batch) for batch in batches if batch is not None and not batch.empty]
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            raise ValueError("Aucun tir pour entraîner le modèle xG")
+        
+        features = pd.concat([shot_features(frame) for frame in frames], ignore_index=True)
+        goals = np.concatenate([(event_column(frame, 'shot_outcome').to_numpy(dtype=object) == 'Goal')
+                                for frame in frames]).astype(int)
+        if goals.min() == goals.max():
+            raise ValueError("Tirs d'une seule classe (aucun but ou que des buts)")
+        
+        def make_estimator() -> HistGradientBoostingClassifier:
+            return HistGradientBoostingClassifier(max_iter=200, learning_rate=0.05, max_leaf_nodes=15,
+                                                  min_samples_leaf=20, l2_regularization=1.0,
+                                                  random_state=random_state)
+        
+        metrics = {'shots': int(len(goals)), 'goals': int(goals.sum())}
+        if validation_fraction > 0:
+            train_x, test_x, train_y, test_y = train_test_split(
+                features, goals, test_size=validation_fraction, random_state=random_state, stratify=goals
+            )
+            probabilities = make_estimator().fit(train_x, train_y).predict_proba(test_x)[:, 1]
+            baseline = np.full(len(test_y), train_y.mean())
+            metrics.update({
+                'log_loss': round(float(log_loss(test_y, probabilities, labels=[0, 1])), 4),
+                'brier': round(float(brier_score_loss(test_y, probabilities)), 4),
+                'baseline_log_loss': round(float(log_loss(test_y, baseline, labels=[0, 1])), 4),
+            })
+        
+        estimator = make_estimator().fit(features, goals)
+        return cls(estimator, datetime.now().isoformat(timespec='seconds'), seasons, metrics)
+    
+    def predict(self, shots: pd.DataFrame) -> np.ndarray:
+        """xG de chaque tir (une prédiction par lot, NaN sans position)"""
+        if shots.empty:
+            return np.zeros(0)
+        features = shot_features(shots)
+        xg = np.full(len(shots), np.nan)
+        located = np.isfinite(features['distance'].to_numpy())
+        if located.any():
+            xg[located] = self.estimator.predict_proba(features[located])[:, 1]
+        return xg
+    
+    def fill_missing(self, events: pd.DataFrame) -> pd.DataFrame:
+        """
+        Événements avec XG_COLUMN complété pour les tirs sans xG (absent, NaN ou 0)
+        Renvoie les événements inchangés (sans copie) si tous les tirs ont déjà un xG
+        """
+        is_shot = event_column(events, 'type').to_numpy(dtype=object) == 'Shot'
+        if not is_shot.any():
+            return events
+        
+        current = pd.to_numeric(event_column(events, XG_COLUMN), errors='coerce').to_numpy(dtype=float)
+        missing = is_shot & ~(current > 0)
+        if not missing.any():
+            return events
+        
+        filled = current.copy()
+        filled[missing] = self.predict(events[missing])
+        return events.assign(**{XG_COLUMN: filled})
+    
+    @classmethod
+    def load(cls, path: str = DEFAULT_XG_PATH) -> Optional['ExpectedGoalsModel']:
+        """Charge le modèle persisté (None s'il n'existe pas)"""
+        if not os.path.isfile(path):
+            return None
+        
+        data = joblib.load(path)
+        return cls(data['estimator'], data.get('fitted_at'), data.get('seasons'), data.get('metrics'))
+    
+    def save(self, path: str = DEFAULT_XG_PATH) -> str:
+        """Écrit le modèle (joblib)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        joblib.dump({
+            'estimator': self.estimator,
+            'features': FEATURES,
+            'fitted_at': self.fitted_at,
+            'seasons': [list(season) for season in self.seasons],
+            'metrics': self.metrics,
+        }, path)
+        return path
+    
+    def summary(self) -> Dict:
+        return dict({'seasons': len(self.seasons), 'fitted_at': self.fitted_at}, **self.metrics)
+
+
+def default_model(path: str = DEFAULT_XG_PATH) -> Optional[ExpectedGoalsModel]:
+    """Modèle persisté, chargé une fois par process (rechargé si le fichier change) ; None sans modèle"""
+    if not os.path.isfile(path):
+        return None
+    
+    key = (os.path.abspath(path), os.path.getmtime(path))
+    if key not in _DEFAULT_MODELS:
+        _DEFAULT_MODELS.clear()
+        _DEFAULT_MODELS[key] = ExpectedGoalsModel.load(path)
+    return _DEFAULT_MODELS[key]
+
+
+def fill_missing_xg(events: pd.DataFrame, model: Optional[ExpectedGoalsModel] = None,
+                    use_default_model: bool = True) -> pd.DataFrame:
+    """
+    xG local des tirs sans shot_statsbomb_xg (modèle fourni, sinon persisté ; inchangé sans modèle)
+    
+    Args:
+        use_default_model: False : jamais de modèle persisté (sorties indépendantes du dossier courant)
+    """
+    if model is None and use_default_model:
+        model = default_model()
+    if model is None or events is None or events.empty:
+        return events
+    return model.fill_missing(events)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from pipeline_cli import parse_season
+    
+    parser = argparse.ArgumentParser(description="Entraîne le modèle xG local sur les tirs en cache")
+    parser.add_argument('--season', dest='seasons', type=parse_season, action='append', required=True,
+                        metavar='COMP:SAISON', help="Saison d'entraînement (répétable), ex: 43:3")
+    parser.add_argument('--open-data', default=None, metavar='DOSSIER',
+                        help="Checkout local de statsbomb/open-data (défaut: $STATSBOMB_OPEN_DATA, sinon réseau)")
+    parser.add_argument('--event-store', default=None, metavar='DOSSIER',
+                        help="Store colonnaire par saison (défaut: $STATSBOMB_EVENT_STORE)")
+    parser.add_argument('--output', default=DEFAULT_XG_PATH,
+                        help="Fichier du modèle à écrire")
+    args = parser.parse_args(argv)
+    
+    from football_recruitment_app import FootballRecruitmentAnalyzer
+    
+    analyzer = FootballRecruitmentAnalyzer(get_event_source(args.open_data, args.event_store))
+    
+    start = time.perf_counter()
+    batches = [analyzer.load_season_events(competition_id, season_id)
+               for competition_id, season_id in args.seasons]
+    loaded = time.perf_counter()
+    model = ExpectedGoalsModel.fit(batches, seasons=args.seasons)
+    model.save(args.output)
+    
+    metrics = model.metrics
+    print(f"✅ Modèle xG: {metrics['shots']} tirs, {metrics['goals']} buts "
+          f"(chargement {loaded - start:.1f}s, entraînement {time.perf_counter() - loaded:.2f}s) -> {args.output}")
+    if 'log_loss' in metrics:
+        print(f"  Validation: log loss {metrics['log_loss']} (référence {metrics['baseline_log_loss']}), "
+              f"Brier {metrics['brier']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
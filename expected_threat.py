@@ -0,0 +1,283 @@
+# expected_threat.py
+"""
+Expected Threat (xT) ajusté localement sur les événements en cache
+Grille nx x ny : probabilités de tir / de déplacement du ballon et matrice de transition
+case -> case (passes et conduites réussies) comptées en quelques np.bincount, puis
+itération sur les valeurs jusqu'à convergence. Le modèle est écrit sur disque (JSON) et
+appliqué à toutes les passes et conduites d'un match ou d'une saison par une lecture
+vectorisée de la grille (xT de la case d'arrivée - xT de la case de départ).
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+import numpy as np
+
+from event_sources import get_event_source
+from pitch import PITCH_LENGTH, PITCH_WIDTH, SHOOTOUT_PERIOD, event_column, point_xy
+import warnings
+warnings.filterwarnings('ignore')
+
+
+DEFAULT_XT_RESOLUTION = (16, 12)
+DEFAULT_XT_PATH = os.path.join('datasets', 'expected_threat.json')
+
+# Penalties : hors modèle (tirs sans action préalable), comme les tirs au but (SHOOTOUT_PERIOD)
+EXCLUDED_SHOT_TYPES = ['Penalty']
+
+# Colonne ajoutée aux événements par ExpectedThreatModel.annotate
+XT_COLUMN = 'xt_added'
+
+_DEFAULT_MODELS = {}  # (chemin, date de modification) -> modèle chargé
+
+
+class ExpectedThreatModel:
+    """
+    Grille xT : xt[i, j] = probabilité que l'équipe en possession dans la case (i en x, j en y)
+    marque lors de ses prochaines actions
+    
+    xT(z) = P(tir | z) * P(but | tir, z) + P(déplacement | z) * somme_z' T(z -> z') * xT(z')
+    """
+    
+    def __init__(self, grid: np.ndarray, fitted_at: Optional[str] = None,
+                 seasons: Optional[List[Tuple[int, int]]] = None, events: int = 0,
+                 iterations: int = 0):
+        """
+        Args:
+            grid: Valeurs xT (nx x ny)
+            seasons: Saisons (competition_id, season_id) ayant servi à l'ajustement
+            events: Nombre d'actions (tirs + déplacements) observées
+            iterations: Itérations de la convergence
+        """
+        self.grid = np.asarray(grid, dtype=float)
+        self.fitted_at = fitted_at
+        self.seasons = [tuple(season) for season in seasons or []]
+        self.events = int(events)
+        self.iterations = int(iterations)
+    
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.grid.shape[0], self.grid.shape[1]
+    
+    @staticmethod
+    def _cells(x: np.ndarray, y: np.ndarray, nx: int, ny: int) -> np.ndarray:
+        """Case de chaque point (i * ny + j), -1 sans position"""
+        valid = np.isfinite(x) & np.isfinite(y)
+        ix = np.clip((np.nan_to_num(x) * (nx / PITCH_LENGTH)).astype(np.int64), 0, nx - 1)
+        iy = np.clip((np.nan_to_num(y) * (ny / PITCH_WIDTH)).astype(np.int64), 0, ny - 1)
+        return np.where(valid, ix * ny + iy, -1)
+    
+    @classmethod
+    def _moves(cls, events: pd.DataFrame, nx: int, ny: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Déplacements du ballon : (case de départ, case d'arrivée, réussi) de chaque passe et conduite
+        Passe ratée : départ compté, sans arrivée (possession perdue)
+        """
+        event_type = event_column(events, 'type').to_numpy(dtype=object)
+        is_pass = event_type == 'Pass'
+        is_carry = event_type == 'Carry'
+        
+        start = cls._cells(*point_xy(events, 'location'), nx, ny)
+        pass_end = cls._cells(*point_xy(events, 'pass_end_location'), nx, ny)
+        carry_end = cls._cells(*point_xy(events, 'carry_end_location'), nx, ny)
+        end = np.where(is_pass, pass_end, np.where(is_carry, carry_end, -1))
+        
+        completed = is_carry | (is_pass & event_column(events, 'pass_outcome').isna().to_numpy())
+        successful = completed & (end >= 0)
+        return start, end, successful
+    
+    @classmethod
+    def count_actions(cls, events: pd.DataFrame,
+                      resolution: Tuple[int, int] = DEFAULT_XT_RESOLUTION) -> Dict[str, np.ndarray]:
+        """
+        Comptes d'un lot d'événements (match ou saison), additionnables entre lots
+        shots, goals, moves : par case (nx * ny) ; transitions : case x case
+        """
+        nx, ny = resolution
+        n_cells = nx * ny
+        start, end, successful = cls._moves(events, nx, ny)
+        event_type = event_column(events, 'type').to_numpy(dtype=object)
+        
+        is_move = np.isin(event_type, ['Pass', 'Carry']) & (start >= 0)
+        is_shot = (event_type == 'Shot') & (start >= 0) & \
+            (event_column(events, 'period', 1).to_numpy() != SHOOTOUT_PERIOD) & \
+            ~event_column(events, 'shot_type').isin(EXCLUDED_SHOT_TYPES).to_numpy()
+        is_goal = is_shot & (event_column(events, 'shot_outcome').to_numpy(dtype=object) == 'Goal')
+        
+        transition = is_move & successful
+        return {
+            'shots': np.bincount(start[is_shot], minlength=n_cells),
+            'goals': np.bincount(start[is_goal], minlength=n_cells),
+            'moves': np.bincount(start[is_move], minlength=n_cells),
+            'transitions': np.bincount(start[transition] * n_cells + end[transition],
+                                       minlength=n_cells * n_cells).reshape(n_cells, n_cells),
+        }
+    
+    @classmethod
+    def fit(cls, events: Union[pd.DataFrame, List[pd.DataFrame]],
+            resolution: Tuple[int, int] = DEFAULT_XT_RESOLUTION,
+            seasons: Optional[List[Tuple[int, int]]] = None,
+            max_iterations: int = 100, tolerance: float = 1e-6) -> 'ExpectedThreatModel':
+        """
+        Ajuste la grille sur un ou plusieurs lots d'événements (ex: une saison chacun)
+        
+        Args:
+            events: DataFrame d'événements ou liste de DataFrames (comptes additionnés)
+            max_iterations, tolerance: Arrêt de l'itération sur les valeurs
+        """
+        nx, ny = resolution
+        batches = [events] if isinstance(events, pd.DataFrame) else list(events)
+        counts = None
+        for batch in batches:
+            if batch is None or batch.empty:
+                continue
+            batch_counts = cls.count_actions(batch, resolution)
+            counts = batch_counts if counts is None else \
+                {key: counts[key] + batch_counts[key] for key in counts}
+        if counts is None:
+            raise ValueError("Aucun événement pour ajuster le modèle xT")
+        
+        shots = counts['shots'].astype(float)
+        moves = counts['moves'].astype(float)
+        actions = shots + moves
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shot_prob = np.where(actions > 0, shots / actions, 0.0)
+            move_prob = np.where(actions > 0, moves / actions, 0.0)
+            goal_prob = np.where(shots > 0, counts['goals'] / shots, 0.0)
+            transition = np.where(moves[:, None] > 0, counts['transitions'] / moves[:, None], 0.0)
+        
+        scoring = shot_prob * goal_prob
+        xt = np.zeros(nx * ny)
+        iterations = 0
+        for iterations in range(1, max_iterations + 1):
+            updated = scoring + move_prob * (transition @ xt)
+            converged = np.abs(updated - xt).max() < tolerance
+            xt = updated
+            if converged:
+                break
+        
+        return cls(xt.reshape(nx, ny), datetime.now().isoformat(timespec='seconds'),
+                   seasons, int(actions.sum()), iterations)
+    
+    def move_values(self, events: pd.DataFrame) -> np.ndarray:
+        """xT ajouté par chaque événement : passes et conduites réussies, 0 sinon"""
+        nx, ny = self.shape
+        start, end, successful = self._moves(events, nx, ny)
+        valid = successful & (start >= 0)
+        flat = self.grid.ravel()
+        return np.where(valid, flat[np.maximum(end, 0)] - flat[np.maximum(start, 0)], 0.0)
+    
+    def annotate(self, events: pd.DataFrame) -> pd.DataFrame:
+        """Copie des événements avec la colonne XT_COLUMN"""
+        return events.assign(**{XT_COLUMN: self.move_values(events)})
+    
+    def player_totals(self, events: pd.DataFrame, group_keys: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        xT ajouté par joueur (défaut: joueur + équipe) : total, passes, conduites, actions positives
+        Une saison entière en une agrégation groupée
+        """
+        group_keys = group_keys or ['player', 'team']
+        values = self.move_values(events)
+        event_type = event_column(events, 'type').to_numpy(dtype=object)
+        frame = events[group_keys].copy()
+        frame['xt_added'] = values
+        frame['xt_added_passes'] = np.where(event_type == 'Pass', values, 0.0)
+        frame['xt_added_carries'] = np.where(event_type == 'Carry', values, 0.0)
+        frame['xt_positive_actions'] = (values > 0).astype(int)
+        totals = frame[events['player'].notna().to_numpy()].groupby(group_keys, observed=True, sort=False).sum()
+        return totals.reset_index()
+    
+    @classmethod
+    def load(cls, path: str = DEFAULT_XT_PATH) -> Optional['ExpectedThreatModel']:
+        """Charge le modèle persisté (None s'il n'existe pas)"""
+        if not os.path.isfile(path):
+            return None
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        return cls(np.array(data['grid'], dtype=float), data.get('fitted_at'), data.get('seasons'),
+                   data.get('events', 0), data.get('iterations', 0))
+    
+    def save(self, path: str = DEFAULT_XT_PATH) -> str:
+        """Écrit le modèle (JSON)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        data = {
+            'fitted_at': self.fitted_at,
+            'resolution': list(self.shape),
+            'seasons': [list(season) for season in self.seasons],
+            'events': self.events,
+            'iterations': self.iterations,
+            'grid': self.grid.round(8).tolist(),
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        return path
+    
+    def summary(self) -> Dict:
+        return {
+            'resolution': f'{self.shape[0]}x{self.shape[1]}',
+            'seasons': len(self.seasons),
+            'events': self.events,
+            'iterations': self.iterations,
+            'max_xt': round(float(self.grid.max()), 4),
+        }
+
+
+def default_model(path: str = DEFAULT_XT_PATH) -> Optional[ExpectedThreatModel]:
+    """Modèle persisté, chargé une fois par process (rechargé si le fichier change) ; None sans modèle"""
+    if not os.path.isfile(path):
+        return None
+    
+    key = (os.path.abspath(path), os.path.getmtime(path))
+    if key not in _DEFAULT_MODELS:
+        _DEFAULT_MODELS.clear()
+        _DEFAULT_MODELS[key] = ExpectedThreatModel.load(path)
+    return _DEFAULT_MODELS[key]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from pipeline_cli import parse_season
+    
+    parser = argparse.ArgumentParser(description="Ajuste la grille Expected Threat (xT) sur les événements locaux")
+    parser.add_argument('--season', dest='seasons', type=parse_season, action='append', required=True,
+                        metavar='COMP:SAISON', help="Saison d'entraînement (répétable), ex: 43:3")
+    parser.add_argument('--open-data', default=None, metavar='DOSSIER',
+                        help="Checkout local de statsbomb/open-data (défaut: $STATSBOMB_OPEN_DATA, sinon réseau)")
+    parser.add_argument('--event-store', default=None, metavar='DOSSIER',
+                        help="Store colonnaire par saison (défaut: $STATSBOMB_EVENT_STORE)")
+    parser.add_argument('--resolution', default='16x12', metavar='NXxNY',
+                        help="Taille de la grille (défaut: 16x12)")
+    parser.add_argument('--output', default=DEFAULT_XT_PATH,
+                        help="Fichier du modèle à écrire")
+    args = parser.parse_args(argv)
+    
+    from football_recruitment_app import FootballRecruitmentAnalyzer
+    
+    nx, ny = (int(value) for value in args.resolution.lower().split('x'))
+    analyzer = FootballRecruitmentAnalyzer(get_event_source(args.open_data, args.event_store))
+    
+    start = time.perf_counter()
+    batches = [analyzer.load_season_events(competition_id, season_id)
+               for competition_id, season_id in args.seasons]
+    loaded = time.perf_counter()
+    model = ExpectedThreatModel.fit(batches, (nx, ny), seasons=args.seasons)
+    model.save(args.output)
+    
+    summary = model.summary()
+    print(f"✅ Modèle xT {summary['resolution']}: {summary['events']} actions, "
+          f"{summary['iterations']} itérations, xT max {summary['max_xt']} "
+          f"(chargement {loaded - start:.1f}s, ajustement {time.perf_counter() - loaded:.2f}s) -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
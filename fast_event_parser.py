@@ -0,0 +1,376 @@
+# fast_event_parser.py
+"""
+Parser rapide des événements StatsBomb (JSON brut)
+Un seul passage sur les événements, uniquement les champs utilisés par les métriques,
+directement en tableaux NumPy typés (noms en codes catégoriels, coordonnées en float)
+"""
+
+import json
+import sys
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from statsbombpy import entities
+from statsbombpy.helpers import filter_and_group_events
+import warnings
+warnings.filterwarnings('ignore')
+
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+
+class EventColumns:
+    """Événements d'un match en colonnes typées"""
+    
+    def __init__(self, match_id: int, kinds: Dict[str, str], arrays: Dict[str, np.ndarray],
+                 categories: Dict[str, List[str]], objects: Dict[str, np.ndarray]):
+        """
+        Args:
+            match_id: ID du match
+            kinds: Colonne -> type ('name', 'id', 'int', 'float', 'bool', 'point', 'object')
+            arrays: Tableaux NumPy (codes int32 pour les noms, -1 = absent ; <col>_x/<col>_y pour les points)
+            categories: Libellés des colonnes catégorielles (index = code)
+            objects: Valeurs conservées telles quelles (listes de coordonnées, tactique)
+        """
+        self.match_id = match_id
+        self.kinds = kinds
+        self.arrays = arrays
+        self.categories = categories
+        self.objects = objects
+        self.n_events = len(arrays['type'])
+    
+    def _present(self, column: str) -> bool:
+        """True si la colonne a au moins une valeur dans le match"""
+        kind = self.kinds[column]
+        if kind == 'object':
+            return any(v is not None for v in self.objects[column])
+        if kind == 'point':
+            return bool(np.isfinite(self.arrays[f'{column}_x']).any())
+        if kind == 'float':
+            return bool(np.isfinite(self.arrays[column]).any())
+        if kind == 'bool':
+            return bool(self.arrays[column].any())
+        return bool((self.arrays[column] >= 0).any())
+    
+    def statsbomb_order(self) -> np.ndarray:
+        """
+        Ordre des lignes de sb.events : regroupement par type d'événement
+        (ordre de première apparition), ordre chronologique dans chaque type
+        Les codes de 'type' sont attribués dans l'ordre de première apparition
+        """
+        return np.argsort(self.arrays['type'], kind='stable')
+    
+    def to_frame(self, statsbomb_order: bool = True) -> pd.DataFrame:
+        """
+        DataFrame utilisable par les extracteurs à la place de sb.events
+        
+        Args:
+            statsbomb_order: Reproduit l'ordre des lignes de sb.events
+                (sinon ordre chronologique du JSON)
+        
+        Returns:
+            DataFrame (noms en category, booléens 1.0/NaN comme statsbombpy,
+            coordonnées en listes + colonnes <col>_x/<col>_y)
+        """
+        order = self.statsbomb_order() if statsbomb_order else np.arange(self.n_events)
+        data = {'match_id': np.full(self.n_events, self.match_id)}
+        
+        for column, kind in self.kinds.items():
+            if not self._present(column):
+                continue  # Comme sb.events : pas de colonne pour un champ absent du match
+            
+            if kind == 'name':
+                data[column] = pd.Categorical.from_codes(self.arrays[column][order],
+                                                         categories=self.categories[column])
+            elif kind == 'id':
+                ids = self.arrays[column][order]
+                data[column] = np.where(ids >= 0, ids, np.nan)
+            elif kind == 'bool':
+                # statsbombpy : True ou NaN (champ absent)
+                data[column] = np.where(self.arrays[column][order], 1.0, np.nan)
+            elif kind == 'point':
+                data[column] = self.objects[column][order]
+                data[f'{column}_x'] = self.arrays[f'{column}_x'][order]
+                data[f'{column}_y'] = self.arrays[f'{column}_y'][order]
+            elif kind == 'object':
+                data[column] = self.objects[column][order]
+            else:
+                data[column] = self.arrays[column][order]
+        
+        return pd.DataFrame(data, columns=sorted(data))
+    
+    def to_arrow(self) -> 'pa.Table':
+        """Table Arrow (dictionnaires pour les noms, coordonnées en colonnes x/y)"""
+        if not ARROW_AVAILABLE:
+            raise ImportError("pyarrow est requis pour la conversion Arrow")
+        
+        columns = {'match_id': pa.array(np.full(self.n_events, self.match_id, dtype=np.int64))}
+        
+        for column, kind in self.kinds.items():
+            if kind == 'name':
+                codes = self.arrays[column]
+                indices = pa.array(codes, mask=codes < 0, type=pa.int32())
+                columns[column] = pa.DictionaryArray.from_arrays(
+                    indices, pa.array(self.categories[column], type=pa.string())
+                )
+            elif kind == 'point':
+                columns[f'{column}_x'] = pa.array(self.arrays[f'{column}_x'], from_pandas=True)
+                columns[f'{column}_y'] = pa.array(self.arrays[f'{column}_y'], from_pandas=True)
+            elif kind in ('int', 'id'):
+                values = self.arrays[column]
+                columns[column] = pa.array(values, mask=values < 0)
+            elif kind in ('float', 'bool'):
+                columns[column] = pa.array(self.arrays[column], from_pandas=True)
+            elif column == 'id':
+                columns[column] = pa.array(self.objects[column].tolist(), type=pa.string())
+        
+        return pa.table(columns)
+
+
+class FastEventParser:
+    """Parse le JSON brut d'un match en colonnes typées (EventColumns)"""
+    
+    # (colonne, clé JSON, type) - champs communs à tous les événements
+    COMMON_FIELDS = [
+        ('id', 'id', 'object'),
+        ('index', 'index', 'int'),
+        ('period', 'period', 'int'),
+        ('minute', 'minute', 'int'),
+        ('second', 'second', 'int'),
+        ('possession', 'possession', 'int'),
+        ('duration', 'duration', 'float'),
+        ('type', 'type', 'name'),
+        ('player', 'player', 'name'),
+        ('player_id', 'player', 'id'),
+        ('team', 'team', 'name'),
+        ('team_id', 'team', 'id'),
+        ('possession_team', 'possession_team', 'name'),
+        ('play_pattern', 'play_pattern', 'name'),
+        ('position', 'position', 'name'),
+        ('location', 'location', 'point'),
+        ('under_pressure', 'under_pressure', 'bool'),
+        ('counterpress', 'counterpress', 'bool'),
+        ('tactics', 'tactics', 'object'),
+    ]
+    
+    # Champs propres à un type : clé du sous-objet JSON -> (colonne, clé, type)
+    TYPE_FIELDS = {
+        'pass': [
+            ('pass_outcome', 'outcome', 'name'),
+            ('pass_height', 'height', 'name'),
+            ('pass_type', 'type', 'name'),
+            ('pass_body_part', 'body_part', 'name'),
+            ('pass_recipient', 'recipient', 'name'),
+            ('pass_length', 'length', 'float'),
+            ('pass_angle', 'angle', 'float'),
+            ('pass_end_location', 'end_location', 'point'),
+            ('pass_shot_assist', 'shot_assist', 'bool'),
+            ('pass_goal_assist', 'goal_assist', 'bool'),
+            ('pass_cross', 'cross', 'bool'),
+            ('pass_switch', 'switch', 'bool'),
+            ('pass_through_ball', 'through_ball', 'bool'),
+            ('pass_cut_back', 'cut_back', 'bool'),
+        ],
+        'shot': [
+            ('shot_statsbomb_xg', 'statsbomb_xg', 'float'),
+            ('shot_outcome', 'outcome', 'name'),
+            ('shot_type', 'type', 'name'),
+            ('shot_body_part', 'body_part', 'name'),
+            ('shot_technique', 'technique', 'name'),
+            ('shot_end_location', 'end_location', 'point'),
+            ('shot_key_pass_id', 'key_pass_id', 'object'),
+            ('shot_first_time', 'first_time', 'bool'),
+            ('shot_one_on_one', 'one_on_one', 'bool'),
+            ('shot_deflected', 'deflected', 'bool'),
+        ],
+        'carry': [
+            ('carry_end_location', 'end_location', 'point'),
+        ],
+        'dribble': [
+            ('dribble_outcome', 'outcome', 'name'),
+            ('dribble_nutmeg', 'nutmeg', 'bool'),
+        ],
+        'duel': [
+            ('duel_type', 'type', 'name'),
+            ('duel_outcome', 'outcome', 'name'),
+        ],
+        'goalkeeper': [
+            ('goalkeeper_type', 'type', 'name'),
+            ('goalkeeper_outcome', 'outcome', 'name'),
+        ],
+        'foul_committed': [
+            ('foul_committed_card', 'card', 'name'),
+        ],
+        'substitution': [
+            ('substitution_replacement', 'replacement', 'name'),
+            ('substitution_outcome', 'outcome', 'name'),
+        ],
+        'interception': [
+            ('interception_outcome', 'outcome', 'name'),
+        ],
+        'ball_receipt': [
+            ('ball_receipt_outcome', 'outcome', 'name'),
+        ],
+        'clearance': [
+            ('clearance_aerial_won', 'aerial_won', 'bool'),
+        ],
+    }
+    
+    @staticmethod
+    def type_key(type_name: str) -> str:
+        """Clé du sous-objet JSON d'un type (même règle que statsbombpy)"""
+        if type_name == 'Goal Keeper':
+            return 'goalkeeper'
+        return type_name.lower().replace(' ', '_').replace('*', '')
+    
+    @staticmethod
+    def parse(raw_events: list, match_id: Optional[int] = None) -> EventColumns:
+        """
+        Parse les événements d'un match
+        
+        Args:
+            raw_events: Liste d'événements (JSON StatsBomb décodé)
+            match_id: ID du match
+        
+        Returns:
+            EventColumns
+        """
+        n = len(raw_events)
+        kinds, arrays, objects, lookups = {}, {}, {}, {}
+        
+        all_fields = FastEventParser.COMMON_FIELDS + [
+            field for fields in FastEventParser.TYPE_FIELDS.values() for field in fields
+        ]
+        for column, _, kind in all_fields:
+            kinds[column] = kind
+            if kind == 'name':
+                arrays[column] = np.full(n, -1, dtype=np.int32)
+                lookups[column] = {}
+            elif kind in ('int', 'id'):
+                arrays[column] = np.full(n, -1, dtype=np.int64)
+            elif kind == 'float':
+                arrays[column] = np.full(n, np.nan)
+            elif kind == 'bool':
+                arrays[column] = np.zeros(n, dtype=bool)
+            else:
+                objects[column] = np.full(n, None, dtype=object)
+                if kind == 'point':
+                    arrays[f'{column}_x'] = np.full(n, np.nan)
+                    arrays[f'{column}_y'] = np.full(n, np.nan)
+        
+        type_fields = {}  # Nom du type -> (clé JSON, champs) résolu une fois par type
+        
+        for i, event in enumerate(raw_events):
+            type_name = event['type']['name']
+            if type_name not in type_fields:
+                key = FastEventParser.type_key(type_name)
+                type_fields[type_name] = (key, FastEventParser.TYPE_FIELDS.get(key, []))
+            key, fields = type_fields[type_name]
+            
+            for source, source_fields in ((event, FastEventParser.COMMON_FIELDS),
+                                          (event.get(key), fields)):
+                if not source:
+                    continue
+                
+                for column, json_key, kind in source_fields:
+                    value = source.get(json_key)
+                    if value is None:
+                        continue
+                    
+                    if kind == 'name':
+                        label = value['name']
+                        table = lookups[column]
+                        code = table.get(label)
+                        if code is None:
+                            code = table[label] = len(table)
+                        arrays[column][i] = code
+                    elif kind == 'id':
+                        arrays[column][i] = value['id']
+                    elif kind == 'point':
+                        objects[column][i] = value
+                        if len(value) >= 2:
+                            arrays[f'{column}_x'][i] = value[0]
+                            arrays[f'{column}_y'][i] = value[1]
+                    elif kind == 'object':
+                        objects[column][i] = value
+                    else:
+                        arrays[column][i] = value
+        
+        categories = {column: list(table) for column, table in lookups.items()}
+        return EventColumns(match_id, kinds, arrays, categories, objects)
+    
+    @staticmethod
+    def parse_bytes(content: bytes, match_id: Optional[int] = None) -> EventColumns:
+        """Décode et parse le contenu d'un fichier events/<match_id>.json"""
+        return FastEventParser.parse(json.loads(content), match_id)
+    
+    @staticmethod
+    def events_frame(raw_events: list, match_id: Optional[int] = None) -> pd.DataFrame:
+        """Raccourci : JSON brut -> DataFrame au format sb.events"""
+        return FastEventParser.parse(raw_events, match_id).to_frame()
+
+
+def statsbombpy_frame(raw_events: list, match_id: int) -> pd.DataFrame:
+    """
+    Chemin de référence : aplatissement statsbombpy (identique à sb.events)
+    Attention : modifie les dictionnaires des événements sur place
+    """
+    grouped = filter_and_group_events(entities.events(raw_events, match_id), {}, 'dataframe', True)
+    frames = [pd.DataFrame(evs) for evs in grouped.values()]
+    
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, axis=0, ignore_index=True, sort=True)
+
+
+def benchmark_parsers(content: bytes, match_id: int, repeat: int = 3) -> Dict:
+    """
+    Compare le parser rapide au chemin sb.events sur un fichier d'événements
+    (décodage JSON inclus dans les deux mesures, meilleur temps sur `repeat` essais)
+    
+    Returns:
+        Dict avec durées (s), accélération et nombre de lignes
+    """
+    timings = {'statsbombpy': [], 'fast': []}
+    
+    for _ in range(repeat):
+        start = time.perf_counter()
+        reference = statsbombpy_frame(json.loads(content), match_id)
+        timings['statsbombpy'].append(time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        fast = FastEventParser.parse_bytes(content, match_id).to_frame()
+        timings['fast'].append(time.perf_counter() - start)
+    
+    statsbombpy_s = min(timings['statsbombpy'])
+    fast_s = min(timings['fast'])
+    
+    return {
+        'match_id': match_id,
+        'rows': len(fast),
+        'rows_statsbombpy': len(reference),
+        'statsbombpy_s': statsbombpy_s,
+        'fast_s': fast_s,
+        'speedup': statsbombpy_s / fast_s if fast_s > 0 else float('inf'),
+    }
+
+
+if __name__ == "__main__":
+    print("✅ Module fast_event_parser.py chargé avec succès!")
+    print("Classes disponibles: FastEventParser, EventColumns")
+    
+    # python fast_event_parser.py data/events/<match_id>.json ...
+    for path in sys.argv[1:]:
+        with open(path, 'rb') as f:
+            content = f.read()
+        
+        match_id = int(path.rsplit('/', 1)[-1].split('.')[0])
+        result = benchmark_parsers(content, match_id)
+        print(f"📊 Match {match_id}: {result['rows']} événements | "
+              f"statsbombpy {result['statsbombpy_s'] * 1000:.1f} ms | "
+              f"rapide {result['fast_s'] * 1000:.1f} ms | x{result['speedup']:.1f}")
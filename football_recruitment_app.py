@@ -6,25 +6,81 @@ Version ULTRA : Exploite 100+ métriques depuis StatsBomb
 
 import pandas as pd
 import numpy as np
-from statsbombpy import sb
 from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
 from sklearn.cluster import KMeans
 from sklearn.metrics.pairwise import cosine_similarity
 import matplotlib.pyplot as plt
 import seaborn as sns
-from typing import List, Dict, Tuple
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Optional, Tuple
+from event_sources import EventSource, get_event_source
+from form_metrics import PlayerFormStore
+from event_store import PlayerEventIndex
+from spatial_grid import SpatialGrid, SpatialSimilarityIndex, DEFAULT_RESOLUTION
+from expected_threat import ExpectedThreatModel, DEFAULT_XT_PATH, default_model
+from expected_goals import fill_missing_xg
+from profiling import PROFILER, profiled
 import warnings
 warnings.filterwarnings('ignore')
 
 # Import du système ULTRA
 try:
-    from ultra_advanced_metrics import UltraAdvancedMetricsExtractor
+    from ultra_advanced_metrics import UltraAdvancedMetricsExtractor, METRIC_REGISTRY
     ULTRA_AVAILABLE = True
 except ImportError:
     ULTRA_AVAILABLE = False
     print("⚠️ ultra_advanced_metrics.py non trouvé - Mode ULTRA désactivé")
 
+
+def _fetch_and_extract(match_id: int, ultra: bool, source: EventSource,
+                       profile: bool = False,
+                       metrics: Optional[List[str]] = None,
+                       three_sixty: bool = False,
+                       use_default_models: bool = True) -> Tuple[pd.DataFrame, float, float, Optional[Dict]]:
+    """
+    Charge les événements d'un match et calcule les stats par joueur
+    Fonction de module pour pouvoir s'exécuter dans un process worker
+    
+    Args:
+        profile: Profilage dans un process worker (mesures renvoyées au process principal)
+        metrics: Mode ULTRA, métriques à calculer (None : toutes, voir METRIC_REGISTRY)
+        three_sixty: Mode ULTRA, lit les freeze frames 360 (famille three_sixty demandée et
+            match_status_360 'available' pour ce match)
+        use_default_models: Grille xT / modèle xG persistés (voir FootballRecruitmentAnalyzer)
+    
+    Returns:
+        (stats du match, temps de chargement, temps d'extraction, mesures du worker ou None)
+    """
+    if profile:
+        PROFILER.enabled = True
+        PROFILER.reset()
+    
+    start = time.perf_counter()
+    events = source.events(match_id)
+    fetched = time.perf_counter()
+    
+    if ultra:
+        freeze_frames = source.freeze_frames(match_id) if three_sixty else None
+        fetched = time.perf_counter()
+        match_stats = UltraAdvancedMetricsExtractor.extract_all_metrics(
+            events, match_id, metrics, freeze_frames, use_default_models=use_default_models
+        )
+    else:
+        match_stats = FootballRecruitmentAnalyzer(source, use_default_models=use_default_models) \
+            ._calculate_match_stats(events, match_id)
+    extracted = time.perf_counter()
+    
+    PROFILER.add_time('fetch', fetched - start)
+    PROFILER.add_time('extract', extracted - fetched)
+    PROFILER.count('matches')
+    PROFILER.count('events', len(events))
+    PROFILER.count('player_match_rows', len(match_stats))
+    
+    return match_stats, fetched - start, extracted - fetched, PROFILER.snapshot() if profile else None
+
 class FootballRecruitmentAnalyzer:
     """
     Classe principale pour l'analyse de recrutement
@@ -32,88 +88,103 @@ class FootballRecruitmentAnalyzer:
     Mode ULTRA : 100+ features
     """
     
-    def __init__(self):
+    # Colonnes d'identification d'une saison (pool multi-saisons) : jamais sommées
+    TAG_COLUMNS = ['competition', 'season', 'competition_id', 'season_id']
+    
+    def __init__(self, event_source: Optional[EventSource] = None, profile: bool = False,
+                 use_default_models: bool = True):
+        """
+        Args:
+            event_source: Source des événements (miroir local ou réseau, voir event_sources.py)
+            profile: Mesure la durée de chaque étape du chargement (voir profiling.py)
+            use_default_models: Utilise la grille xT et le modèle xG persistés dans datasets/
+                (False : stats indépendantes des fichiers du dossier courant)
+        """
+        self.event_source = event_source or get_event_source()
+        self.profile = profile or PROFILER.enabled
+        self.use_default_models = use_default_models
+        self.load_profile = {}   # Rapport de profilage du dernier chargement
         self.player_stats = None
+        self.match_stats = None  # Stats par joueur et par match (avant agrégation)
+        self.career_stats = None  # Pool multi-saisons : stats par joueur toutes saisons confondues
+        self._form_store = None
+        self._form_store_source = None
+        self._spatial_grids = {}  # (competition_id, season_id, nx, ny) -> SpatialGrid
+        self._spatial_similarity = {}  # (competition_id, season_id, nx, ny) -> SpatialSimilarityIndex
+        self.load_timings = {}   # Durées par étape du dernier chargement (secondes)
         self.scaler = StandardScaler()
         self.key_metrics = []
         
-    def load_statsbomb_data(self, competition_id: int, season_id: int) -> pd.DataFrame:
+    def load_statsbomb_data(self, competition_id: int, season_id: int,
+                            max_workers: int = 1) -> pd.DataFrame:
         """
         Charge les données StatsBomb - MODE NORMAL (35 features)
         
         Args:
             competition_id: ID de la compétition (ex: 11 pour La Liga)
             season_id: ID de la saison (ex: 90 pour 2020/21)
+            max_workers: Nombre de process pour charger/extraire les matchs
             
         Returns:
             DataFrame avec les statistiques des joueurs
         """
         print(f"📥 Chargement MODE NORMAL - Competition: {competition_id}, Season: {season_id}")
+        self._start_profile()
         
-        matches = sb.matches(competition_id=competition_id, season_id=season_id)
-        all_players_stats = []
-        
-        for idx, match in matches.iterrows():
-            match_id = match['match_id']
-            
-            try:
-                events = sb.events(match_id=match_id)
-                match_stats = self._calculate_match_stats(events, match_id)
-                all_players_stats.append(match_stats)
-                
-            except Exception as e:
-                print(f"⚠️  Erreur pour match {match_id}: {e}")
-                continue
+        all_players_stats = self._load_match_stats(competition_id, season_id, False, max_workers)
         
         if all_players_stats:
-            self.player_stats = pd.concat(all_players_stats, ignore_index=True)
-            self.player_stats = self._aggregate_season_stats(self.player_stats)
+            with PROFILER.section('concat'):
+                self.match_stats = pd.concat(all_players_stats, ignore_index=True)
+            self.player_stats = self._timed_aggregate(self.match_stats)
+            self._finish_profile()
             print(f"✅ Données chargées: {len(self.player_stats)} joueurs")
             print(f"📊 Features: {len(self.player_stats.columns)} colonnes")
             return self.player_stats
         else:
+            self._finish_profile()
             print("❌ Aucune donnée chargée")
             return pd.DataFrame()
     
-    def load_statsbomb_data_ultra(self, competition_id: int, season_id: int) -> pd.DataFrame:
+    def load_statsbomb_data_ultra(self, competition_id: int, season_id: int,
+                                  max_workers: int = 1,
+                                  metrics: Optional[List[str]] = None) -> pd.DataFrame:
         """
         🆕 ULTRA MODE : Charge avec TOUTES les métriques (100+ features)
         
         Args:
             competition_id: ID de la compétition
             season_id: ID de la saison
+            max_workers: Nombre de process pour charger/extraire les matchs
+            metrics: Chargement ciblé : familles ('defensive', 'passing'...), métriques par match
+                ou features agrégées ('tackles_per_90', 'pass_completion_rate'...).
+                Seules les familles nécessaires sont calculées. None : toutes
             
         Returns:
             DataFrame avec 100+ statistiques par joueur
         """
         if not ULTRA_AVAILABLE:
             print("❌ Mode ULTRA non disponible - ultra_advanced_metrics.py manquant")
-            return self.load_statsbomb_data(competition_id, season_id)
+            return self.load_statsbomb_data(competition_id, season_id, max_workers)
         
         print(f"🚀 Chargement MODE ULTRA - Competition: {competition_id}, Season: {season_id}")
-        print("⏳ Extraction de 100+ métriques... (cela peut prendre 30-60 secondes)")
-        
-        matches = sb.matches(competition_id=competition_id, season_id=season_id)
-        all_players_stats = []
+        if metrics is None:
+            print("⏳ Extraction de 100+ métriques... (cela peut prendre 30-60 secondes)")
+        else:
+            for name in METRIC_REGISTRY.unknown(metrics):
+                print(f"⚠️ Métrique inconnue ignorée: {name}")
+            families, _ = METRIC_REGISTRY.resolve(metrics)
+            print(f"🎯 Chargement ciblé : {', '.join(family.name for family in families) or 'aucune famille'}")
         
-        for idx, match in matches.iterrows():
-            match_id = match['match_id']
-            
-            try:
-                events = sb.events(match_id=match_id)
-                
-                # Extraction ULTRA avec toutes les métriques
-                extractor = UltraAdvancedMetricsExtractor()
-                match_stats = extractor.extract_all_metrics(events, match_id)
-                all_players_stats.append(match_stats)
-                
-            except Exception as e:
-                print(f"⚠️  Erreur pour match {match_id}: {e}")
-                continue
+        # Extraction ULTRA (toutes les métriques ou sélection)
+        self._start_profile()
+        all_players_stats = self._load_match_stats(competition_id, season_id, True, max_workers, metrics)
         
         if all_players_stats:
-            self.player_stats = pd.concat(all_players_stats, ignore_index=True)
-            self.player_stats = self._aggregate_season_stats(self.player_stats)
+            with PROFILER.section('concat'):
+                self.match_stats = pd.concat(all_players_stats, ignore_index=True)
+            self.player_stats = self._timed_aggregate(self.match_stats)
+            self._finish_profile()
             
             print(f"✅ Données ULTRA chargées: {len(self.player_stats)} joueurs")
             print(f"📊 Features: {len(self.player_stats.columns)} colonnes")
@@ -121,72 +192,295 @@ class FootballRecruitmentAnalyzer:
             
             return self.player_stats
         else:
+            self._finish_profile()
             print("❌ Aucune donnée chargée")
             return pd.DataFrame()
     
+    def _start_profile(self):
+        """Active (ou non) le profileur pour le chargement qui commence"""
+        PROFILER.enabled = self.profile
+        PROFILER.reset()
+        self.load_profile = {}
+    
+    def _finish_profile(self):
+        if PROFILER.enabled:
+            self.load_profile = PROFILER.report()
+    
+    def _load_match_stats(self, competition_id: int, season_id: int,
+                          ultra: bool, max_workers: int = 1,
+                          metrics: Optional[List[str]] = None) -> List[pd.DataFrame]:
+        """
+        Charge et extrait les stats de tous les matchs d'une saison
+        Séquentiel par défaut, process parallèles si max_workers > 1
+        """
+        self.load_timings = {'matches': 0.0, 'prefetch': 0.0, 'fetch': 0.0, 'extract': 0.0, 'aggregate': 0.0}
+        
+        start = time.perf_counter()
+        matches = self.event_source.matches(competition_id, season_id)
+        match_ids = matches['match_id'].tolist()
+        match_dates = dict(zip(matches['match_id'], matches['match_date'])) if 'match_date' in matches.columns else {}
+        
+        # Freeze frames 360 : famille three_sixty demandée, et seulement pour les matchs qui en ont
+        three_sixty = ultra and any(family.name == 'three_sixty'
+                                    for family in METRIC_REGISTRY.resolve(metrics)[0])
+        matches_360 = set(matches.loc[matches['match_status_360'] == 'available', 'match_id']) \
+            if three_sixty and 'match_status_360' in matches.columns else set()
+        self.load_timings['matches'] = time.perf_counter() - start
+        PROFILER.add_time('matches', self.load_timings['matches'])
+        
+        # Téléchargement parallèle de la saison (sources avec cache disque)
+        start = time.perf_counter()
+        self.event_source.prefetch_season(competition_id, season_id, three_sixty=bool(matches_360))
+        self.load_timings['prefetch'] = time.perf_counter() - start
+        PROFILER.add_time('prefetch', self.load_timings['prefetch'])
+        
+        all_players_stats = []
+        
+        def _collect(match_id, run):
+            try:
+                match_stats, fetch_time, extract_time, worker_profile = run()
+                PROFILER.merge(worker_profile)
+                match_stats['match_date'] = match_dates.get(match_id)  # Clé des séries de forme
+                all_players_stats.append(match_stats)
+                self.load_timings['fetch'] += fetch_time
+                self.load_timings['extract'] += extract_time
+            except Exception as e:
+                PROFILER.count('errors')
+                print(f"⚠️  Erreur pour match {match_id}: {e}")
+        
+        if max_workers <= 1:
+            for match_id in match_ids:
+                _collect(match_id, lambda: _fetch_and_extract(match_id, ultra, self.event_source,
+                                                              metrics=metrics,
+                                                              three_sixty=match_id in matches_360,
+                                                              use_default_models=self.use_default_models))
+        else:
+            # 'spawn' : pas de fork d'un process multi-thread (ex: serveur Streamlit)
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+                futures = {executor.submit(_fetch_and_extract, match_id, ultra, self.event_source,
+                                           PROFILER.enabled, metrics, match_id in matches_360,
+                                           self.use_default_models): match_id
+                           for match_id in match_ids}
+                for future in as_completed(futures):
+                    _collect(futures[future], future.result)
+        
+        return all_players_stats
+    
+    def load_season_events(self, competition_id: int, season_id: int) -> pd.DataFrame:
+        """
+        Événements de toute une saison en un seul DataFrame
+        (entrée de add_advanced_metrics_to_dataframe, voir advanced_metrics.py)
+        """
+        self.event_source.prefetch_season(competition_id, season_id)
+        
+        # Store colonnaire : la saison est lue d'un bloc (voir season_store.py)
+        season_events = self.event_source.season_events(competition_id, season_id)
+        if season_events is not None:
+            return season_events
+        
+        frames = []
+        for match_id in self.event_source.matches(competition_id, season_id)['match_id']:
+            try:
+                frames.append(self.event_source.events(match_id))
+            except Exception as e:
+                print(f"⚠️  Erreur pour match {match_id}: {e}")
+        
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    
+    def _timed_aggregate(self, match_stats: pd.DataFrame) -> pd.DataFrame:
+        """Agrège la saison en mesurant la durée de l'étape"""
+        start = time.perf_counter()
+        player_stats = self._aggregate_season_stats(match_stats)
+        self.load_timings['aggregate'] = time.perf_counter() - start
+        return player_stats
+    
+    def get_form_store(self) -> Optional[PlayerFormStore]:
+        """
+        Séries par joueur et par match (forme du moment, voir form_metrics.py)
+        None si aucune stat par match n'est chargée
+        """
+        if self.match_stats is None or self.match_stats.empty:
+            return None
+        
+        if self._form_store is None or self._form_store_source is not self.match_stats:
+            try:
+                self._form_store = PlayerFormStore(self.match_stats)
+                self._form_store_source = self.match_stats
+            except ValueError as e:
+                print(f"⚠️ Séries de forme indisponibles: {e}")
+                return None
+        return self._form_store
+    
+    def get_spatial_grid(self, competition_id: int, season_id: int,
+                         resolution: Tuple[int, int] = DEFAULT_RESOLUTION) -> Optional[SpatialGrid]:
+        """
+        Grilles d'activité de tous les joueurs d'une saison (heatmaps, voir spatial_grid.py)
+        Calculées une fois par saison ; une résolution plus grossière qui divise une grille
+        déjà calculée en est déduite sans relire les événements
+        """
+        nx, ny = resolution
+        key = (competition_id, season_id, nx, ny)
+        if key in self._spatial_grids:
+            return self._spatial_grids[key]
+        
+        for (cid, sid, cached_nx, cached_ny), grid in self._spatial_grids.items():
+            if (cid, sid) == (competition_id, season_id) and cached_nx % nx == 0 and cached_ny % ny == 0:
+                self._spatial_grids[key] = grid.coarsen(cached_nx // nx, cached_ny // ny)
+                return self._spatial_grids[key]
+        
+        events = self.load_season_events(competition_id, season_id)
+        if events.empty or 'player' not in events.columns:
+            return None
+        
+        with PROFILER.section('spatial_grid'):
+            self._spatial_grids[key] = SpatialGrid.from_events(events, nx, ny)
+        return self._spatial_grids[key]
+    
+    def get_spatial_similarity(self, competition_id: int, season_id: int,
+                               resolution: Tuple[int, int] = DEFAULT_RESOLUTION) -> Optional[SpatialSimilarityIndex]:
+        """
+        Matrice de similarité spatiale de la saison (positions, départs et arrivées de passes)
+        Calculée une fois par saison et par résolution (entrée de find_similar_players)
+        """
+        nx, ny = resolution
+        key = (competition_id, season_id, nx, ny)
+        if key not in self._spatial_similarity:
+            events = self.load_season_events(competition_id, season_id)
+            if events.empty or 'player' not in events.columns:
+                return None
+            
+            with PROFILER.section('spatial_similarity'):
+                index = SpatialSimilarityIndex.from_events(events, resolution)
+            self._spatial_similarity[key] = index
+            self._spatial_grids.setdefault(key, index.grids['touches'])
+        return self._spatial_similarity[key]
+    
+    def add_expected_threat(self, competition_id: int, season_id: int,
+                            model: Optional[ExpectedThreatModel] = None,
+                            path: str = DEFAULT_XT_PATH) -> Optional[pd.DataFrame]:
+        """
+        Ajoute l'xT ajouté par les passes et conduites à player_stats (voir expected_threat.py) :
+        xt_added, xt_added_passes, xt_added_carries, xt_positive_actions et leurs _per_90
+        
+        Args:
+            model: Grille xT (défaut: modèle persisté dans path, sinon ajusté sur la saison et écrit)
+        """
+        if self.player_stats is None or self.player_stats.empty:
+            return self.player_stats
+        
+        events = self.load_season_events(competition_id, season_id)
+        if events.empty or 'player' not in events.columns:
+            return self.player_stats
+        
+        model = model or default_model(path)
+        if model is None:
+            with PROFILER.section('xt_fit'):
+                model = ExpectedThreatModel.fit(events, seasons=[(competition_id, season_id)])
+            model.save(path)
+        
+        with PROFILER.section('xt_apply'):
+            totals = model.player_totals(events, ['player', 'team'])
+        
+        columns = [col for col in totals.columns if col not in ('player', 'team')]
+        stats = self.player_stats.drop(columns=[col for col in self.player_stats.columns
+                                                if col in columns or col in [f'{c}_per_90' for c in columns]])
+        stats = stats.merge(totals, on=['player', 'team'], how='left')
+        stats[columns] = stats[columns].fillna(0.0)
+        matches = stats['matches_played'].replace(0, 1) if 'matches_played' in stats.columns else 1
+        for col in columns:
+            stats[f'{col}_per_90'] = stats[col] / matches
+        
+        self.player_stats = stats
+        return self.player_stats
+    
     def _calculate_match_stats(self, events: pd.DataFrame, match_id: int) -> pd.DataFrame:
         """Calcule les statistiques par joueur pour un match (MODE NORMAL)"""
         stats_list = []
         
-        for player in events['player'].dropna().unique():
-            player_events = events[events['player'] == player]
+        # xG local des tirs sans shot_statsbomb_xg (modèle persisté, voir expected_goals.py)
+        events = fill_missing_xg(events, use_default_model=self.use_default_models)
+        
+        # Tri unique par (joueur, type) : chaque vue ci-dessous est une tranche
+        index = PlayerEventIndex(events)
+        teams = index.first_values('team')
+        
+        for player in index.players:
+            player_events = index.player_events(player)
+            passes = index.type_events(player, 'Pass')
+            shots = index.type_events(player, 'Shot')
+            dribbles = index.type_events(player, 'Dribble')
             
             stats = {
                 'match_id': match_id,
                 'player': player,
-                'team': player_events['team'].iloc[0] if len(player_events) > 0 else None,
+                'team': teams[player],
                 
                 # Statistiques de passes
-                'passes': len(player_events[player_events['type'] == 'Pass']),
-                'passes_completed': len(player_events[(player_events['type'] == 'Pass') & 
-                                                       (player_events['pass_outcome'].isna())]),
-                'key_passes': len(player_events[player_events.get('pass_shot_assist', pd.Series([False])) == True]) if 'pass_shot_assist' in player_events.columns else 0,
-                'assists': len(player_events[player_events.get('pass_goal_assist', pd.Series([False])) == True]) if 'pass_goal_assist' in player_events.columns else 0,
+                'passes': len(passes),
+                'passes_completed': int(passes['pass_outcome'].isna().sum()),
+                'key_passes': int((player_events['pass_shot_assist'] == True).sum()) if 'pass_shot_assist' in player_events.columns else 0,
+                'assists': int((player_events['pass_goal_assist'] == True).sum()) if 'pass_goal_assist' in player_events.columns else 0,
                 
                 # Statistiques de tirs
-                'shots': len(player_events[player_events['type'] == 'Shot']),
-                'shots_on_target': len(player_events[(player_events['type'] == 'Shot') & 
-                                                      (player_events['shot_outcome'].isin(['Goal', 'Saved']))]),
-                'goals': len(player_events[(player_events['type'] == 'Shot') & 
-                                           (player_events['shot_outcome'] == 'Goal')]),
-                'xG': player_events[player_events['type'] == 'Shot']['shot_statsbomb_xg'].sum(),
+                'shots': len(shots),
+                'shots_on_target': int(shots['shot_outcome'].isin(['Goal', 'Saved']).sum()),
+                'goals': int((shots['shot_outcome'] == 'Goal').sum()),
+                'xG': shots['shot_statsbomb_xg'].sum(),
                 
                 # Statistiques défensives
-                'tackles': len(player_events[player_events['type'] == 'Duel']),
-                'interceptions': len(player_events[player_events['type'] == 'Interception']),
-                'clearances': len(player_events[player_events['type'] == 'Clearance']),
-                'blocks': len(player_events[player_events['type'] == 'Block']),
+                'tackles': index.type_count(player, 'Duel'),
+                'interceptions': index.type_count(player, 'Interception'),
+                'clearances': index.type_count(player, 'Clearance'),
+                'blocks': index.type_count(player, 'Block'),
                 
                 # Statistiques de dribbles
-                'dribbles': len(player_events[player_events['type'] == 'Dribble']),
-                'dribbles_completed': len(player_events[(player_events['type'] == 'Dribble') & 
-                                                         (player_events['dribble_outcome'] == 'Complete')]),
+                'dribbles': len(dribbles),
+                'dribbles_completed': int((dribbles['dribble_outcome'] == 'Complete').sum()),
                 
                 # Autres
-                'fouls_committed': len(player_events[player_events['type'] == 'Foul Committed']),
-                'fouls_won': len(player_events[player_events['type'] == 'Foul Won']),
+                'fouls_committed': index.type_count(player, 'Foul Committed'),
+                'fouls_won': index.type_count(player, 'Foul Won'),
             }
             
             stats_list.append(stats)
         
         return pd.DataFrame(stats_list)
     
-    def _aggregate_season_stats(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Agrège les statistiques sur la saison"""
+    @profiled('aggregate')
+    def _aggregate_season_stats(self, df: pd.DataFrame,
+                                group_keys: Optional[List[str]] = None,
+                                min_matches: int = 5) -> pd.DataFrame:
+        """
+        Agrège les statistiques sur la saison
+        
+        Args:
+            df: Stats par joueur et par match
+            group_keys: Clés de regroupement (défaut: joueur + équipe ; pool multi-saisons :
+                + competition/season, ou joueur seul pour toutes les saisons)
+            min_matches: Nombre minimum de matchs pour conserver un joueur
+        """
+        group_keys = group_keys or ['player', 'team']
+        
         # Grouper par joueur
         agg_dict = {'match_id': 'count'}
         
         # Dynamiquement agréger toutes les colonnes numériques
+        excluded = set(group_keys) | set(self.TAG_COLUMNS) | {'player', 'team', 'match_id'}
         for col in df.columns:
-            if col not in ['player', 'team', 'match_id'] and pd.api.types.is_numeric_dtype(df[col]):
+            if col not in excluded and pd.api.types.is_numeric_dtype(df[col]):
                 agg_dict[col] = 'sum'
         
-        agg_stats = df.groupby(['player', 'team']).agg(agg_dict).reset_index()
+        # Équipe hors clés (toutes saisons) : dernière équipe connue
+        if 'team' in df.columns and 'team' not in group_keys:
+            agg_dict['team'] = 'last'
+        
+        agg_stats = df.groupby(group_keys, observed=True).agg(agg_dict).reset_index()
         agg_stats.rename(columns={'match_id': 'matches_played'}, inplace=True)
         
         # Calculer les moyennes par match
         for col in agg_stats.columns:
-            if col not in ['player', 'team', 'matches_played']:
+            if col not in excluded | {'matches_played'}:
                 if pd.api.types.is_numeric_dtype(agg_stats[col]):
                     agg_stats[f'{col}_per_90'] = agg_stats[col] / agg_stats['matches_played'].replace(0, 1)
         
@@ -208,7 +502,7 @@ class FootballRecruitmentAnalyzer:
                                              agg_stats['shots'].replace(0, 1)) * 100
         
         # Filtrer les joueurs avec peu de matchs
-        agg_stats = agg_stats[agg_stats['matches_played'] >= 5]
+        agg_stats = agg_stats[agg_stats['matches_played'] >= min_matches]
         
         return agg_stats
     
@@ -248,8 +542,17 @@ class FootballRecruitmentAnalyzer:
     def find_similar_players(self, 
                             target_player: str, 
                             top_n: int = 10,
-                            position: str = 'all') -> pd.DataFrame:
-        """Trouve les joueurs similaires à un joueur cible"""
+                            position: str = 'all',
+                            spatial_weight: float = 0.0,
+                            spatial_index: Optional[SpatialSimilarityIndex] = None) -> pd.DataFrame:
+        """
+        Trouve les joueurs similaires à un joueur cible
+        
+        Args:
+            spatial_weight: Part de la similarité spatiale dans le score (0 : statistiques
+                seules, 1 : zones d'activité seules)
+            spatial_index: Similarité spatiale de la saison (voir get_spatial_similarity)
+        """
         if self.player_stats is None:
             raise ValueError("Chargez d'abord les données")
         
@@ -270,12 +573,25 @@ class FootballRecruitmentAnalyzer:
         similarities = cosine_similarity(target_vector, X_scaled)[0]
         
         results = df.copy()
+        score_columns = ['similarity_score']
+        if spatial_weight > 0:
+            if spatial_index is None:
+                raise ValueError("Similarité spatiale : index requis (voir get_spatial_similarity)")
+            spatial = spatial_index.scores(target_player, results['player'].tolist())
+            results['stat_similarity'] = similarities
+            results['spatial_similarity'] = spatial
+            similarities = (1 - spatial_weight) * similarities + spatial_weight * spatial
+            score_columns += ['stat_similarity', 'spatial_similarity']
+        
         results['similarity_score'] = similarities
         results = results.sort_values('similarity_score', ascending=False)
         
         results = results[results['player'] != target_player].head(top_n)
         
-        return results[['player', 'team', 'matches_played', 'similarity_score'] + features]
+        # Pool multi-saisons : compétition et saison de chaque ligne
+        tags = [c for c in ['competition', 'season'] if c in results.columns]
+        
+        return results[['player', 'team'] + tags + ['matches_played'] + score_columns + features]
     
     def cluster_players(self, 
                        n_clusters: int = 5, 
@@ -0,0 +1,196 @@
+# form_metrics.py
+"""
+Forme du moment : séries temporelles par joueur à partir des stats par match
+Fenêtres glissantes (N derniers matchs) et moyennes exponentielles (EWM),
+calculées pour tous les joueurs en une passe vectorisée
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import warnings
+warnings.filterwarnings('ignore')
+
+
+class PlayerFormStore:
+    """Stats par joueur et par match, triées par date, et indicateurs de forme"""
+    
+    # Colonnes d'identification (jamais traitées comme des métriques)
+    ID_COLUMNS = ['player', 'team', 'match_id', 'match_date',
+                  'competition', 'season', 'competition_id', 'season_id']
+    
+    DEFAULT_WINDOWS = (5, 10)
+    DEFAULT_SPAN = 5
+    
+    def __init__(self, match_stats: pd.DataFrame, matches: Optional[pd.DataFrame] = None):
+        """
+        Args:
+            match_stats: Stats par joueur et par match (analyzer.match_stats)
+            matches: Matchs de la saison (source.matches), pour dater des stats
+                qui n'ont pas de colonne match_date
+        """
+        series = match_stats.copy()
+        
+        if 'match_date' not in series.columns:
+            if matches is None or 'match_date' not in matches.columns:
+                raise ValueError("match_date absent : fournir le DataFrame des matchs")
+            series['match_date'] = series['match_id'].map(dict(zip(matches['match_id'], matches['match_date'])))
+        
+        series['match_date'] = pd.to_datetime(series['match_date'], errors='coerce')
+        series = series.dropna(subset=['player', 'match_date'])
+        series['player'] = series['player'].astype(str)
+        
+        # Ordre chronologique par joueur (match_id départage deux matchs le même jour)
+        self.series = series.sort_values(['player', 'match_date', 'match_id'], kind='mergesort').reset_index(drop=True)
+        
+        self.metrics = [col for col in self.series.columns
+                        if col not in self.ID_COLUMNS and pd.api.types.is_numeric_dtype(self.series[col])]
+        
+        self._codes = self.series.groupby('player', sort=False).ngroup().to_numpy()
+        self._position = self.series.groupby('player', sort=False).cumcount().to_numpy()
+    
+    def _metric_list(self, metrics: Optional[List[str]]) -> List[str]:
+        if metrics is None:
+            return self.metrics
+        return [m for m in metrics if m in self.metrics]
+    
+    def rolling(self, window: int = 5, metrics: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Moyenne par match sur les `window` derniers matchs de chaque joueur (à chaque date)
+        Sommes cumulées par joueur : une seule passe pour tous les joueurs
+        
+        Returns:
+            DataFrame aligné sur self.series, colonnes '<métrique>_last<window>'
+        """
+        metrics = self._metric_list(metrics)
+        values = self.series[metrics].to_numpy(dtype=float)
+        values = np.nan_to_num(values)
+        
+        cumulative = pd.DataFrame(values).groupby(self._codes).cumsum()
+        previous = cumulative.groupby(self._codes).shift(window).fillna(0.0)
+        count = np.minimum(self._position + 1, window)[:, None]
+        
+        averages = (cumulative.to_numpy() - previous.to_numpy()) / count
+        return pd.DataFrame(averages, columns=[f'{m}_last{window}' for m in metrics])
+    
+    def ewm(self, span: int = 5, metrics: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Moyenne exponentielle par joueur (les derniers matchs pèsent le plus)
+        
+        Returns:
+            DataFrame aligné sur self.series, colonnes '<métrique>_ewm'
+        """
+        metrics = self._metric_list(metrics)
+        values = self.series[metrics].astype(float).fillna(0.0)
+        
+        smoothed = values.groupby(self._codes).ewm(span=span).mean()
+        smoothed = smoothed.reset_index(level=0, drop=True).sort_index()
+        smoothed.columns = [f'{m}_ewm' for m in metrics]
+        return smoothed.reset_index(drop=True)
+    
+    def form_table(self,
+                   windows=DEFAULT_WINDOWS,
+                   span: int = DEFAULT_SPAN,
+                   metrics: Optional[List[str]] = None,
+                   min_matches: int = 3) -> pd.DataFrame:
+        """
+        Forme actuelle : une ligne par joueur (état après son dernier match)
+        
+        Args:
+            windows: Tailles des fenêtres glissantes (en matchs)
+            span: Portée de la moyenne exponentielle
+            metrics: Métriques à calculer (toutes si None)
+            min_matches: Nombre minimum de matchs joués
+        
+        Returns:
+            DataFrame : player, team, last_match_date, matches_played,
+            '<m>_last<N>', '<m>_ewm', '<m>_season' (moyenne par match sur toute la période)
+            et '<m>_form_delta' (EWM - moyenne de la période)
+        """
+        metrics = self._metric_list(metrics)
+        if self.series.empty or not metrics:
+            return pd.DataFrame()
+        
+        parts = [self.series[['player']]]
+        parts += [self.rolling(window, metrics) for window in windows]
+        parts.append(self.ewm(span, metrics))
+        
+        # Dernière ligne de chaque joueur = forme actuelle
+        last_rows = np.flatnonzero(np.r_[self._codes[1:] != self._codes[:-1], True])
+        form = pd.concat(parts, axis=1).iloc[last_rows].reset_index(drop=True)
+        
+        grouped = self.series.groupby('player', sort=True)
+        form['team'] = grouped['team'].last().reindex(form['player']).to_numpy() if 'team' in self.series.columns else None
+        form['last_match_date'] = grouped['match_date'].max().reindex(form['player']).to_numpy()
+        form['matches_played'] = self._position[last_rows] + 1
+        
+        season_means = grouped[metrics].mean().reindex(form['player'])
+        for m in metrics:
+            form[f'{m}_season'] = season_means[m].to_numpy()
+            form[f'{m}_form_delta'] = form[f'{m}_ewm'] - form[f'{m}_season']
+        
+        form = form[form['matches_played'] >= min_matches]
+        
+        leading = ['player', 'team', 'last_match_date', 'matches_played']
+        return form[leading + [c for c in form.columns if c not in leading]].reset_index(drop=True)
+    
+    def rank_by_form(self, metric: str = 'goals', window: Optional[int] = 5,
+                     top_n: int = 10, min_matches: int = 3) -> pd.DataFrame:
+        """
+        Classement par forme actuelle
+        
+        Args:
+            metric: Métrique par match (ex: 'goals', 'xG')
+            window: Fenêtre glissante (None : moyenne exponentielle)
+            top_n: Nombre de joueurs
+            min_matches: Nombre minimum de matchs joués
+        """
+        windows = (window,) if window else ()
+        form = self.form_table(windows=windows, metrics=[metric], min_matches=min_matches)
+        if form.empty:
+            return form
+        
+        column = f'{metric}_last{window}' if window else f'{metric}_ewm'
+        return form.sort_values(column, ascending=False).head(top_n).reset_index(drop=True)
+    
+    def player_series(self, player_name: str, metrics: Optional[List[str]] = None,
+                      window: int = 5, span: int = DEFAULT_SPAN) -> pd.DataFrame:
+        """Historique d'un joueur : valeurs par match, fenêtre glissante et EWM"""
+        metrics = self._metric_list(metrics)
+        mask = (self.series['player'] == player_name).to_numpy()
+        
+        history = self.series.loc[mask, ['match_date', 'match_id'] + metrics].reset_index(drop=True)
+        rolling = self.rolling(window, metrics)[mask].reset_index(drop=True)
+        smoothed = self.ewm(span, metrics)[mask].reset_index(drop=True)
+        return pd.concat([history, rolling, smoothed], axis=1)
+    
+    def trend(self, player_name: str, metric: str = 'goals', window: int = 10) -> Optional[float]:
+        """
+        Pente (par match) de la métrique sur les `window` derniers matchs du joueur
+        (régression linéaire) ; None si moins de 3 matchs
+        """
+        if metric not in self.metrics:
+            return None
+        
+        values = self.series.loc[self.series['player'] == player_name, metric].astype(float).fillna(0.0)
+        values = values.to_numpy()[-window:]
+        if len(values) < 3:
+            return None
+        
+        return float(np.polyfit(np.arange(len(values)), values, 1)[0])
+    
+    def summary(self) -> Dict:
+        """Volumes de la série"""
+        return {
+            'rows': len(self.series),
+            'players': int(self._codes.max() + 1) if len(self._codes) else 0,
+            'metrics': len(self.metrics),
+            'first_date': self.series['match_date'].min(),
+            'last_date': self.series['match_date'].max(),
+        }
+
+
+if __name__ == "__main__":
+    print("✅ Module form_metrics.py chargé avec succès!")
+    print("Classe disponible: PlayerFormStore")
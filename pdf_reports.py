@@ -5,19 +5,242 @@ Version complète corrigée - prête à l'emploi
 """
 
 from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
 import pandas as pd
+import multiprocessing
+import os
+import re
+import tempfile
+import time
+import zipfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Callable, Tuple
 import warnings
 warnings.filterwarnings('ignore')
 
+# État des workers : données de ligue (envoyées une seule fois par process)
+# et générateur dont les templates de pages sont réutilisés d'un rapport à l'autre
+_WORKER_LEAGUE_DATA = None
+_WORKER_GENERATOR = None
+
+
+def _init_report_worker(club_name: str, league_data: Optional[pd.DataFrame] = None):
+    """Initialise un worker de génération : backend Agg (sans interface)"""
+    global _WORKER_LEAGUE_DATA, _WORKER_GENERATOR
+    import matplotlib
+    matplotlib.use('Agg')
+    _WORKER_LEAGUE_DATA = league_data
+    _WORKER_GENERATOR = ScoutingReportGenerator(club_name)
+
+
+def _generate_report_task(player_data: pd.Series,
+                          similar_players: pd.DataFrame,
+                          output_path: str) -> Tuple[str, Dict[str, List[float]]]:
+    """Génère un rapport dans un worker (profil visuel si données de ligue)"""
+    visualizations = {}
+    already_timed = {page: len(d) for page, d in _WORKER_GENERATOR.page_timings.items()}
+    
+    if _WORKER_LEAGUE_DATA is not None:
+        from advanced_visualizations import AdvancedPlayerVisualizations
+        player_name = str(player_data.get('player', 'Joueur'))
+        visualizations['profil_complet'] = AdvancedPlayerVisualizations.create_complete_player_profile(
+            player_data, _WORKER_LEAGUE_DATA, player_name
+        )
+    
+    _WORKER_GENERATOR.generate_player_report(player_data, similar_players, visualizations, output_path)
+    
+    # Temps de rendu de ce rapport uniquement
+    timings = {page: d[already_timed.get(page, 0):] for page, d in _WORKER_GENERATOR.page_timings.items()}
+    return output_path, timings
+
+
+class ReportPageTemplates:
+    """
+    Pages A4 pré-construites pour ScoutingReportGenerator
+    Titres, décorations et style des tableaux sont créés une seule fois,
+    seuls les artistes porteurs de données sont mis à jour à chaque rapport
+    """
+    
+    A4_SIZE = (8.27, 11.69)
+    MAX_LIST_ITEMS = 5
+    MAX_RECOMMENDATIONS = 6
+    MAX_SIMILAR_ROWS = 10
+    COMPARISON_COLUMNS = ['player', 'team', 'similarity_score']
+    STATS_CATEGORIES = {
+        'Offensif': ['goals_per_90', 'xG_per_90', 'shots_per_90', 'shot_accuracy'],
+        'Création': ['assists_per_90', 'key_passes_per_90', 'passes_per_90'],
+        'Dribbles': ['dribbles_per_90', 'dribble_success_rate'],
+        'Défensif': ['tackles_per_90', 'interceptions_per_90'],
+        'Physique': ['fouls_committed', 'fouls_won'],
+        'Global': ['matches_played']
+    }
+    
+    def __init__(self, club_name: str = "Football Club"):
+        self.club_name = club_name
+        self.cover = self._build_cover()
+        self.summary = self._build_summary()
+        self.stats = self._build_stats()
+        self.comparison = self._build_comparison()
+        self.recommendations = self._build_recommendations()
+    
+    def _new_page(self):
+        """Figure A4 hors pyplot (jamais fermée, réutilisée à chaque rapport)"""
+        fig = Figure(figsize=self.A4_SIZE)
+        FigureCanvasAgg(fig)
+        return fig
+    
+    def _build_cover(self) -> Dict:
+        """Page de garde"""
+        fig = self._new_page()
+        ax = fig.add_subplot(111)
+        ax.axis('off')
+        
+        ax.text(0.5, 0.7, 'RAPPORT DE SCOUTING',
+               ha='center', fontsize=28, weight='bold',
+               transform=ax.transAxes)
+        
+        return {
+            'fig': fig,
+            'player': ax.text(0.5, 0.55, '',
+                              ha='center', fontsize=36, weight='bold',
+                              color='#1f77b4', transform=ax.transAxes),
+            'info': ax.text(0.5, 0.35, '',
+                            ha='center', fontsize=14,
+                            transform=ax.transAxes,
+                            bbox=dict(boxstyle='round', facecolor='lightgray', alpha=0.5)),
+            'footer': ax.text(0.5, 0.1, '',
+                              ha='center', fontsize=12, style='italic',
+                              transform=ax.transAxes),
+        }
+    
+    def _build_summary(self) -> Dict:
+        """Résumé exécutif (positions verticales ajustées à chaque rapport)"""
+        fig = self._new_page()
+        ax = fig.add_subplot(111)
+        ax.axis('off')
+        
+        ax.text(0.5, 0.95, 'RÉSUMÉ EXÉCUTIF',
+               ha='center', fontsize=20, weight='bold',
+               transform=ax.transAxes)
+        
+        ax.text(0.1, 0.85, '✓ POINTS FORTS',
+               fontsize=16, weight='bold', color='green',
+               transform=ax.transAxes)
+        
+        return {
+            'fig': fig,
+            'strengths': [ax.text(0.15, 0, '', fontsize=12, transform=ax.transAxes)
+                          for _ in range(self.MAX_LIST_ITEMS)],
+            'weaknesses_header': ax.text(0.1, 0, '⚠ POINTS À AMÉLIORER',
+                                         fontsize=16, weight='bold', color='orange',
+                                         transform=ax.transAxes),
+            'weaknesses': [ax.text(0.15, 0, '', fontsize=12, transform=ax.transAxes)
+                           for _ in range(self.MAX_LIST_ITEMS)],
+            'verdict_header': ax.text(0.1, 0, 'VERDICT',
+                                      fontsize=16, weight='bold',
+                                      transform=ax.transAxes),
+            'verdict': ax.text(0.1, 0, '',
+                               fontsize=11, transform=ax.transAxes,
+                               wrap=True,
+                               bbox=dict(boxstyle='round', facecolor='lightyellow', alpha=0.8)),
+        }
+    
+    def _build_stats(self) -> Dict:
+        """Page de statistiques : 6 panneaux, mise en page calculée une fois"""
+        fig = self._new_page()
+        axes = fig.subplots(3, 2)
+        fig.suptitle('STATISTIQUES DÉTAILLÉES', fontsize=20, weight='bold')
+        
+        panels = []
+        for ax, (category, metrics) in zip(axes.flatten(), self.STATS_CATEGORIES.items()):
+            ax.set_title(category, fontsize=12, weight='bold')
+            ax.grid(axis='x', alpha=0.3)
+            ax.spines['top'].set_visible(False)
+            ax.spines['right'].set_visible(False)
+            
+            # Libellés de référence pour dimensionner la mise en page
+            ax.set_yticks(range(len(metrics)))
+            ax.set_yticklabels([m.replace('_', ' ').title() for m in metrics])
+            
+            panels.append({
+                'ax': ax,
+                'placeholder': ax.text(0.5, 0.5, 'Données non disponibles',
+                                       ha='center', va='center', transform=ax.transAxes,
+                                       visible=False),
+                'data_artists': [],
+            })
+        
+        fig.tight_layout()
+        return {'fig': fig, 'panels': panels}
+    
+    def _build_comparison(self) -> Dict:
+        """Page de comparaison : tableau stylé, seules les cellules changent"""
+        fig = self._new_page()
+        fig.suptitle('JOUEURS SIMILAIRES', fontsize=20, weight='bold', y=0.98)
+        
+        ax = fig.add_subplot(111)
+        ax.axis('tight')
+        ax.axis('off')
+        
+        n_cols = len(self.COMPARISON_COLUMNS)
+        table = ax.table(
+            cellText=[[''] * n_cols for _ in range(self.MAX_SIMILAR_ROWS)],
+            colLabels=self.COMPARISON_COLUMNS,
+            cellLoc='center',
+            loc='center',
+            bbox=[0, 0, 1, 0.9]
+        )
+        
+        table.auto_set_font_size(False)
+        table.set_fontsize(9)
+        table.scale(1, 2)
+        
+        for (i, j), cell in table.get_celld().items():
+            if i == 0:
+                cell.set_facecolor('#1f77b4')
+                cell.set_text_props(weight='bold', color='white')
+            else:
+                cell.set_facecolor('#f0f0f0' if i % 2 == 0 else 'white')
+        
+        cells = table.get_celld()
+        rows = [[cells[(i, j)] for j in range(n_cols)]
+                for i in range(1, self.MAX_SIMILAR_ROWS + 1)]
+        
+        return {'fig': fig, 'table': table, 'rows': rows}
+    
+    def _build_recommendations(self) -> Dict:
+        """Page de recommandations"""
+        fig = self._new_page()
+        ax = fig.add_subplot(111)
+        ax.axis('off')
+        
+        ax.text(0.5, 0.95, 'RECOMMANDATIONS',
+               ha='center', fontsize=20, weight='bold',
+               transform=ax.transAxes)
+        
+        ax.text(0.5, 0.15,
+               'Rapport généré par Football Analytics AI',
+               ha='center', fontsize=10, style='italic',
+               color='gray', transform=ax.transAxes)
+        
+        return {
+            'fig': fig,
+            'items': [ax.text(0.1, 0, '', fontsize=12, transform=ax.transAxes, wrap=True)
+                      for _ in range(self.MAX_RECOMMENDATIONS)],
+        }
+
 
 class ScoutingReportGenerator:
     """Génère des rapports PDF complets"""
     
     def __init__(self, club_name: str = "Football Club"):
         self.club_name = club_name
+        self._templates = None
+        self.page_timings = defaultdict(list)
         
     def generate_player_report(self,
                               player_data: pd.Series,
@@ -40,8 +263,10 @@ class ScoutingReportGenerator:
                 for viz_name, fig in visualizations.items():
                     if fig is not None:
                         try:
+                            start = time.perf_counter()
                             pdf.savefig(fig, bbox_inches='tight')
                             plt.close(fig)
+                            self.page_timings['visualisations'].append(time.perf_counter() - start)
                         except Exception as e:
                             print(f"⚠️ Erreur visualisation {viz_name}: {e}")
                 
@@ -65,21 +290,175 @@ class ScoutingReportGenerator:
             print(f"❌ Erreur génération PDF: {e}")
             raise e
     
+    def generate_batch_reports(self,
+                               players: pd.DataFrame,
+                               output_dir: Optional[str] = None,
+                               similar_players: Optional[Dict[str, pd.DataFrame]] = None,
+                               league_data: Optional[pd.DataFrame] = None,
+                               zip_path: Optional[str] = None,
+                               max_workers: Optional[int] = None,
+                               progress_callback: Optional[Callable[[int, int, str], None]] = None) -> Dict:
+        """
+        Génère les rapports d'une shortlist en parallèle (un process par rapport)
+        
+        Args:
+            players: DataFrame des joueurs (une ligne = un rapport)
+            output_dir: Dossier de sortie des PDF (temporaire si None et zip_path fourni)
+            similar_players: Dict {player_name: DataFrame des joueurs similaires}
+            league_data: Données de ligue pour ajouter le profil visuel complet
+            zip_path: Si fourni, regroupe tous les PDF dans une archive zip
+            max_workers: Nombre de process (défaut: nombre de coeurs)
+            progress_callback: Appelée avec (terminés, total, rapport) après chaque rapport
+            
+        Returns:
+            Dict avec les rapports générés, les erreurs et l'archive éventuelle. Clé d'un
+            rapport : "joueur (équipe)", rendue unique (homonymes d'une même équipe : #2, #3...)
+        """
+        if output_dir is None and zip_path is None:
+            raise ValueError("Indiquez output_dir ou zip_path")
+        
+        similar_players = similar_players or {}
+        total = len(players)
+        result = {'generated': {}, 'failed': {}, 'zip_path': None, 'duration': 0.0}
+        
+        if total == 0:
+            return result
+        
+        start = time.perf_counter()
+        tmp_dir = None
+        
+        if output_dir is None:
+            tmp_dir = tempfile.TemporaryDirectory()
+            output_dir = tmp_dir.name
+        os.makedirs(output_dir, exist_ok=True)
+        
+        try:
+            # Préparer les tâches (une clé et un fichier uniques par ligne : homonymes conservés)
+            tasks = []
+            used_keys = set()
+            used_names = set()
+            for _, row in players.iterrows():
+                player_name = str(row.get('player', 'joueur'))
+                report_key = self._report_key(player_name, row.get('team'), used_keys)
+                file_name = self._report_file_name(report_key, used_names)
+                similar = similar_players.get(player_name, pd.DataFrame())
+                tasks.append((report_key, row, similar, os.path.join(output_dir, file_name)))
+            
+            n_workers = max_workers or os.cpu_count() or 1
+            n_workers = max(1, min(n_workers, total))
+            
+            # 'spawn' : pas de fork d'un process multi-thread (ex: serveur Streamlit)
+            context = multiprocessing.get_context('spawn')
+            
+            with ProcessPoolExecutor(max_workers=n_workers,
+                                     mp_context=context,
+                                     initializer=_init_report_worker,
+                                     initargs=(self.club_name, league_data)) as executor:
+                futures = {
+                    executor.submit(_generate_report_task, row, similar, path): report_key
+                    for report_key, row, similar, path in tasks
+                }
+                
+                done = 0
+                for future in as_completed(futures):
+                    report_key = futures[future]
+                    try:
+                        path, timings = future.result()
+                        result['generated'][report_key] = path
+                        for page_name, durations in timings.items():
+                            self.page_timings[page_name].extend(durations)
+                    except Exception as e:
+                        # Un échec n'interrompt pas le reste du lot
+                        result['failed'][report_key] = str(e)
+                        print(f"⚠️ Rapport {report_key} en échec: {e}")
+                    
+                    done += 1
+                    if progress_callback is not None:
+                        progress_callback(done, total, report_key)
+            
+            if zip_path is not None:
+                with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                    for path in result['generated'].values():
+                        archive.write(path, arcname=os.path.basename(path))
+                result['zip_path'] = zip_path
+                
+                # Dans un dossier temporaire, les PDF n'existent que dans l'archive
+                if tmp_dir is not None:
+                    result['generated'] = {
+                        name: os.path.basename(path) for name, path in result['generated'].items()
+                    }
+        finally:
+            if tmp_dir is not None:
+                tmp_dir.cleanup()
+        
+        result['duration'] = time.perf_counter() - start
+        print(f"✅ {len(result['generated'])}/{total} rapports générés en {result['duration']:.1f}s "
+              f"({n_workers} process)")
+        
+        return result
+    
+    @staticmethod
+    def _report_key(player_name: str, team, used_keys: set) -> str:
+        """Clé unique d'un rapport du lot : joueur (équipe), suffixe #n pour les doublons"""
+        base = f"{player_name} ({team})" if isinstance(team, str) and team else player_name
+        report_key = base
+        
+        suffix = 2
+        while report_key in used_keys:
+            report_key = f"{base} #{suffix}"
+            suffix += 1
+        
+        used_keys.add(report_key)
+        return report_key
+    
+    @staticmethod
+    def _report_file_name(player_name: str, used_names: set) -> str:
+        """Nom de fichier sûr et unique pour un rapport"""
+        base = re.sub(r'[^\w\-]+', '_', player_name).strip('_') or 'joueur'
+        file_name = f"rapport_{base}.pdf"
+        
+        suffix = 2
+        while file_name in used_names:
+            file_name = f"rapport_{base}_{suffix}.pdf"
+            suffix += 1
+        
+        used_names.add(file_name)
+        return file_name
+    
+    def _get_templates(self) -> 'ReportPageTemplates':
+        """Templates de pages construits au premier rapport puis réutilisés"""
+        if self._templates is None:
+            start = time.perf_counter()
+            self._templates = ReportPageTemplates(self.club_name)
+            self.page_timings['construction_templates'].append(time.perf_counter() - start)
+        return self._templates
+    
+    def _save_page(self, pdf: PdfPages, fig: Figure, page_name: str, start: float):
+        """Enregistre une page template et mesure son temps de rendu"""
+        pdf.savefig(fig, bbox_inches='tight')
+        self.page_timings[page_name].append(time.perf_counter() - start)
+    
+    def get_page_timings(self) -> pd.DataFrame:
+        """Temps de rendu par page (secondes) sur tous les rapports générés"""
+        rows = []
+        for page_name, durations in self.page_timings.items():
+            if durations:
+                rows.append({
+                    'page': page_name,
+                    'count': len(durations),
+                    'mean_s': sum(durations) / len(durations),
+                    'max_s': max(durations),
+                    'total_s': sum(durations),
+                })
+        return pd.DataFrame(rows, columns=['page', 'count', 'mean_s', 'max_s', 'total_s'])
+    
     def _create_cover_page(self, pdf: PdfPages, player_data: pd.Series):
         """Page de garde"""
         try:
-            fig = plt.figure(figsize=(8.27, 11.69))
-            ax = fig.add_subplot(111)
-            ax.axis('off')
+            start = time.perf_counter()
+            page = self._get_templates().cover
             
-            ax.text(0.5, 0.7, 'RAPPORT DE SCOUTING',
-                   ha='center', fontsize=28, weight='bold',
-                   transform=ax.transAxes)
-            
-            player_name = str(player_data.get('player', 'Joueur Inconnu'))
-            ax.text(0.5, 0.55, player_name,
-                   ha='center', fontsize=36, weight='bold',
-                   color='#1f77b4', transform=ax.transAxes)
+            page['player'].set_text(str(player_data.get('player', 'Joueur Inconnu')))
             
             team_name = str(player_data.get('team', 'N/A'))
             matches = self._safe_int(player_data.get('matches_played', 0))
@@ -88,19 +467,10 @@ class ScoutingReportGenerator:
             Équipe: {team_name}
             Matchs joués: {matches}
             """
+            page['info'].set_text(info_text)
+            page['footer'].set_text(f'{self.club_name}\n{datetime.now().strftime("%d/%m/%Y")}')
             
-            ax.text(0.5, 0.35, info_text,
-                   ha='center', fontsize=14,
-                   transform=ax.transAxes,
-                   bbox=dict(boxstyle='round', facecolor='lightgray', alpha=0.5))
-            
-            ax.text(0.5, 0.1,
-                   f'{self.club_name}\n{datetime.now().strftime("%d/%m/%Y")}',
-                   ha='center', fontsize=12, style='italic',
-                   transform=ax.transAxes)
-            
-            pdf.savefig(fig, bbox_inches='tight')
-            plt.close(fig)
+            self._save_page(pdf, page['fig'], 'couverture', start)
             
         except Exception as e:
             print(f"❌ Erreur cover page: {e}")
@@ -108,58 +478,31 @@ class ScoutingReportGenerator:
     def _create_executive_summary(self, pdf: PdfPages, player_data: pd.Series):
         """Résumé exécutif"""
         try:
-            fig = plt.figure(figsize=(8.27, 11.69))
-            ax = fig.add_subplot(111)
-            ax.axis('off')
-            
-            ax.text(0.5, 0.95, 'RÉSUMÉ EXÉCUTIF',
-                   ha='center', fontsize=20, weight='bold',
-                   transform=ax.transAxes)
+            start = time.perf_counter()
+            page = self._get_templates().summary
             
-            # Points forts
+            # Points forts (en-tête fixe)
             strengths = self._identify_strengths(player_data)
-            y_pos = 0.85
-            
-            ax.text(0.1, y_pos, '✓ POINTS FORTS',
-                   fontsize=16, weight='bold', color='green',
-                   transform=ax.transAxes)
-            
-            y_pos -= 0.05
-            for strength in strengths[:5]:
-                ax.text(0.15, y_pos, f'• {strength}',
-                       fontsize=12, transform=ax.transAxes)
-                y_pos -= 0.04
+            y_pos = 0.85 - 0.05
+            y_pos = self._fill_text_slots(page['strengths'], [f'• {s}' for s in strengths[:5]], y_pos, 0.04)
             
             # Points faibles
             y_pos -= 0.05
             weaknesses = self._identify_weaknesses(player_data)
-            
-            ax.text(0.1, y_pos, '⚠ POINTS À AMÉLIORER',
-                   fontsize=16, weight='bold', color='orange',
-                   transform=ax.transAxes)
+            page['weaknesses_header'].set_y(y_pos)
             
             y_pos -= 0.05
-            for weakness in weaknesses[:5]:
-                ax.text(0.15, y_pos, f'• {weakness}',
-                       fontsize=12, transform=ax.transAxes)
-                y_pos -= 0.04
+            y_pos = self._fill_text_slots(page['weaknesses'], [f'• {w}' for w in weaknesses[:5]], y_pos, 0.04)
             
             # Verdict
             y_pos -= 0.05
-            verdict = self._generate_verdict(player_data)
-            
-            ax.text(0.1, y_pos, 'VERDICT',
-                   fontsize=16, weight='bold',
-                   transform=ax.transAxes)
+            page['verdict_header'].set_y(y_pos)
             
             y_pos -= 0.05
-            ax.text(0.1, y_pos, verdict,
-                   fontsize=11, transform=ax.transAxes,
-                   wrap=True,
-                   bbox=dict(boxstyle='round', facecolor='lightyellow', alpha=0.8))
+            page['verdict'].set_y(y_pos)
+            page['verdict'].set_text(self._generate_verdict(player_data))
             
-            pdf.savefig(fig, bbox_inches='tight')
-            plt.close(fig)
+            self._save_page(pdf, page['fig'], 'resume', start)
             
         except Exception as e:
             print(f"❌ Erreur summary: {e}")
@@ -167,20 +510,16 @@ class ScoutingReportGenerator:
     def _create_stats_page(self, pdf: PdfPages, player_data: pd.Series):
         """Page de statistiques"""
         try:
-            fig, axes = plt.subplots(3, 2, figsize=(8.27, 11.69))
-            fig.suptitle('STATISTIQUES DÉTAILLÉES', fontsize=20, weight='bold')
-            
-            categories = {
-                'Offensif': ['goals_per_90', 'xG_per_90', 'shots_per_90', 'shot_accuracy'],
-                'Création': ['assists_per_90', 'key_passes_per_90', 'passes_per_90'],
-                'Dribbles': ['dribbles_per_90', 'dribble_success_rate'],
-                'Défensif': ['tackles_per_90', 'interceptions_per_90'],
-                'Physique': ['fouls_committed', 'fouls_won'],
-                'Global': ['matches_played']
-            }
-            
-            for idx, (category, metrics) in enumerate(categories.items()):
-                ax = axes.flatten()[idx]
+            start = time.perf_counter()
+            page = self._get_templates().stats
+            
+            for panel, metrics in zip(page['panels'], ReportPageTemplates.STATS_CATEGORIES.values()):
+                ax = panel['ax']
+                
+                # Retirer les barres du rapport précédent
+                for artist in panel['data_artists']:
+                    artist.remove()
+                panel['data_artists'] = []
                 
                 values = []
                 labels = []
@@ -195,25 +534,31 @@ class ScoutingReportGenerator:
                                 values.append(num_val)
                                 labels.append(metric.replace('_', ' ').title())
                 
-                if values:
-                    bars = ax.barh(labels, values, color='steelblue', alpha=0.7)
+                has_data = bool(values)
+                if has_data:
+                    ax.set_axis_on()
+                else:
+                    ax.set_axis_off()
+                ax.title.set_visible(has_data)
+                panel['placeholder'].set_visible(not has_data)
+                
+                if has_data:
+                    positions = list(range(len(values)))
+                    bars = ax.barh(positions, values, color='steelblue', alpha=0.7)
+                    panel['data_artists'].append(bars)
+                    ax.set_yticks(positions)
+                    ax.set_yticklabels(labels)
                     
                     for bar, val in zip(bars, values):
-                        ax.text(val, bar.get_y() + bar.get_height()/2,
-                               f' {val:.2f}', va='center', fontsize=9)
+                        panel['data_artists'].append(
+                            ax.text(val, bar.get_y() + bar.get_height()/2,
+                                    f' {val:.2f}', va='center', fontsize=9)
+                        )
                     
-                    ax.set_title(category, fontsize=12, weight='bold')
-                    ax.grid(axis='x', alpha=0.3)
-                    ax.spines['top'].set_visible(False)
-                    ax.spines['right'].set_visible(False)
-                else:
-                    ax.text(0.5, 0.5, 'Données non disponibles',
-                           ha='center', va='center', transform=ax.transAxes)
-                    ax.axis('off')
+                    ax.relim()
+                    ax.autoscale_view()
             
-            plt.tight_layout()
-            pdf.savefig(fig, bbox_inches='tight')
-            plt.close(fig)
+            self._save_page(pdf, page['fig'], 'statistiques', start)
             
         except Exception as e:
             print(f"❌ Erreur stats page: {e}")
@@ -221,51 +566,29 @@ class ScoutingReportGenerator:
     def _create_comparison_page(self, pdf: PdfPages, player_data: pd.Series, similar: pd.DataFrame):
         """Page de comparaison"""
         try:
-            fig = plt.figure(figsize=(8.27, 11.69))
-            fig.suptitle('JOUEURS SIMILAIRES', fontsize=20, weight='bold', y=0.98)
+            start = time.perf_counter()
+            page = self._get_templates().comparison
             
-            ax = fig.add_subplot(111)
-            ax.axis('tight')
-            ax.axis('off')
+            table_data = similar.head(ReportPageTemplates.MAX_SIMILAR_ROWS)
             
-            if not similar.empty:
-                cols = ['player', 'team', 'similarity_score']
-                available_cols = [c for c in cols if c in similar.columns]
+            for row_idx, cells in enumerate(page['rows']):
+                visible = row_idx < len(table_data)
                 
-                if available_cols:
-                    table_data = similar[available_cols].head(10).copy()
-                    
-                    # Formater les valeurs numériques
-                    for col in table_data.columns:
-                        if col == 'similarity_score':
-                            table_data[col] = table_data[col].apply(
-                                lambda x: f'{float(x):.2f}' if pd.notna(x) and self._is_numeric(x) else 'N/A'
-                            )
-                        else:
-                            # Convertir en string pour éviter les erreurs
-                            table_data[col] = table_data[col].astype(str)
+                for col, cell in zip(ReportPageTemplates.COMPARISON_COLUMNS, cells):
+                    cell.set_visible(visible)
+                    if not visible:
+                        continue
                     
-                    table = ax.table(
-                        cellText=table_data.values,
-                        colLabels=table_data.columns,
-                        cellLoc='center',
-                        loc='center',
-                        bbox=[0, 0, 1, 0.9]
-                    )
+                    value = table_data[col].iloc[row_idx] if col in table_data.columns else None
                     
-                    table.auto_set_font_size(False)
-                    table.set_fontsize(9)
-                    table.scale(1, 2)
-                    
-                    for (i, j), cell in table.get_celld().items():
-                        if i == 0:
-                            cell.set_facecolor('#1f77b4')
-                            cell.set_text_props(weight='bold', color='white')
-                        else:
-                            cell.set_facecolor('#f0f0f0' if i % 2 == 0 else 'white')
+                    # Formater les valeurs numériques
+                    if col == 'similarity_score':
+                        text = f'{float(value):.2f}' if pd.notna(value) and self._is_numeric(value) else 'N/A'
+                    else:
+                        text = str(value) if value is not None else 'N/A'
+                    cell.get_text().set_text(text)
             
-            pdf.savefig(fig, bbox_inches='tight')
-            plt.close(fig)
+            self._save_page(pdf, page['fig'], 'comparaison', start)
             
         except Exception as e:
             print(f"❌ Erreur comparison: {e}")
@@ -273,33 +596,31 @@ class ScoutingReportGenerator:
     def _create_recommendations_page(self, pdf: PdfPages, player_data: pd.Series):
         """Page de recommandations"""
         try:
-            fig = plt.figure(figsize=(8.27, 11.69))
-            ax = fig.add_subplot(111)
-            ax.axis('off')
-            
-            ax.text(0.5, 0.95, 'RECOMMANDATIONS',
-                   ha='center', fontsize=20, weight='bold',
-                   transform=ax.transAxes)
+            start = time.perf_counter()
+            page = self._get_templates().recommendations
             
             recommendations = self._generate_recommendations(player_data)
+            items = [f'{i}. {rec}' for i, rec in enumerate(recommendations, 1)]
+            self._fill_text_slots(page['items'], items, 0.85, 0.08)
             
-            y_pos = 0.85
-            for i, rec in enumerate(recommendations, 1):
-                ax.text(0.1, y_pos, f'{i}. {rec}',
-                       fontsize=12, transform=ax.transAxes, wrap=True)
-                y_pos -= 0.08
-            
-            ax.text(0.5, 0.15,
-                   'Rapport généré par Football Analytics AI',
-                   ha='center', fontsize=10, style='italic',
-                   color='gray', transform=ax.transAxes)
-            
-            pdf.savefig(fig, bbox_inches='tight')
-            plt.close(fig)
+            self._save_page(pdf, page['fig'], 'recommandations', start)
             
         except Exception as e:
             print(f"❌ Erreur recommendations: {e}")
     
+    @staticmethod
+    def _fill_text_slots(slots: List, texts: List[str], y_pos: float, step: float) -> float:
+        """Remplit des emplacements de texte pré-créés, masque les inutilisés"""
+        for idx, slot in enumerate(slots):
+            if idx < len(texts):
+                slot.set_text(texts[idx])
+                slot.set_y(y_pos)
+                slot.set_visible(True)
+                y_pos -= step
+            else:
+                slot.set_visible(False)
+        return y_pos
+    
     def _identify_strengths(self, player_data: pd.Series) -> List[str]:
         """Identifie les points forts"""
         strengths = []
@@ -0,0 +1,227 @@
+# pipeline_cli.py
+"""
+Pipeline en ligne de commande (sans Streamlit)
+Ingestion de plusieurs saisons StatsBomb et écriture d'un dataset local
+
+Exemple :
+    python pipeline_cli.py --season 43:3 --season 55:43 --mode ultra --workers 4
+    python pipeline_cli.py --season 43:3 --mode ultra --metrics defensive,duels
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from football_recruitment_app import FootballRecruitmentAnalyzer, ULTRA_AVAILABLE
+from data_export import DataExporter, ARROW_AVAILABLE
+from event_sources import EventSource, get_event_source
+from competition_catalog import CompetitionCatalog
+from profiling import print_report
+
+DEFAULT_OUTPUT_DIR = 'datasets'
+
+
+def parse_season(value: str) -> Tuple[int, int]:
+    """Convertit 'competition:saison' (ex: '43:3') en tuple d'entiers"""
+    try:
+        competition_id, season_id = value.split(':')
+        return int(competition_id), int(season_id)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Format attendu competition:saison, reçu '{value}'")
+
+
+def season_dir(output_dir: str, mode: str, competition_id: int, season_id: int) -> str:
+    """Dossier d'une saison dans le dataset : <output>/<mode>/<competition>_<saison>"""
+    return os.path.join(output_dir, mode, f"{competition_id}_{season_id}")
+
+
+def write_frame(df: pd.DataFrame, path_base: str, fmt: str) -> str:
+    """Écrit un DataFrame en Parquet ou en CSV gzip (streaming)"""
+    if fmt == 'parquet':
+        path = f"{path_base}.parquet"
+        with open(path, 'wb') as f:
+            f.write(DataExporter.export_parquet(df))
+    else:
+        path = DataExporter.write_csv_stream(df, f"{path_base}.csv.gz", compress=True)
+    return path
+
+
+def run_season(competition_id: int,
+               season_id: int,
+               mode: str = 'normal',
+               max_workers: int = 1,
+               output_dir: str = DEFAULT_OUTPUT_DIR,
+               fmt: str = 'parquet',
+               event_source: Optional[EventSource] = None,
+               profile: bool = False,
+               metrics: Optional[List[str]] = None) -> Dict:
+    """
+    Ingère une saison et écrit stats joueurs + stats par match
+
+    Args:
+        metrics: Mode ULTRA, familles/métriques à calculer (None : toutes)
+
+    Returns:
+        Manifest de la saison (chemins, volumes, durées par étape)
+    """
+    analyzer = FootballRecruitmentAnalyzer(event_source, profile=profile)
+
+    if mode == 'ultra':
+        player_stats = analyzer.load_statsbomb_data_ultra(competition_id, season_id, max_workers, metrics)
+    else:
+        player_stats = analyzer.load_statsbomb_data(competition_id, season_id, max_workers)
+
+    manifest = {
+        'competition_id': competition_id,
+        'season_id': season_id,
+        'mode': mode,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'source': analyzer.event_source.describe(),
+        'players': len(player_stats),
+        'match_rows': 0,
+        'files': {},
+        'timings': dict(analyzer.load_timings),
+    }
+
+    if mode == 'ultra' and metrics is not None:
+        manifest['metrics'] = list(metrics)
+
+    if analyzer.load_profile:
+        manifest['profile'] = analyzer.load_profile
+
+    if player_stats.empty or analyzer.match_stats is None:
+        manifest['error'] = "Aucune donnée chargée"
+        return manifest
+
+    target_dir = season_dir(output_dir, mode, competition_id, season_id)
+    os.makedirs(target_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    manifest['files']['player_stats'] = write_frame(
+        player_stats, os.path.join(target_dir, 'player_stats'), fmt
+    )
+    manifest['files']['match_stats'] = write_frame(
+        analyzer.match_stats, os.path.join(target_dir, 'match_stats'), fmt
+    )
+    manifest['timings']['write'] = time.perf_counter() - start
+    manifest['match_rows'] = len(analyzer.match_stats)
+
+    with open(os.path.join(target_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    return manifest
+
+
+def run_pipeline(seasons: List[Tuple[int, int]],
+                 mode: str = 'normal',
+                 max_workers: int = 1,
+                 output_dir: str = DEFAULT_OUTPUT_DIR,
+                 fmt: str = 'parquet',
+                 event_source: Optional[EventSource] = None,
+                 profile: bool = False,
+                 metrics: Optional[List[str]] = None) -> List[Dict]:
+    """Ingère toutes les saisons demandées et affiche les durées par étape"""
+    if mode == 'ultra' and not ULTRA_AVAILABLE:
+        print("⚠️ Mode ULTRA non disponible - utilisation du mode normal")
+        mode = 'normal'
+
+    if fmt == 'parquet' and not ARROW_AVAILABLE:
+        print("⚠️ pyarrow absent - écriture en CSV gzip")
+        fmt = 'csv'
+
+    event_source = event_source or get_event_source()
+    print(f"📂 Source des événements: {event_source.describe()}")
+
+    # Catalogue local (si construit) : estimation avant, durée réelle après chaque saison
+    catalog = CompetitionCatalog.load()
+
+    manifests = []
+    for competition_id, season_id in seasons:
+        if catalog is not None and catalog.get(competition_id, season_id):
+            estimate = catalog.estimate_load_seconds(competition_id, season_id, mode == 'ultra', max_workers)
+            print(f"⏳ {competition_id}:{season_id} - durée estimée ~{estimate:.0f}s")
+
+        start = time.perf_counter()
+        manifest = run_season(competition_id, season_id, mode, max_workers, output_dir, fmt,
+                              event_source, profile, metrics)
+        manifest['timings']['total'] = time.perf_counter() - start
+        manifests.append(manifest)
+
+        # Chargement ciblé : durée non représentative d'une saison complète
+        if catalog is not None and 'error' not in manifest and 'metrics' not in manifest:
+            catalog.record_load(competition_id, season_id, mode == 'ultra',
+                                manifest['timings']['total'] * max(1, max_workers))
+
+    if catalog is not None:
+        catalog.save()
+
+    print_timings(manifests)
+    for manifest in manifests:
+        if 'profile' in manifest:
+            print(f"\n📊 Saison {manifest['competition_id']}:{manifest['season_id']}")
+            print_report(manifest['profile'])
+    return manifests
+
+
+def print_timings(manifests: List[Dict]):
+    """Tableau récapitulatif des durées par étape et par saison"""
+    stages = ['matches', 'prefetch', 'fetch', 'extract', 'aggregate', 'write', 'total']
+
+    print("\n" + "=" * 80)
+    print("⏱️  DURÉES PAR ÉTAPE (secondes - fetch/extract cumulés sur les matchs)")
+    print("=" * 80)
+    print(f"{'saison':<12}{'joueurs':>9}" + ''.join(f"{s:>10}" for s in stages))
+
+    for manifest in manifests:
+        label = f"{manifest['competition_id']}:{manifest['season_id']}"
+        timings = manifest['timings']
+        row = f"{label:<12}{manifest['players']:>9}"
+        row += ''.join(f"{timings.get(s, 0.0):>10.2f}" for s in stages)
+        if 'error' in manifest:
+            row += f"  ❌ {manifest['error']}"
+        print(row)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Ingestion StatsBomb hors Streamlit : stats joueurs et stats par match"
+    )
+    parser.add_argument('--season', dest='seasons', type=parse_season, action='append', required=True,
+                        metavar='COMPETITION:SAISON',
+                        help="Saison à ingérer, ex: 43:3 (option répétable)")
+    parser.add_argument('--mode', choices=['normal', 'ultra'], default='normal',
+                        help="Extraction normale (35 features) ou ULTRA (100+ features)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Nombre de process pour charger/extraire les matchs")
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR,
+                        help="Dossier du dataset local")
+    parser.add_argument('--format', dest='fmt', choices=['parquet', 'csv'], default='parquet',
+                        help="Format des fichiers écrits")
+    parser.add_argument('--open-data', default=None, metavar='DOSSIER',
+                        help="Checkout local de statsbomb/open-data (défaut: $STATSBOMB_OPEN_DATA, sinon réseau)")
+    parser.add_argument('--event-store', default=None, metavar='DOSSIER',
+                        help="Stores colonnaires des événements par saison, construits au premier passage "
+                             "(défaut: $STATSBOMB_EVENT_STORE)")
+    parser.add_argument('--profile', action='store_true',
+                        help="Mesure chaque étape (fetch, parsing, familles _extract_*, agrégation) ; "
+                             "rapport affiché et écrit dans manifest.json")
+    parser.add_argument('--metrics', default=None, metavar='LISTE',
+                        help="Mode ULTRA ciblé : familles ou métriques séparées par des virgules, "
+                             "ex: defensive,duels ou tackles_per_90,pass_completion_rate")
+    args = parser.parse_args(argv)
+    metrics = [name.strip() for name in args.metrics.split(',') if name.strip()] if args.metrics else None
+
+    manifests = run_pipeline(args.seasons, args.mode, args.workers, args.output_dir, args.fmt,
+                             get_event_source(args.open_data, args.event_store), args.profile, metrics)
+
+    failed = [m for m in manifests if 'error' in m]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
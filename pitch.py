@@ -0,0 +1,56 @@
+# pitch.py
+"""
+Repère du terrain StatsBomb et lecture des colonnes d'événements
+Partagés par les moteurs spatiaux (three_sixty, spatial_grid, possession_chains,
+expected_threat, expected_goals)
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Tuple
+import warnings
+warnings.filterwarnings('ignore')
+
+
+# Terrain StatsBomb (yards) : l'équipe de l'événement attaque vers x = 120, y de gauche à droite
+PITCH_LENGTH = 120.0
+PITCH_WIDTH = 80.0
+
+GOAL_X = PITCH_LENGTH
+GOAL_CENTER_Y = 40.0
+GOAL_WIDTH = 8.0
+GOAL_POSTS_Y = (GOAL_CENTER_Y - GOAL_WIDTH / 2, GOAL_CENTER_Y + GOAL_WIDTH / 2)
+
+# Séance de tirs au but : hors jeu courant (chaînes, xT, xG)
+SHOOTOUT_PERIOD = 5
+
+
+def point_xy(events: pd.DataFrame, column: str = 'location') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Coordonnées x, y d'une colonne de points : colonnes <col>_x/<col>_y si présentes
+    (FastEventParser), sinon listes [x, y] (aplatissement statsbombpy) ; NaN si absentes
+    """
+    if f'{column}_x' in events.columns and f'{column}_y' in events.columns:
+        return (events[f'{column}_x'].to_numpy(dtype=float, na_value=np.nan),
+                events[f'{column}_y'].to_numpy(dtype=float, na_value=np.nan))
+    
+    points = events[column].to_numpy() if column in events.columns else np.array([], dtype=object)
+    valid = np.array([isinstance(p, (list, tuple, np.ndarray)) and len(p) >= 2 for p in points], dtype=bool)
+    x = np.full(len(events), np.nan)
+    y = np.full(len(events), np.nan)
+    if valid.any():
+        xy = np.array([p[:2] for p in points[valid]], dtype=float)
+        x[valid], y[valid] = xy[:, 0], xy[:, 1]
+    return x, y
+
+
+def event_column(events: pd.DataFrame, column: str, default=np.nan) -> pd.Series:
+    """Colonne des événements, ou valeur par défaut si absente"""
+    if column in events.columns:
+        return events[column]
+    return pd.Series(default, index=events.index)
+
+
+if __name__ == "__main__":
+    print("✅ Module pitch.py chargé avec succès!")
+    print("Fonctions disponibles: point_xy, event_column")
@@ -0,0 +1,266 @@
+# player_pool.py
+"""
+Pool de joueurs multi-saisons / multi-compétitions
+Fusion de plusieurs (compétition, saison) à partir des stats par match en cache
+(dataset de pipeline_cli.py), agrégées par joueur-saison et par joueur toutes saisons
+"""
+
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+from pandas.api.types import CategoricalDtype, union_categoricals
+
+from football_recruitment_app import FootballRecruitmentAnalyzer
+from pipeline_cli import DEFAULT_OUTPUT_DIR, run_season, season_dir
+import warnings
+warnings.filterwarnings('ignore')
+
+
+class PlayerPoolBuilder:
+    """Construit un pool de joueurs unique à partir de plusieurs saisons"""
+    
+    # Colonnes texte stockées en category (une seule copie de chaque libellé)
+    CATEGORICAL_COLUMNS = ['player', 'team', 'competition', 'season']
+    
+    # Regroupements : joueur-saison et joueur toutes saisons
+    SEASON_KEYS = ['player', 'team', 'competition', 'season', 'competition_id', 'season_id']
+    CAREER_KEYS = ['player']
+    
+    def __init__(self,
+                 analyzer: Optional[FootballRecruitmentAnalyzer] = None,
+                 dataset_dir: str = DEFAULT_OUTPUT_DIR,
+                 mode: str = 'normal',
+                 max_workers: int = 1,
+                 fmt: str = 'parquet'):
+        """
+        Args:
+            analyzer: Analyseur qui recevra le pool (player_stats / career_stats)
+            dataset_dir: Dataset de pipeline_cli (stats par match réutilisées)
+            mode: 'normal' ou 'ultra'
+            max_workers: Process pour les saisons absentes du cache
+            fmt: Format d'écriture des saisons absentes du cache
+        """
+        self.analyzer = analyzer or FootballRecruitmentAnalyzer()
+        self.dataset_dir = dataset_dir
+        self.mode = mode
+        self.max_workers = max_workers
+        self.fmt = fmt
+        self.match_stats = None
+        self.season_stats = None
+        self.career_stats = None
+        self.load_report = []
+    
+    def _cached_match_stats_path(self, competition_id: int, season_id: int) -> Optional[str]:
+        """
+        Stats par match réutilisables : seulement si le manifest de la saison décrit
+        une ingestion complète du même mode (pas un run ULTRA ciblé --metrics)
+        """
+        directory = season_dir(self.dataset_dir, self.mode, competition_id, season_id)
+        try:
+            with open(os.path.join(directory, 'manifest.json'), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if manifest.get('mode') != self.mode or 'error' in manifest:
+            return None
+        if 'metrics' in manifest:
+            print(f"🔄 Saison {competition_id}:{season_id}: dataset partiel "
+                  f"({', '.join(manifest['metrics'])}) - réingestion complète")
+            return None
+        
+        for name in ['match_stats.parquet', 'match_stats.csv.gz']:
+            path = os.path.join(directory, name)
+            if os.path.isfile(path):
+                return path
+        return None
+    
+    def _season_matches(self, competition_id: int, season_id: int) -> Optional[pd.DataFrame]:
+        try:
+            return self.analyzer.event_source.matches(competition_id, season_id)
+        except Exception:
+            return None
+    
+    @staticmethod
+    def _season_labels(matches: Optional[pd.DataFrame], competition_id: int, season_id: int) -> Tuple[str, str]:
+        """Noms de compétition et de saison (identifiants si indisponibles)"""
+        try:
+            return str(matches['competition'].iloc[0]), str(matches['season'].iloc[0])
+        except Exception:
+            return str(competition_id), str(season_id)
+    
+    def load_season_match_stats(self, competition_id: int, season_id: int) -> Optional[pd.DataFrame]:
+        """
+        Stats par match d'une saison : lues dans le dataset si présentes,
+        sinon ingérées (et écrites) via pipeline_cli.run_season
+        
+        Returns:
+            DataFrame compacté et étiqueté (competition, season), None en cas d'échec
+        """
+        start = time.perf_counter()
+        path = self._cached_match_stats_path(competition_id, season_id)
+        cached = path is not None
+        
+        if not cached:
+            manifest = run_season(competition_id, season_id, self.mode, self.max_workers,
+                                  self.dataset_dir, self.fmt, self.analyzer.event_source)
+            if 'error' in manifest:
+                print(f"❌ Saison {competition_id}:{season_id}: {manifest['error']}")
+                return None
+            path = manifest['files']['match_stats']
+        
+        if path.endswith('.parquet'):
+            df = pd.read_parquet(path)
+        else:
+            df = pd.read_csv(path)
+        
+        matches = self._season_matches(competition_id, season_id)
+        competition, season = self._season_labels(matches, competition_id, season_id)
+        
+        # Datasets écrits avant l'ajout des dates : dates reprises du fichier de matchs
+        if 'match_date' not in df.columns and matches is not None and 'match_date' in matches.columns:
+            df['match_date'] = df['match_id'].map(dict(zip(matches['match_id'], matches['match_date'])))
+        
+        df['competition'] = competition
+        df['season'] = season
+        df['competition_id'] = competition_id
+        df['season_id'] = season_id
+        
+        df = self.compact(df)
+        self.load_report.append({
+            'competition_id': competition_id,
+            'season_id': season_id,
+            'rows': len(df),
+            'cached': cached,
+            'seconds': time.perf_counter() - start,
+        })
+        return df
+    
+    @staticmethod
+    def compact(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Réduit l'empreinte mémoire : compteurs en entiers les plus petits possibles,
+        métriques décimales en float32, libellés en category
+        """
+        df = df.copy()
+        
+        for col in df.columns:
+            values = df[col]
+            
+            if col in PlayerPoolBuilder.CATEGORICAL_COLUMNS:
+                df[col] = values.astype('category')
+            elif pd.api.types.is_bool_dtype(values):
+                continue
+            elif pd.api.types.is_integer_dtype(values):
+                df[col] = pd.to_numeric(values, downcast='integer')
+            elif pd.api.types.is_float_dtype(values):
+                # Colonnes entières stockées en float (ex: compteurs après un NaN) : entiers si possible
+                if values.notna().all() and (values % 1 == 0).all():
+                    df[col] = pd.to_numeric(values, downcast='integer')
+                else:
+                    df[col] = values.astype('float32')
+        
+        return df
+    
+    @staticmethod
+    def concat_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Concatène des saisons compactées sans repasser par des colonnes objet :
+        catégories unifiées avant la concaténation
+        """
+        frames = [f for f in frames if f is not None and not f.empty]
+        if not frames:
+            return pd.DataFrame()
+        
+        for col in PlayerPoolBuilder.CATEGORICAL_COLUMNS:
+            present = [f[col] for f in frames if col in f.columns]
+            if not present:
+                continue
+            dtype = CategoricalDtype(union_categoricals(present, ignore_order=True).categories)
+            for f in frames:
+                if col in f.columns:
+                    f[col] = f[col].astype(dtype)
+        
+        df = pd.concat(frames, ignore_index=True)
+        
+        # Métriques absentes de certaines saisons : NaN -> 0 (compteurs)
+        numeric = df.select_dtypes('number').columns
+        df[numeric] = df[numeric].fillna(0)
+        return df
+    
+    def build(self, seasons: List[Tuple[int, int]],
+              progress_callback: Optional[Callable[[int, int], None]] = None) -> pd.DataFrame:
+        """
+        Construit le pool fusionné
+        
+        Args:
+            seasons: Liste de (competition_id, season_id)
+            progress_callback: Appelé avec (saisons traitées, total)
+        
+        Returns:
+            Stats par joueur-saison (aussi disponibles dans analyzer.player_stats) ;
+            stats toutes saisons dans self.career_stats / analyzer.career_stats
+        """
+        self.load_report = []
+        frames = []
+        
+        for i, (competition_id, season_id) in enumerate(seasons):
+            frames.append(self.load_season_match_stats(competition_id, season_id))
+            if progress_callback:
+                progress_callback(i + 1, len(seasons))
+        
+        self.match_stats = self.concat_frames(frames)
+        if self.match_stats.empty:
+            print("❌ Aucune saison chargée")
+            return pd.DataFrame()
+        
+        self.season_stats = self._aggregate(self.SEASON_KEYS)
+        self.career_stats = self._aggregate(self.CAREER_KEYS)
+        
+        seasons_played = (self.match_stats[['player', 'competition_id', 'season_id']]
+                          .drop_duplicates()
+                          .groupby('player', observed=True).size())
+        self.career_stats['seasons_played'] = self.career_stats['player'].map(seasons_played).astype('int16')
+        
+        self.analyzer.match_stats = self.match_stats
+        self.analyzer.player_stats = self.season_stats
+        self.analyzer.career_stats = self.career_stats
+        
+        memory_mb = self.match_stats.memory_usage(deep=True).sum() / 1e6
+        print(f"✅ Pool: {len(seasons)} saisons, {len(self.season_stats)} joueurs-saisons, "
+              f"{len(self.career_stats)} joueurs ({memory_mb:.1f} Mo de stats par match)")
+        return self.season_stats
+    
+    def _aggregate(self, group_keys: List[str]) -> pd.DataFrame:
+        agg_stats = self.analyzer._aggregate_season_stats(self.match_stats, group_keys=group_keys)
+        
+        for col in self.CATEGORICAL_COLUMNS:
+            if col in agg_stats.columns and isinstance(agg_stats[col].dtype, CategoricalDtype):
+                agg_stats[col] = agg_stats[col].cat.remove_unused_categories()
+        
+        return agg_stats.reset_index(drop=True)
+    
+    def use_career_stats(self) -> pd.DataFrame:
+        """Bascule l'analyseur sur les stats toutes saisons (une ligne par joueur)"""
+        self.analyzer.player_stats = self.career_stats
+        return self.career_stats
+    
+    def summary(self) -> Dict:
+        """Volumes du dernier pool construit"""
+        return {
+            'seasons': len(self.load_report),
+            'cached_seasons': sum(r['cached'] for r in self.load_report),
+            'match_rows': 0 if self.match_stats is None else len(self.match_stats),
+            'player_seasons': 0 if self.season_stats is None else len(self.season_stats),
+            'players': 0 if self.career_stats is None else len(self.career_stats),
+            'memory_mb': 0.0 if self.match_stats is None else
+            self.match_stats.memory_usage(deep=True).sum() / 1e6,
+        }
+
+
+if __name__ == "__main__":
+    print("✅ Module player_pool.py chargé avec succès!")
+    print("Classe disponible: PlayerPoolBuilder")
@@ -0,0 +1,180 @@
+# possession_chains.py
+"""
+Chaînes de possession StatsBomb et métriques de valeur par chaîne
+Les événements sont regroupés par (match, possession) en une passe vectorisée :
+résultat de chaque chaîne (tirs, xG, buts) puis crédit des joueurs impliqués
+(xGChain, xGBuildup, actions menant à un tir / à un but, SCA / GCA)
+"""
+
+import pandas as pd
+import numpy as np
+from typing import List, Optional
+
+from pitch import SHOOTOUT_PERIOD, event_column, point_xy
+import warnings
+warnings.filterwarnings('ignore')
+
+
+# Actions offensives créditées par SCA / GCA (les deux dernières avant le tir, même possession)
+SCA_EVENT_TYPES = ['Pass', 'Dribble', 'Foul Won', 'Shot', 'Ball Recovery', 'Interception']
+
+# Colonnes ajoutées aux événements par PossessionChains.annotate
+CHAIN_COLUMNS = ['chain_involvement', 'chain_xg_credit', 'chain_buildup_credit',
+                 'sca_credit', 'gca_credit']
+
+
+class PossessionChains:
+    """
+    Chaînes de possession d'un match ou d'une saison (clé : match_id, possession)
+    
+    Un joueur est impliqué dans une chaîne s'il y réalise un événement pour l'équipe en
+    possession. xGChain : xG total des chaînes où il est impliqué ; xGBuildup : idem hors
+    chaînes où il tire ou fait la passe décisive / clé. SCA / GCA : chacune des deux
+    actions offensives (SCA_EVENT_TYPES réussies) qui précèdent un tir / un but.
+    """
+    
+    def __init__(self, events: pd.DataFrame):
+        """
+        Args:
+            events: Événements (format sb.events) avec la colonne possession
+        """
+        if 'possession' not in events.columns:
+            raise ValueError("Colonne 'possession' absente des événements")
+        
+        # Ordre chronologique (match, index) : chaque chaîne est une suite contiguë
+        match_ids = event_column(events, 'match_id', 0).to_numpy()
+        order_index = event_column(events, 'index', 0).to_numpy()
+        match_codes = pd.factorize(match_ids, sort=False)[0]
+        self._order = np.lexsort((np.arange(len(events)), order_index, match_codes))
+        self.events = events.iloc[self._order]
+        ev = self.events
+        
+        chain_keys = pd.MultiIndex.from_arrays([match_ids[self._order], ev['possession'].to_numpy()])
+        self.chain, self._chain_keys = pd.factorize(chain_keys, sort=False)
+        n_chains = len(self._chain_keys)
+        
+        event_type = event_column(ev, 'type').to_numpy(dtype=object)
+        team = event_column(ev, 'team').to_numpy(dtype=object)
+        possession_team = event_column(ev, 'possession_team').to_numpy(dtype=object)
+        self.on_ball = (team == possession_team) & ev['player'].notna().to_numpy() \
+            if 'player' in ev.columns else np.zeros(len(ev), dtype=bool)
+        
+        # Tirs de la chaîne (hors séance de tirs au but)
+        in_play = (event_column(ev, 'period', 1).to_numpy() != SHOOTOUT_PERIOD)
+        self.is_shot = (event_type == 'Shot') & self.on_ball & in_play
+        self.is_goal = self.is_shot & (event_column(ev, 'shot_outcome').to_numpy(dtype=object) == 'Goal')
+        xg = pd.to_numeric(event_column(ev, 'shot_statsbomb_xg'), errors='coerce').fillna(0).to_numpy()
+        self.shot_xg = np.where(self.is_shot, xg, 0.0)
+        
+        self.chain_xg = np.bincount(self.chain, weights=self.shot_xg, minlength=n_chains)
+        self.chain_shots = np.bincount(self.chain, weights=self.is_shot, minlength=n_chains).astype(int)
+        self.chain_goals = np.bincount(self.chain, weights=self.is_goal, minlength=n_chains).astype(int)
+        
+        self._credit_players(ev, event_type)
+        self._credit_shot_creation(ev, event_type)
+    
+    def _credit_players(self, ev: pd.DataFrame, event_type: np.ndarray):
+        """Crédit xGChain / xGBuildup sur le premier événement de chaque joueur dans chaque chaîne"""
+        player_codes = pd.factorize(ev['player'].to_numpy() if 'player' in ev.columns
+                                    else np.full(len(ev), None), sort=False)[0]
+        n_codes = player_codes.max(initial=-1) + 2
+        pairs = np.where(self.on_ball, self.chain.astype(np.int64) * n_codes + player_codes, -1)
+        pair_codes, _ = pd.factorize(pairs, sort=False)
+        
+        first = np.zeros(len(ev), dtype=bool)
+        first[np.unique(pair_codes, return_index=True)[1]] = True
+        first &= self.on_ball
+        
+        # Tir ou passe clé / décisive du joueur dans la chaîne : exclus de xGBuildup
+        key_pass = (event_type == 'Pass') & (
+            (event_column(ev, 'pass_shot_assist').to_numpy(dtype=object) == True) |
+            (event_column(ev, 'pass_goal_assist').to_numpy(dtype=object) == True)
+        )
+        finisher = (self.is_shot | key_pass) & self.on_ball
+        pair_finisher = np.bincount(pair_codes, weights=finisher) > 0
+        
+        self.involvement = first.astype(float)
+        self.xg_chain_credit = np.where(first, self.chain_xg[self.chain], 0.0)
+        self.xg_buildup_credit = np.where(first & ~pair_finisher[pair_codes], self.chain_xg[self.chain], 0.0)
+    
+    def _credit_shot_creation(self, ev: pd.DataFrame, event_type: np.ndarray):
+        """SCA / GCA : les deux actions offensives réussies précédant chaque tir de la chaîne"""
+        successful = np.ones(len(ev), dtype=bool)
+        successful &= ~((event_type == 'Pass') & event_column(ev, 'pass_outcome').notna().to_numpy())
+        successful &= ~((event_type == 'Dribble') &
+                        (event_column(ev, 'dribble_outcome').to_numpy(dtype=object) != 'Complete'))
+        actions = np.flatnonzero(np.isin(event_type, SCA_EVENT_TYPES) & successful & self.on_ball)
+        
+        action_chain = self.chain[actions]
+        shots = np.flatnonzero(self.is_shot[actions])
+        goals = self.is_goal[actions]
+        
+        self.sca_credit = np.zeros(len(ev))
+        self.gca_credit = np.zeros(len(ev))
+        for lag in (1, 2):
+            target = shots[shots >= lag]
+            previous = target - lag
+            same_chain = action_chain[previous] == action_chain[target]
+            np.add.at(self.sca_credit, actions[previous[same_chain]], 1)
+            np.add.at(self.gca_credit, actions[previous[same_chain & goals[target]]], 1)
+    
+    def __len__(self) -> int:
+        return len(self._chain_keys)
+    
+    def chains(self) -> pd.DataFrame:
+        """Une ligne par chaîne : équipe, événements, passes, tirs, xG, buts, début / fin en x"""
+        ev = self.events
+        frame = pd.DataFrame({
+            'chain': self.chain,
+            'team': event_column(ev, 'possession_team').to_numpy(dtype=object),
+            'is_pass': (event_column(ev, 'type').to_numpy(dtype=object) == 'Pass') & self.on_ball,
+            'x': point_xy(ev, 'location')[0],  # location_x ou listes [x, y] (statsbombpy)
+        })
+        grouped = frame.groupby('chain', sort=True)
+        chains = pd.DataFrame({
+            'match_id': self._chain_keys.get_level_values(0),
+            'possession': self._chain_keys.get_level_values(1),
+            'team': grouped['team'].first().to_numpy(),
+            'events': grouped.size().to_numpy(),
+            'passes': grouped['is_pass'].sum().to_numpy(),
+            'shots': self.chain_shots,
+            'xg': self.chain_xg,
+            'goals': self.chain_goals,
+            'start_x': grouped['x'].first().to_numpy(),
+            'end_x': grouped['x'].last().to_numpy(),
+        })
+        return chains
+    
+    def credits(self) -> pd.DataFrame:
+        """Crédits de chaque événement (index et ordre d'origine des événements, CHAIN_COLUMNS)"""
+        values = np.column_stack([self.involvement, self.xg_chain_credit, self.xg_buildup_credit,
+                                  self.sca_credit, self.gca_credit])
+        restored = np.empty_like(values)
+        restored[self._order] = values
+        index = self.events.index.take(np.argsort(self._order))
+        return pd.DataFrame(restored, index=index, columns=CHAIN_COLUMNS)
+    
+    def annotate(self, events: pd.DataFrame) -> pd.DataFrame:
+        """Copie des événements d'origine avec les colonnes CHAIN_COLUMNS"""
+        credits = self.credits()
+        return events.assign(**{col: credits[col].to_numpy() for col in CHAIN_COLUMNS})
+    
+    def player_totals(self, group_keys: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Totaux par joueur (défaut: joueur + équipe) : chaînes impliquées, xGChain, xGBuildup, SCA, GCA
+        Une saison entière en une agrégation groupée
+        """
+        group_keys = group_keys or ['player', 'team']
+        frame = self.events[group_keys].copy()
+        frame['possessions_involved'] = self.involvement
+        frame['xg_chain'] = self.xg_chain_credit
+        frame['xg_buildup'] = self.xg_buildup_credit
+        frame['shot_creating_actions'] = self.sca_credit
+        frame['goal_creating_actions'] = self.gca_credit
+        totals = frame[self.on_ball].groupby(group_keys, observed=True, sort=False).sum()
+        return totals.reset_index()
+
+
+if __name__ == "__main__":
+    print("✅ Module possession_chains.py chargé avec succès!")
+    print("Classe disponible: PossessionChains")
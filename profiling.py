@@ -0,0 +1,168 @@
+# profiling.py
+"""
+Instrumentation légère du pipeline de chargement
+Chronomètres (context managers / décorateur) et compteurs agrégés par étape,
+exportés en rapport structuré par chargement. Désactivé : un simple test de booléen
+"""
+
+import functools
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Dict, Optional
+
+import pandas as pd
+import warnings
+warnings.filterwarnings('ignore')
+
+# Contexte vide partagé (aucune allocation quand le profilage est désactivé)
+_NULL_SECTION = nullcontext()
+
+
+class Profiler:
+    """Durées et compteurs par étape d'un chargement"""
+    
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.reset()
+    
+    def reset(self):
+        """Vide les mesures (début d'un nouveau chargement)"""
+        self.sections = {}   # nom -> [appels, durée totale, durée max]
+        self.counters = {}
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self._start = time.perf_counter()
+    
+    def section(self, name: str):
+        """
+        Chronomètre une étape (context manager) :
+            
+            with PROFILER.section('aggregate'):
+                ...
+        """
+        if not self.enabled:
+            return _NULL_SECTION
+        return self._timed(name)
+    
+    @contextmanager
+    def _timed(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+    
+    def add_time(self, name: str, seconds: float, calls: int = 1):
+        if not self.enabled:
+            return
+        entry = self.sections.get(name)
+        if entry is None:
+            self.sections[name] = [calls, seconds, seconds]
+        else:
+            entry[0] += calls
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+    
+    def count(self, name: str, value: int = 1):
+        """Incrémente un compteur (matchs, événements, joueurs...)"""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+    
+    def snapshot(self) -> Dict:
+        """Mesures brutes, sérialisables (renvoyées par les process workers)"""
+        return {'sections': {name: list(entry) for name, entry in self.sections.items()},
+                'counters': dict(self.counters)}
+    
+    def merge(self, snapshot: Optional[Dict]):
+        """Ajoute les mesures d'un process worker"""
+        if not self.enabled or not snapshot:
+            return
+        for name, (calls, total, longest) in snapshot['sections'].items():
+            entry = self.sections.get(name)
+            if entry is None:
+                self.sections[name] = [calls, total, longest]
+            else:
+                entry[0] += calls
+                entry[1] += total
+                entry[2] = max(entry[2], longest)
+        for name, value in snapshot['counters'].items():
+            self.counters[name] = self.counters.get(name, 0) + value
+    
+    def report(self) -> Dict:
+        """
+        Rapport du chargement en cours / terminé
+        
+        Returns:
+            {'started_at', 'wall_time', 'sections': {nom: {calls, total, mean, max, share}},
+             'counters': {...}} - durées en secondes, cumulées sur les process workers
+        """
+        wall_time = time.perf_counter() - self._start
+        sections = {}
+        for name, (calls, total, longest) in sorted(self.sections.items(), key=lambda item: -item[1][1]):
+            sections[name] = {
+                'calls': calls,
+                'total': total,
+                'mean': total / calls if calls else 0.0,
+                'max': longest,
+                'share': total / wall_time if wall_time > 0 else 0.0,
+            }
+        return {
+            'started_at': self.started_at,
+            'wall_time': wall_time,
+            'sections': sections,
+            'counters': dict(self.counters),
+        }
+
+
+# Profileur du process (activable via FOOTBALL_PROFILE=1 ou analyzer.profile)
+PROFILER = Profiler(enabled=os.environ.get('FOOTBALL_PROFILE') == '1')
+
+
+def profiled(name: Optional[str] = None):
+    """Décorateur : chronomètre chaque appel de la fonction si le profilage est actif"""
+    def decorator(func):
+        label = name or func.__qualname__
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            with PROFILER._timed(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def report_to_frame(report: Dict) -> pd.DataFrame:
+    """Sections d'un rapport en DataFrame (une ligne par étape, triée par durée)"""
+    if not report or not report.get('sections'):
+        return pd.DataFrame(columns=['section', 'calls', 'total', 'mean', 'max', 'share'])
+    
+    df = pd.DataFrame.from_dict(report['sections'], orient='index')
+    df.index.name = 'section'
+    return df.reset_index()
+
+
+def print_report(report: Dict, top: int = 20):
+    """Affiche un rapport dans la console"""
+    if not report or not report.get('sections'):
+        print("⚠️ Profilage désactivé ou vide")
+        return
+    
+    print("\n" + "=" * 72)
+    print(f"⏱️  PROFIL DU CHARGEMENT ({report['wall_time']:.2f}s mur, durées cumulées sur les workers)")
+    print("=" * 72)
+    print(f"{'étape':<40}{'appels':>8}{'total (s)':>12}{'moy. (ms)':>12}")
+    for name, entry in list(report['sections'].items())[:top]:
+        print(f"{name:<40}{entry['calls']:>8}{entry['total']:>12.3f}{entry['mean'] * 1000:>12.3f}")
+    
+    if report['counters']:
+        print("-" * 72)
+        print("  ".join(f"{name}={value}" for name, value in report['counters'].items()))
+
+
+if __name__ == "__main__":
+    print("✅ Module profiling.py chargé avec succès!")
+    print("Classe disponible: Profiler")
+    print(f"Profilage actif: {'✅ OUI' if PROFILER.enabled else '❌ NON'}")
@@ -79,8 +79,18 @@ class PlayerRecommendationSystem:
                             target_profile: Dict[str, float],
                             df: pd.DataFrame,
                             top_n: int = 10,
-                            filters: Optional[Dict] = None) -> pd.DataFrame:
-        """Recommande des joueurs basés sur un profil"""
+                            filters: Optional[Dict] = None,
+                            spatial_target: Optional[str] = None,
+                            spatial_index=None,
+                            spatial_weight: float = 0.0) -> pd.DataFrame:
+        """
+        Recommande des joueurs basés sur un profil
+        
+        Args:
+            spatial_target: Joueur dont les zones d'activité servent de référence
+            spatial_index: Similarité spatiale de la saison (spatial_grid.SpatialSimilarityIndex)
+            spatial_weight: Part de la similarité spatiale dans match_score (0 à 1)
+        """
         if not self.is_fitted:
             print("❌ Modèle non entraîné")
             return pd.DataFrame()
@@ -128,6 +138,12 @@ class PlayerRecommendationSystem:
             results['match_score'] = 100 - results['match_score']  # Inverser pour que 100 = parfait
             results['match_score'] = results['match_score'].clip(0, 100)
             
+            # Zones d'activité : même joueur de référence, matrice précalculée
+            if spatial_weight > 0 and spatial_index is not None and spatial_target is not None:
+                results['spatial_score'] = spatial_index.scores(spatial_target, results['player'].tolist()) * 100
+                results['match_score'] = (1 - spatial_weight) * results['match_score'] + \
+                    spatial_weight * results['spatial_score']
+            
             # Trier et limiter
             results = results.sort_values('match_score', ascending=False).head(top_n)
             
@@ -182,8 +198,13 @@ class PlayerRecommendationSystem:
                             departing_player: str,
                             df: pd.DataFrame,
                             top_n: int = 10,
-                            upgrade_factor: float = 1.0) -> pd.DataFrame:
-        """Recommande des remplaçants"""
+                            upgrade_factor: float = 1.0,
+                            spatial_index=None,
+                            spatial_weight: float = 0.0) -> pd.DataFrame:
+        """
+        Recommande des remplaçants
+        spatial_weight > 0 : favorise les joueurs qui occupent les mêmes zones (spatial_index)
+        """
         try:
             player_data = df[df['player'] == departing_player]
             
@@ -202,7 +223,10 @@ class PlayerRecommendationSystem:
             # Exclure le joueur actuel
             filtered_df = df[df['player'] != departing_player].copy()
             
-            return self.recommend_by_profile(target_profile, filtered_df, top_n)
+            return self.recommend_by_profile(target_profile, filtered_df, top_n,
+                                             spatial_target=departing_player,
+                                             spatial_index=spatial_index,
+                                             spatial_weight=spatial_weight)
             
         except Exception as e:
             print(f"❌ Erreur remplacement: {e}")
@@ -0,0 +1,369 @@
+# season_store.py
+"""
+Store colonnaire des événements d'une saison sur disque
+Un fichier NumPy par colonne (ouvert en memmap) + meta.json (colonnes, bornes des matchs) :
+ouverture d'une saison en quelques millisecondes, pages partagées entre process
+(workers, sessions Streamlit) et lecture par match ou par colonnes sans tout charger
+"""
+
+import json
+import os
+import pickle
+import shutil
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import warnings
+warnings.filterwarnings('ignore')
+
+STORE_VERSION = 2
+
+# Dossier racine des stores (ColumnarStoreSource, voir event_sources.py)
+EVENT_STORE_ENV_VAR = 'STATSBOMB_EVENT_STORE'
+DEFAULT_STORE_DIR = os.path.join('datasets', 'event_store')
+
+
+def season_store_path(root: str, competition_id: int, season_id: int) -> str:
+    return os.path.join(root, f'{competition_id}_{season_id}')
+
+
+def _json_default(value):
+    """Valeurs NumPy dans les colonnes objet (listes de coordonnées, dicts)"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+class SeasonEventStore:
+    """
+    Événements d'une saison en colonnes sur disque
+    
+    Encodage par colonne :
+    - numeric : valeurs NumPy (float, int, bool)
+    - category : codes int32 (-1 = absent) + libellés (noms, identifiants texte)
+    - point : listes [x, y] reconstruites depuis les colonnes <col>_x / <col>_y
+    - flag : booléens StatsBomb (True / NaN de statsbombpy) en float 1 / 0 / NaN, relus en objets
+    - json : valeurs imbriquées (dicts, listes) en JSON concaténé + offsets
+    Les valeurs absentes des colonnes flag / json sont relues comme à l'écriture (NaN ou None)
+    """
+    
+    META_FILE = 'meta.json'
+    
+    def __init__(self, path: str):
+        """Ouvre un store existant (lecture de meta.json uniquement)"""
+        with open(os.path.join(path, self.META_FILE), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        
+        if self.meta.get('version') != STORE_VERSION:
+            raise ValueError(f"Version de store non supportée: {self.meta.get('version')}")
+        
+        self.path = path
+        self.columns = [info['name'] for info in self.meta['columns']]
+        self._column_info = {info['name']: info for info in self.meta['columns']}
+        self._matches = {match['match_id']: match for match in self.meta['matches']}
+        self._arrays = {}
+        self._categories = {}
+    
+    @staticmethod
+    def exists(path: str) -> bool:
+        """Store présent et lisible par cette version (sinon à reconstruire)"""
+        try:
+            with open(os.path.join(path, SeasonEventStore.META_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f).get('version') == STORE_VERSION
+        except (OSError, ValueError):
+            return False
+    
+    @property
+    def n_rows(self) -> int:
+        return self.meta['n_rows']
+    
+    @property
+    def match_ids(self) -> List[int]:
+        return list(self._matches)
+    
+    def __contains__(self, match_id) -> bool:
+        return match_id in self._matches
+    
+    @classmethod
+    def write(cls, path: str,
+              frames: Union[Dict[int, pd.DataFrame], Iterable[Tuple[int, pd.DataFrame]]],
+              metadata: Optional[Dict] = None) -> 'SeasonEventStore':
+        """
+        Écrit les événements d'une saison (remplace un store existant)
+        
+        Args:
+            path: Dossier du store
+            frames: match_id -> événements (format sb.events), ou itérable de couples
+                (un générateur est consommé match par match : saisons plus grandes que la mémoire)
+            metadata: Informations ajoutées à meta.json (compétition, saison, source...)
+        
+        Returns:
+            Store ouvert en lecture
+        """
+        tmp_path = f'{path}.tmp'
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        spill_path = os.path.join(tmp_path, 'spill')
+        os.makedirs(spill_path)
+        
+        # 1. Match par match : chaque colonne est ajoutée à son fichier de débordement
+        #    (seul le match en cours est en mémoire)
+        matches = []
+        column_names = []
+        spill_files = {}
+        start = 0
+        try:
+            for match_id, events in (frames.items() if isinstance(frames, dict) else frames):
+                for column in events.columns:
+                    if column not in column_names:
+                        column_names.append(column)
+                        spill_files[column] = open(os.path.join(spill_path, f'c{len(column_names) - 1:04d}'), 'wb')
+                    pickle.dump((len(matches), events[column]), spill_files[column],
+                                protocol=pickle.HIGHEST_PROTOCOL)
+                matches.append({'match_id': int(match_id), 'start': start, 'stop': start + len(events),
+                                'columns': [column_names.index(column) for column in events.columns]})
+                start += len(events)
+        finally:
+            for spill_file in spill_files.values():
+                spill_file.close()
+        
+        # 2. Colonne par colonne : une seule colonne de la saison en mémoire à la fois
+        columns = []
+        for position, column in enumerate(column_names):
+            chunks = {}
+            spill_file_path = os.path.join(spill_path, f'c{position:04d}')
+            with open(spill_file_path, 'rb') as f:
+                while True:
+                    try:
+                        match_position, chunk = pickle.load(f)
+                    except EOFError:
+                        break
+                    chunks[match_position] = chunk.to_frame()
+            os.remove(spill_file_path)
+            
+            # Même alignement que pd.concat des DataFrames de match (colonne absente d'un match -> NaN)
+            values = pd.concat(
+                [chunks.get(match_position, pd.DataFrame(index=pd.RangeIndex(match['stop'] - match['start'])))
+                 for match_position, match in enumerate(matches)],
+                ignore_index=True
+            )[column]
+            info = cls._encode_column(values, os.path.join(tmp_path, f'c{position:04d}'),
+                                      column_names, column)
+            info['name'] = column
+            info['season_dtype'] = info['dtype']  # dtype de pd.concat des matchs (lecture de toute la saison)
+            
+            # Noms catégoriels dans les DataFrames d'origine (catégories propres à chaque match)
+            if info['kind'] == 'category' and any(isinstance(chunk[column].dtype, pd.CategoricalDtype)
+                                                  for chunk in chunks.values()):
+                info['dtype'] = 'category'
+            columns.append(info)
+            del chunks, values
+        os.rmdir(spill_path)
+        
+        meta = dict(metadata or {})
+        meta.update({
+            'version': STORE_VERSION,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'n_rows': start,
+            'columns': columns,
+            'matches': matches,
+        })
+        with open(os.path.join(tmp_path, cls.META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+        return cls(path)
+    
+    @staticmethod
+    def _encode_column(values: pd.Series, file_base: str, column_names: List[str], column: str) -> Dict:
+        """Écrit une colonne et retourne sa description (meta.json)"""
+        info = {'file': os.path.basename(file_base), 'dtype': str(values.dtype)}
+        
+        if (pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values)) \
+                and not isinstance(values.dtype, pd.CategoricalDtype):
+            np.save(f'{file_base}.npy', values.to_numpy())
+            info['kind'] = 'numeric'
+            return info
+        
+        present = values.dropna()
+        if all(isinstance(value, str) for value in present):
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                codes, categories = values.cat.codes.to_numpy(), values.cat.categories
+            else:
+                codes, categories = pd.factorize(values.astype(object))
+            np.save(f'{file_base}.npy', codes.astype(np.int32))
+            with open(f'{file_base}.categories.json', 'w', encoding='utf-8') as f:
+                json.dump([str(category) for category in categories], f, ensure_ascii=False)
+            info['kind'] = 'category'
+            return info
+        
+        # Points [x, y] déjà présents en colonnes <col>_x / <col>_y : rien à écrire
+        if f'{column}_x' in column_names and f'{column}_y' in column_names and \
+                all(isinstance(value, (list, tuple, np.ndarray)) and len(value) == 2 for value in present):
+            info['kind'] = 'point'
+            return info
+        
+        # Valeur absente d'origine : NaN (statsbombpy) ou None, restituée à la lecture
+        info['missing'] = 'none' if any(value is None for value in values) else 'nan'
+        
+        # Drapeaux True / NaN : float (comme FastEventParser), sans passer par JSON
+        if all(isinstance(value, (bool, np.bool_)) for value in present):
+            np.save(f'{file_base}.npy', pd.to_numeric(values.astype(object), errors='coerce')
+                    .to_numpy(dtype=float, na_value=np.nan))
+            info['kind'] = 'flag'
+            return info
+        
+        # Une valeur JSON par ligne, chacune suivie d'une virgule (décodage d'un bloc en un appel)
+        encoded = [
+            (json.dumps(value, default=_json_default, ensure_ascii=False) if not (
+                np.isscalar(value) and pd.isna(value)) and value is not None else 'null').encode('utf-8') + b','
+            for value in values
+        ]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(chunk) for chunk in encoded], out=offsets[1:])
+        np.save(f'{file_base}.npy', np.frombuffer(b''.join(encoded), dtype=np.uint8))
+        np.save(f'{file_base}.offsets.npy', offsets)
+        info['kind'] = 'json'
+        return info
+    
+    @classmethod
+    def build(cls, source, competition_id: int, season_id: int,
+              root: str = DEFAULT_STORE_DIR) -> 'SeasonEventStore':
+        """
+        Construit le store d'une saison depuis une source d'événements (event_sources.py)
+        Les matchs sont lus et écrits un par un ; la lecture ne charge que ce qui est demandé
+        """
+        start = time.perf_counter()
+        match_ids = source.matches(competition_id, season_id)['match_id'].tolist()
+        
+        def _frames():
+            for match_id in match_ids:
+                try:
+                    events = source.events(match_id)
+                except Exception as e:
+                    print(f"⚠️  Erreur pour match {match_id}: {e}")
+                    continue
+                yield match_id, events
+        
+        store = cls.write(season_store_path(root, competition_id, season_id), _frames(), {
+            'competition_id': competition_id,
+            'season_id': season_id,
+            'source': source.describe(),
+        })
+        print(f"🗄️ Store {competition_id}:{season_id} : {len(store.match_ids)} matchs, {store.n_rows} événements "
+              f"({time.perf_counter() - start:.1f}s)")
+        return store
+    
+    def _file(self, column: str, suffix: str = '.npy') -> str:
+        return os.path.join(self.path, self._column_info[column]['file'] + suffix)
+    
+    def _array(self, column: str) -> np.ndarray:
+        """Valeurs ou codes de la colonne en memmap (ouvert une fois)"""
+        if column not in self._arrays:
+            self._arrays[column] = np.load(self._file(column), mmap_mode='r')
+        return self._arrays[column]
+    
+    def _decode(self, column: str, start: int, stop: int, season: bool = False):
+        """Valeurs des lignes [start, stop) prêtes pour un DataFrame"""
+        info = self._column_info[column]
+        kind = info['kind']
+        dtype = info.get('season_dtype', info['dtype']) if season else info['dtype']
+        
+        if kind == 'numeric':
+            return np.asarray(self._array(column)[start:stop])
+        
+        if kind == 'category':
+            if column not in self._categories:
+                with open(self._file(column, '.categories.json'), 'r', encoding='utf-8') as f:
+                    self._categories[column] = json.load(f)
+            values = pd.Categorical.from_codes(np.asarray(self._array(column)[start:stop]),
+                                               categories=self._categories[column])
+            return values if dtype == 'category' else pd.Series(values).astype(dtype).to_numpy()
+        
+        if kind == 'point':
+            x = np.asarray(self._array(f'{column}_x')[start:stop], dtype=float)
+            y = np.asarray(self._array(f'{column}_y')[start:stop], dtype=float)
+            values = np.empty(stop - start, dtype=object)
+            values[:] = [[px, py] if px == px else None for px, py in zip(x.tolist(), y.tolist())]
+            return values
+        
+        missing = None if info.get('missing') == 'none' else np.nan
+        
+        if kind == 'flag':
+            flags = np.asarray(self._array(column)[start:stop])
+            values = np.full(stop - start, missing, dtype=object)
+            present = ~np.isnan(flags)
+            values[present] = (flags[present] != 0).tolist()
+            return values
+        
+        offsets = np.load(self._file(column, '.offsets.npy'), mmap_mode='r')
+        blob = self._array(column)[offsets[start]:offsets[stop]].tobytes()
+        values = np.empty(stop - start, dtype=object)
+        values[:] = json.loads(b'[' + blob[:-1] + b']') if stop > start else []
+        if missing is not None:
+            values[pd.isna(values)] = missing
+        return values
+    
+    def column(self, name: str, match_id: Optional[int] = None):
+        """Une colonne pour toute la saison ou un match"""
+        start, stop = (self._matches[match_id]['start'], self._matches[match_id]['stop']) \
+            if match_id is not None else (0, self.n_rows)
+        return self._decode(name, start, stop, season=match_id is None)
+    
+    def match_events(self, match_id: int, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Événements d'un match (mêmes colonnes et même ordre que la source d'origine)
+        
+        Args:
+            columns: Colonnes à lire (défaut: toutes celles du match)
+        """
+        match = self._matches[match_id]
+        match_columns = [self.columns[position] for position in match['columns']]
+        if columns is not None:
+            match_columns = [column for column in match_columns if column in columns]
+        
+        return pd.DataFrame({column: self._decode(column, match['start'], match['stop'])
+                             for column in match_columns}, columns=match_columns)
+    
+    def frame(self, columns: Optional[List[str]] = None,
+              match_ids: Optional[List[int]] = None) -> pd.DataFrame:
+        """Événements de la saison (ou de certains matchs) en un seul DataFrame"""
+        columns = [column for column in self.columns if columns is None or column in columns]
+        
+        if match_ids is None:
+            return pd.DataFrame({column: self._decode(column, 0, self.n_rows, season=True) for column in columns},
+                                columns=columns)
+        
+        frames = [self.match_events(match_id, columns) for match_id in match_ids if match_id in self._matches]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+    
+    def iter_matches(self, columns: Optional[List[str]] = None) -> Iterator[Tuple[int, pd.DataFrame]]:
+        """Matchs un par un (saisons plus grandes que la mémoire)"""
+        for match_id in self._matches:
+            yield match_id, self.match_events(match_id, columns)
+    
+    def disk_size(self) -> int:
+        """Taille du store sur disque en octets"""
+        return sum(entry.stat().st_size for entry in os.scandir(self.path) if entry.is_file())
+    
+    def summary(self) -> Dict:
+        return {
+            'path': self.path,
+            'competition_id': self.meta.get('competition_id'),
+            'season_id': self.meta.get('season_id'),
+            'matches': len(self._matches),
+            'events': self.n_rows,
+            'columns': len(self.columns),
+            'kinds': {kind: sum(1 for info in self.meta['columns'] if info['kind'] == kind)
+                      for kind in ('numeric', 'category', 'point', 'flag', 'json')},
+            'disk_mb': self.disk_size() / 1e6,
+            'created_at': self.meta.get('created_at'),
+        }
+
+
+if __name__ == "__main__":
+    print("✅ Module season_store.py chargé avec succès!")
+    print("Classe disponible: SeasonEventStore")
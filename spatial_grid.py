@@ -0,0 +1,260 @@
+# spatial_grid.py
+"""
+Grilles d'activité spatiale haute résolution (heatmaps)
+Les positions de tous les événements de tous les joueurs d'une saison sont réparties
+dans une grille nx x ny en un seul np.bincount ; les grilles par joueur sont stockées
+dans un tableau 3-D (joueurs x nx x ny)
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+from pitch import PITCH_LENGTH, PITCH_WIDTH, point_xy
+import warnings
+warnings.filterwarnings('ignore')
+
+
+DEFAULT_RESOLUTION = (12, 8)
+RESOLUTIONS = {'6×4': (6, 4), '12×8': (12, 8), '24×16': (24, 16)}
+
+# Canaux de la similarité spatiale : (types d'événements, colonne de position)
+SPATIAL_CHANNELS = {
+    'touches': (None, 'location'),
+    'pass_start': (['Pass'], 'location'),
+    'pass_end': (['Pass'], 'pass_end_location'),
+}
+DEFAULT_CHANNEL_WEIGHTS = {'touches': 0.5, 'pass_start': 0.25, 'pass_end': 0.25}
+
+
+class SpatialGrid:
+    """
+    Grilles d'activité de tous les joueurs d'une saison
+    counts[k, i, j] : événements du joueur k dans la case (i en x, j en y)
+    """
+    
+    def __init__(self, players: List[str], counts: np.ndarray):
+        """
+        Args:
+            players: Joueurs (ordre des grilles)
+            counts: Comptes (joueurs x nx x ny)
+        """
+        self.players = list(players)
+        self.counts = np.asarray(counts, dtype=np.int32)
+        self._lookup = {player: k for k, player in enumerate(self.players)}
+    
+    @classmethod
+    def from_events(cls, events: pd.DataFrame, nx: int = DEFAULT_RESOLUTION[0],
+                    ny: int = DEFAULT_RESOLUTION[1], player_col: str = 'player',
+                    event_types: Optional[List[str]] = None,
+                    location: str = 'location') -> 'SpatialGrid':
+        """
+        Grilles de tous les joueurs en une passe (événements d'un match ou d'une saison)
+        
+        Args:
+            nx, ny: Nombre de cases en longueur et en largeur
+            event_types: Types d'événements retenus (défaut: tous ceux avec une position)
+            location: Colonne de position (ex: pass_end_location pour les arrivées de passes)
+        """
+        x, y = point_xy(events, location)
+        valid = np.isfinite(x) & np.isfinite(y) & events[player_col].notna().to_numpy()
+        if event_types is not None and 'type' in events.columns:
+            valid &= events['type'].isin(event_types).to_numpy()
+        
+        codes, players = pd.factorize(events[player_col].to_numpy()[valid], sort=False)
+        ix = np.clip((x[valid] * (nx / PITCH_LENGTH)).astype(np.int64), 0, nx - 1)
+        iy = np.clip((y[valid] * (ny / PITCH_WIDTH)).astype(np.int64), 0, ny - 1)
+        
+        flat = (codes * nx + ix) * ny + iy
+        counts = np.bincount(flat, minlength=len(players) * nx * ny).reshape(len(players), nx, ny)
+        return cls(list(players), counts)
+    
+    @classmethod
+    def combine(cls, grids: List['SpatialGrid']) -> 'SpatialGrid':
+        """Somme de grilles de même résolution (ex: matchs ou saisons d'un pool)"""
+        players = list(dict.fromkeys(player for grid in grids for player in grid.players))
+        lookup = {player: k for k, player in enumerate(players)}
+        shape = grids[0].shape if grids else DEFAULT_RESOLUTION
+        counts = np.zeros((len(players),) + tuple(shape), dtype=np.int32)
+        for grid in grids:
+            if grid.shape != shape:
+                raise ValueError(f"Résolutions différentes: {grid.shape} / {shape}")
+            np.add.at(counts, [lookup[player] for player in grid.players], grid.counts)
+        return cls(players, counts)
+    
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.counts.shape[1], self.counts.shape[2]
+    
+    @property
+    def x_edges(self) -> np.ndarray:
+        return np.linspace(0, PITCH_LENGTH, self.shape[0] + 1)
+    
+    @property
+    def y_edges(self) -> np.ndarray:
+        return np.linspace(0, PITCH_WIDTH, self.shape[1] + 1)
+    
+    def __len__(self) -> int:
+        return len(self.players)
+    
+    def __contains__(self, player) -> bool:
+        return player in self._lookup
+    
+    def player_grid(self, player: str, normalize: bool = False) -> np.ndarray:
+        """
+        Grille d'un joueur (nx x ny), zéros si inconnu
+        normalize=True : part de l'activité du joueur (%) dans chaque case
+        """
+        k = self._lookup.get(player)
+        grid = self.counts[k].astype(float) if k is not None else np.zeros(self.shape)
+        if normalize and grid.sum() > 0:
+            grid = grid / grid.sum() * 100
+        return grid
+    
+    def shares(self) -> np.ndarray:
+        """Part de l'activité de chaque joueur par case (joueurs x nx x ny, somme 1 par joueur)"""
+        totals = self.counts.sum(axis=(1, 2), keepdims=True)
+        return self.counts / np.maximum(totals, 1)
+    
+    def vectors(self, players: Optional[List[str]] = None) -> np.ndarray:
+        """
+        Profils spatiaux à plat (joueurs x nx*ny), entrée des similarités
+        Lignes de zéros pour les joueurs inconnus
+        """
+        flat = self.shares().reshape(len(self.players), -1)
+        if players is None:
+            return flat
+        
+        vectors = np.zeros((len(players), flat.shape[1]))
+        rows = [(i, self._lookup[player]) for i, player in enumerate(players) if player in self._lookup]
+        if rows:
+            target, source = zip(*rows)
+            vectors[list(target)] = flat[list(source)]
+        return vectors
+    
+    def similarity_matrix(self, players: Optional[List[str]] = None) -> np.ndarray:
+        """Similarité cosinus des profils spatiaux (0 pour les joueurs sans activité)"""
+        vectors = self.vectors(players)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        unit = vectors / np.where(norms > 0, norms, 1)
+        return unit @ unit.T
+    
+    def most_similar(self, player: str, top_n: int = 10) -> pd.Series:
+        """Joueurs à l'activité spatiale la plus proche (similarité cosinus)"""
+        if player not in self._lookup:
+            return pd.Series(dtype=float)
+        
+        vectors = self.vectors()
+        norms = np.linalg.norm(vectors, axis=1)
+        target = vectors[self._lookup[player]]
+        scores = vectors @ target / np.where(norms > 0, norms, 1) / max(np.linalg.norm(target), 1e-12)
+        scores = pd.Series(scores, index=self.players)
+        return scores.drop(player).nlargest(top_n)
+    
+    def coarsen(self, fx: int, fy: int) -> 'SpatialGrid':
+        """Grille plus grossière par sommes de blocs fx x fy (ex: 24×16 -> 12×8 avec 2, 2)"""
+        nx, ny = self.shape
+        if nx % fx or ny % fy:
+            raise ValueError(f"Résolution {nx}x{ny} non divisible par {fx}x{fy}")
+        counts = self.counts.reshape(len(self.players), nx // fx, fx, ny // fy, fy).sum(axis=(2, 4))
+        return SpatialGrid(self.players, counts)
+    
+    def to_frame(self) -> pd.DataFrame:
+        """Une ligne par joueur, une colonne par case (grid_<i>_<j>)"""
+        nx, ny = self.shape
+        columns = [f'grid_{i}_{j}' for i in range(nx) for j in range(ny)]
+        return pd.DataFrame(self.counts.reshape(len(self.players), -1), columns=columns,
+                            index=pd.Index(self.players, name='player'))
+    
+    def save(self, path: str):
+        """Sauvegarde compressée (.npz)"""
+        np.savez_compressed(path, counts=self.counts, players=np.array(self.players, dtype=object))
+    
+    @classmethod
+    def load(cls, path: str) -> 'SpatialGrid':
+        data = np.load(path, allow_pickle=True)
+        return cls(data['players'].tolist(), data['counts'])
+    
+    def summary(self) -> Dict:
+        return {
+            'players': len(self.players),
+            'resolution': f'{self.shape[0]}x{self.shape[1]}',
+            'events': int(self.counts.sum()),
+            'memory_kb': round(self.counts.nbytes / 1024, 1),
+        }
+
+
+
+class SpatialSimilarityIndex:
+    """
+    Similarité spatiale précalculée entre tous les joueurs d'une saison
+    
+    Chaque canal (positions, départs et arrivées de passes) est une distribution par joueur.
+    Similarité d'un canal : coefficient de Bhattacharyya (somme des racines des produits des
+    parts ; 1 = mêmes zones, 0 = zones disjointes), un produit matriciel pour tous les couples.
+    Les canaux sont moyennés selon leurs poids, sur les canaux présents chez les deux joueurs.
+    """
+    
+    def __init__(self, grids: Dict[str, SpatialGrid], weights: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            grids: Grilles par canal (même résolution)
+            weights: Poids des canaux (défaut: DEFAULT_CHANNEL_WEIGHTS)
+        """
+        weights = weights or DEFAULT_CHANNEL_WEIGHTS
+        self.grids = grids
+        self.weights = {channel: float(weights.get(channel, 0.0)) for channel in grids}
+        self.players = list(dict.fromkeys(player for grid in grids.values() for player in grid.players))
+        self._lookup = {player: k for k, player in enumerate(self.players)}
+        
+        n = len(self.players)
+        total = np.zeros((n, n))
+        weight_sum = np.zeros((n, n))
+        for channel, grid in grids.items():
+            weight = self.weights[channel]
+            if weight <= 0:
+                continue
+            roots = np.sqrt(grid.vectors(self.players))
+            present = (roots.sum(axis=1) > 0).astype(float)
+            total += weight * (roots @ roots.T)
+            weight_sum += weight * np.outer(present, present)
+        
+        self.matrix = (total / np.where(weight_sum > 0, weight_sum, 1)).astype(np.float32)
+    
+    @classmethod
+    def from_events(cls, events: pd.DataFrame, resolution: Tuple[int, int] = DEFAULT_RESOLUTION,
+                    weights: Optional[Dict[str, float]] = None) -> 'SpatialSimilarityIndex':
+        """Grilles des canaux SPATIAL_CHANNELS puis matrice de similarité"""
+        nx, ny = resolution
+        grids = {
+            channel: SpatialGrid.from_events(events, nx, ny, event_types=event_types, location=location)
+            for channel, (event_types, location) in SPATIAL_CHANNELS.items()
+        }
+        return cls(grids, weights)
+    
+    def __len__(self) -> int:
+        return len(self.players)
+    
+    def __contains__(self, player) -> bool:
+        return player in self._lookup
+    
+    def scores(self, player: str, players: List[str]) -> np.ndarray:
+        """Similarité spatiale du joueur avec chaque joueur de la liste (0 si inconnu)"""
+        k = self._lookup.get(player)
+        if k is None:
+            return np.zeros(len(players))
+        rows = np.array([self._lookup.get(other, -1) for other in players], dtype=np.int64)
+        row = self.matrix[k]
+        return np.where(rows >= 0, row[np.maximum(rows, 0)], 0.0).astype(float)
+    
+    def most_similar(self, player: str, top_n: int = 10) -> pd.Series:
+        """Joueurs qui occupent les mêmes zones (similarité décroissante)"""
+        if player not in self._lookup:
+            return pd.Series(dtype=float)
+        scores = pd.Series(self.matrix[self._lookup[player]], index=self.players)
+        return scores.drop(player).nlargest(top_n)
+
+
+if __name__ == "__main__":
+    print("✅ Module spatial_grid.py chargé avec succès!")
+    print("Classes disponibles: SpatialGrid, SpatialSimilarityIndex")
@@ -12,11 +12,21 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime
 import os
+import tempfile
+import json
 
 # Imports des modules
-from football_recruitment_app import FootballRecruitmentAnalyzer
+from football_recruitment_app import FootballRecruitmentAnalyzer, ULTRA_AVAILABLE
 from recommendation_system import PlayerRecommendationSystem
 from advanced_visualizations import AdvancedPlayerVisualizations
+from pdf_reports import ScoutingReportGenerator
+from data_export import DataExporter, ARROW_AVAILABLE
+from competition_catalog import CompetitionCatalog
+from player_pool import PlayerPoolBuilder
+from profiling import report_to_frame
+from advanced_metrics import AdvancedMetrics
+from advanced_ml_system import AdvancedPlayerAnalyzer
+from spatial_grid import RESOLUTIONS, DEFAULT_RESOLUTION
 
 # 🎨 CONFIGURATION PAGE
 st.set_page_config(
@@ -75,6 +85,11 @@ def init_analyzer():
     """Initialise l'analyseur (en cache)"""
     return FootballRecruitmentAnalyzer()
 
+@st.cache_resource
+def init_catalog():
+    """Charge le catalogue local des saisons (None s'il n'a pas été construit)"""
+    return CompetitionCatalog.load()
+
 @st.cache_resource
 def init_recommender():
     """Initialise le système de recommandation (en cache)"""
@@ -92,9 +107,45 @@ if 'analyzer' not in st.session_state:
     st.session_state.recommender = None
     st.session_state.player_stats = None
     st.session_state.visualizer = init_visualizer()
+    st.session_state.loaded_season = None  # (competition_id, season_id) ; None pour un pool
 
 analyzer = st.session_state.analyzer
 
+
+def season_spatial_grid(resolution=DEFAULT_RESOLUTION):
+    """Grilles d'activité de la saison chargée (None pour un pool multi-saisons)"""
+    season = st.session_state.get('loaded_season')
+    if season is None:
+        return None
+    try:
+        return analyzer.get_spatial_grid(*season, resolution)
+    except Exception as e:
+        st.warning(f"⚠️ Grilles d'activité indisponibles: {e}")
+        return None
+
+
+def season_spatial_similarity():
+    """Similarité spatiale de la saison chargée (None pour un pool multi-saisons)"""
+    season = st.session_state.get('loaded_season')
+    if season is None:
+        return None
+    try:
+        return analyzer.get_spatial_similarity(*season)
+    except Exception as e:
+        st.warning(f"⚠️ Similarité spatiale indisponible: {e}")
+        return None
+
+
+def season_advanced_ml():
+    """Système ML avancé entraîné sur les données chargées (réentraîné si elles changent)"""
+    df = st.session_state.player_stats
+    if st.session_state.get('advanced_ml_source') is not df:
+        advanced_ml = AdvancedPlayerAnalyzer()
+        fitted = advanced_ml.fit(df, analyzer.select_features('all'))
+        st.session_state.advanced_ml = advanced_ml if fitted else None
+        st.session_state.advanced_ml_source = df
+    return st.session_state.advanced_ml
+
 # 📊 HEADER
 col1, col2, col3 = st.columns([1, 2, 1])
 with col2:
@@ -124,6 +175,11 @@ with st.sidebar:
         "NWSL 2018": (49, 3),
     }
     
+    # Catalogue local : toutes les saisons disponibles
+    catalog = init_catalog()
+    if catalog is not None and catalog.options():
+        competitions = catalog.options()
+    
     competition_choice = st.selectbox(
         "🏆 Compétition",
         options=list(competitions.keys()),
@@ -131,6 +187,32 @@ with st.sidebar:
     )
     
     competition_id, season_id = competitions[competition_choice]
+    st.caption(f"Source des événements : {analyzer.event_source.describe()}")
+    
+    season_info = catalog.get(competition_id, season_id) if catalog is not None else None
+    if season_info:
+        updated = (season_info['last_match_updated'] or season_info['match_updated'] or '')[:10]
+        st.caption(f"📅 {season_info['match_count']} matchs · "
+                   f"{catalog.season_bytes(competition_id, season_id) / 1e6:.0f} Mo d'événements"
+                   + (f" · mis à jour le {updated}" if updated else ""))
+    
+    with st.expander("🗂️ Catalogue des saisons"):
+        if catalog is not None:
+            st.caption(f"{len(catalog.available_seasons())} saisons disponibles · construit le {catalog.built_at}")
+        else:
+            st.caption("Catalogue non construit : liste de compétitions par défaut")
+        
+        if st.button("🔄 Construire le catalogue", use_container_width=True):
+            catalog_progress = st.progress(0.0)
+            new_catalog = CompetitionCatalog.build(
+                analyzer.event_source,
+                progress_callback=lambda done, total: catalog_progress.progress(done / total)
+            )
+            if catalog is not None:
+                new_catalog.observed_throughput = catalog.observed_throughput
+            new_catalog.save()
+            init_catalog.clear()
+            st.rerun()
     
     # 🆕 MODE ULTRA
     st.markdown("---")
@@ -142,11 +224,39 @@ with st.sidebar:
         help="Active l'extraction de 100+ métriques (plus long mais plus complet)"
     )
     
+    estimate = catalog.estimate_load_seconds(competition_id, season_id, ultra_mode) if season_info else None
+    
+    ultra_families = None
     if ultra_mode:
         st.info("🔥 Mode ULTRA activé : 100+ métriques seront extraites")
-        st.warning("⏳ Temps de chargement : ~30-60 secondes")
+        if ULTRA_AVAILABLE:
+            from ultra_advanced_metrics import METRIC_REGISTRY
+            all_families = list(METRIC_REGISTRY.families)
+            selected_families = st.multiselect(
+                "🧩 Familles de métriques",
+                all_families,
+                default=all_families,
+                help="Chargement ciblé : seules les familles choisies sont calculées (ex: defensive + duels)"
+            )
+            if selected_families and len(selected_families) < len(all_families):
+                ultra_families = selected_families
+                estimate = None  # Estimation du catalogue : saison complète
+        if estimate is not None:
+            st.warning(f"⏳ Temps de chargement estimé : ~{estimate:.0f} secondes")
+        elif ultra_families is not None:
+            st.caption(f"🎯 Chargement ciblé : {len(ultra_families)} famille(s) sur {len(all_families)}")
+        else:
+            st.warning("⏳ Temps de chargement : ~30-60 secondes")
     else:
         st.info("⚡ Mode Normal : 40 métriques (rapide)")
+        if estimate is not None:
+            st.caption(f"⏳ Temps de chargement estimé : ~{estimate:.0f} secondes")
+    
+    analyzer.profile = st.checkbox(
+        "⏱️ Profiler le chargement",
+        value=analyzer.profile,
+        help="Mesure chaque étape (fetch, parsing, familles de métriques, agrégation)"
+    )
     
     st.markdown("---")
     
@@ -156,14 +266,22 @@ with st.sidebar:
     if load_button:
         with st.spinner(f"{'🚀 Chargement ULTRA' if ultra_mode else '📊 Chargement'} des données..."):
             try:
+                load_start = datetime.now()
                 if ultra_mode:
-                    df = analyzer.load_statsbomb_data_ultra(competition_id, season_id)
+                    df = analyzer.load_statsbomb_data_ultra(competition_id, season_id,
+                                                            metrics=ultra_families)
                 else:
                     df = analyzer.load_statsbomb_data(competition_id, season_id)
                 
                 if not df.empty:
+                    # Durée réelle enregistrée pour affiner les estimations du catalogue
+                    if season_info and ultra_families is None:
+                        catalog.record_load(competition_id, season_id, ultra_mode,
+                                            (datetime.now() - load_start).total_seconds())
+                        catalog.save()
                     st.session_state.player_stats = df
                     st.session_state.data_loaded = True
+                    st.session_state.loaded_season = (competition_id, season_id)
                     st.success(f"✅ {len(df)} joueurs chargés!")
                     st.rerun()
                 else:
@@ -172,6 +290,44 @@ with st.sidebar:
             except Exception as e:
                 st.error(f"❌ Erreur: {e}")
     
+    # 🌍 POOL MULTI-SAISONS
+    with st.expander("🌍 Pool multi-saisons"):
+        pool_choices = st.multiselect(
+            "Saisons à fusionner",
+            options=list(competitions.keys()),
+            help="Les stats par match déjà calculées (dossier datasets/) sont réutilisées"
+        )
+        
+        pool_level = st.radio(
+            "Niveau d'agrégation",
+            ["Joueur par saison", "Joueur (toutes saisons)"],
+            help="Une ligne par joueur et par saison, ou une ligne par joueur"
+        )
+        
+        if st.button("📥 Charger le pool", use_container_width=True, disabled=len(pool_choices) < 2):
+            pool_progress = st.progress(0.0)
+            try:
+                builder = PlayerPoolBuilder(analyzer, mode='ultra' if ultra_mode else 'normal')
+                df = builder.build(
+                    [competitions[choice] for choice in pool_choices],
+                    progress_callback=lambda done, total: pool_progress.progress(done / total)
+                )
+                
+                if pool_level == "Joueur (toutes saisons)":
+                    df = builder.use_career_stats()
+                
+                if not df.empty:
+                    st.session_state.player_stats = df
+                    st.session_state.data_loaded = True
+                    st.session_state.recommender = None
+                    st.session_state.loaded_season = None
+                    st.success(f"✅ {len(df)} lignes chargées ({len(pool_choices)} saisons)")
+                    st.rerun()
+                else:
+                    st.error("❌ Aucune donnée chargée")
+            except Exception as e:
+                st.error(f"❌ Erreur: {e}")
+    
     # Infos sur les données
     if st.session_state.data_loaded:
         st.markdown("---")
@@ -181,11 +337,36 @@ with st.sidebar:
         st.metric("Features", len(df.columns))
         st.metric("Matchs", df['matches_played'].sum() if 'matches_played' in df.columns else 0)
         
+        if analyzer.load_profile:
+            with st.expander("⏱️ Profil du dernier chargement"):
+                profile_df = report_to_frame(analyzer.load_profile)
+                st.caption(f"{analyzer.load_profile['wall_time']:.1f}s au total · durées cumulées sur les workers")
+                st.dataframe(
+                    profile_df[['section', 'calls', 'total', 'mean']].head(20),
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        'section': 'Étape',
+                        'calls': 'Appels',
+                        'total': st.column_config.NumberColumn('Total (s)', format="%.2f"),
+                        'mean': st.column_config.NumberColumn('Moy. (s)', format="%.4f"),
+                    }
+                )
+                st.caption(" · ".join(f"{name}: {value}" for name, value in analyzer.load_profile['counters'].items()))
+                st.download_button(
+                    "💾 Rapport JSON",
+                    data=json.dumps(analyzer.load_profile, indent=2),
+                    file_name="profil_chargement.json",
+                    mime="application/json",
+                    use_container_width=True
+                )
+        
         # Bouton pour réinitialiser
         if st.button("🔄 Recharger", use_container_width=True):
             st.session_state.data_loaded = False
             st.session_state.player_stats = None
             st.session_state.recommender = None
+            st.session_state.loaded_season = None
             st.rerun()
 
 # 📊 CONTENU PRINCIPAL
@@ -430,7 +611,8 @@ with tab1:
     
     # Créer le scatter plot
     if x_axis and y_axis:
-        plot_df = df[[x_axis, y_axis, size_by, 'player', 'team']].dropna()
+        # Colonnes uniques (un même champ peut servir d'axe et de taille)
+        plot_df = df[list(dict.fromkeys([x_axis, y_axis, size_by, 'player', 'team']))].dropna()
         
         fig = px.scatter(
             plot_df,
@@ -446,6 +628,97 @@ with tab1:
         fig.update_layout(height=500)
         st.plotly_chart(fig, use_container_width=True)
     
+    # Forme du moment (séries par match)
+    st.markdown("---")
+    st.subheader("🔥 Forme du Moment")
+    
+    form_store = analyzer.get_form_store()
+    if form_store is None:
+        st.info("Stats par match non disponibles - rechargez les données pour calculer la forme")
+    else:
+        form_metrics_choices = [m for m in ['goals', 'xG', 'assists', 'key_passes', 'shots',
+                                            'dribbles_completed', 'tackles', 'interceptions']
+                                if m in form_store.metrics] or form_store.metrics[:10]
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            form_metric = st.selectbox("Métrique", form_metrics_choices, key='form_metric')
+        
+        with col2:
+            form_window = st.radio(
+                "Fenêtre",
+                ["5 derniers matchs", "10 derniers matchs", "Moyenne exponentielle"],
+                horizontal=True,
+                key='form_window'
+            )
+        
+        with col3:
+            form_min_matches = st.slider("Matchs minimum", 1, 10, 3, key='form_min_matches')
+        
+        window = {"5 derniers matchs": 5, "10 derniers matchs": 10}.get(form_window)
+        form_top = form_store.rank_by_form(form_metric, window=window, top_n=10, min_matches=form_min_matches)
+        
+        if form_top.empty:
+            st.info("Pas assez de matchs pour calculer la forme")
+        else:
+            form_col = f'{form_metric}_last{window}' if window else f'{form_metric}_ewm'
+            
+            fig = px.bar(
+                form_top,
+                x=form_col,
+                y='player',
+                orientation='h',
+                title=f'{form_metric} par match - {form_window}',
+                color=f'{form_metric}_form_delta',
+                color_continuous_scale='RdYlGn',
+                text=form_col,
+                hover_data=['team', 'matches_played', f'{form_metric}_season']
+            )
+            fig.update_traces(texttemplate='%{text:.2f}', textposition='outside')
+            fig.update_layout(height=400, yaxis={'categoryorder': 'total ascending'},
+                              coloraxis_colorbar={'title': 'vs période'})
+            st.plotly_chart(fig, use_container_width=True)
+            st.caption("Couleur : forme récente (EWM) comparée à la moyenne du joueur sur la période")
+    
+    # Classement d'efficacité (pondérations ajustables)
+    st.markdown("---")
+    st.subheader("🏅 Classement d'Efficacité")
+    
+    profile_labels = {'all': 'Global', 'forward': 'Attaquant', 'midfielder': 'Milieu', 'defender': 'Défenseur'}
+    base_profile = st.selectbox(
+        "Pondération de départ",
+        list(AdvancedMetrics.EFFICIENCY_PROFILES),
+        format_func=lambda key: profile_labels.get(key, key),
+        key='efficiency_base_profile'
+    )
+    base_weights = AdvancedMetrics.EFFICIENCY_PROFILES[base_profile]
+    
+    with st.expander("⚖️ Ajuster les poids"):
+        weight_metrics = list(dict.fromkeys(
+            metric for weights in AdvancedMetrics.EFFICIENCY_PROFILES.values() for metric in weights
+        ))
+        custom_weights = {}
+        weight_cols = st.columns(3)
+        for position, metric in enumerate(weight_metrics):
+            with weight_cols[position % 3]:
+                custom_weights[metric] = st.slider(
+                    metric, 0.0, 0.5, float(base_weights.get(metric, 0.0)), 0.01,
+                    key=f'efficiency_weight_{base_profile}_{metric}'
+                )
+        st.caption("Normalisation : taux /100, matchs /30, autres métriques /10 (plafonnées à 1)")
+    
+    weight_sets = {'Personnalisé': custom_weights}
+    weight_sets.update({profile_labels.get(key, key): weights
+                        for key, weights in AdvancedMetrics.EFFICIENCY_PROFILES.items()})
+    efficiency = AdvancedMetrics.calculate_efficiency_score_matrix(df, weight_sets)
+    
+    id_cols = [col for col in ['player', 'team', 'matches_played'] if col in df.columns]
+    efficiency_table = pd.concat([df[id_cols], efficiency], axis=1)
+    efficiency_table = efficiency_table.sort_values('Personnalisé', ascending=False).head(15)
+    st.dataframe(efficiency_table, use_container_width=True, hide_index=True)
+    st.caption("Scores 0-100 pour chaque pondération, calculés en une passe pour tous les joueurs")
+    
     # Tableau complet
     st.markdown("---")
     st.subheader("📋 Tableau Complet des Joueurs")
@@ -516,7 +789,7 @@ with tab2:
     
     st.markdown("""
         Trouvez des joueurs avec un profil statistique similaire en utilisant la similarité cosinus
-        sur les métriques clés de performance.
+        sur les métriques clés de performance, éventuellement combinée aux zones d'activité.
     """)
     
     st.markdown("---")
@@ -547,13 +820,26 @@ with tab2:
     with col1:
         top_n = st.slider("Nombre de résultats", 5, 20, 10)
     
+    with col2:
+        spatial_weight = 0.0
+        if st.session_state.get('loaded_season') is not None:
+            spatial_weight = st.slider(
+                "🗺️ Poids du profil spatial",
+                0.0, 1.0, 0.0, 0.1,
+                help="0 = statistiques seules, 1 = zones d'activité seules "
+                     "(positions, départs et arrivées de passes)",
+                key='similar_spatial_weight'
+            )
+    
     if st.button("🔎 Trouver des joueurs similaires", type="primary", use_container_width=True):
         with st.spinner("🔍 Recherche en cours..."):
             try:
                 similar = analyzer.find_similar_players(
                     target_player=selected_player,
                     top_n=top_n,
-                    position=position_filter
+                    position=position_filter,
+                    spatial_weight=spatial_weight,
+                    spatial_index=season_spatial_similarity() if spatial_weight > 0 else None
                 )
                 
                 if not similar.empty:
@@ -598,7 +884,9 @@ with tab2:
                     st.markdown("### 📊 Comparaison Détaillée")
                     
                     # Sélectionner colonnes pertinentes
-                    compare_cols = ['player', 'team', 'similarity_score', 'matches_played']
+                    compare_cols = ['player', 'team'] + [c for c in ['competition', 'season'] if c in similar.columns]
+                    compare_cols += [c for c in ['similarity_score', 'stat_similarity', 'spatial_similarity']
+                                     if c in similar.columns] + ['matches_played']
                     stat_cols = ['goals_per_90', 'assists_per_90', 'passes_per_90', 'tackles_per_90', 'dribbles_per_90']
                     compare_cols.extend([col for col in stat_cols if col in similar.columns])
                     
@@ -918,11 +1206,22 @@ with tab3:
                 st.info("🎯 Recherche d'un profil identique")
             
             results_count_replacement = st.slider("Nombre de résultats", 5, 20, 10, key='replacement_results_count')
+            
+            replacement_spatial_weight = 0.0
+            if st.session_state.get('loaded_season') is not None:
+                replacement_spatial_weight = st.slider(
+                    "🗺️ Mêmes zones d'activité",
+                    0.0, 1.0, 0.0, 0.1,
+                    help="Part de la similarité spatiale avec le joueur sortant dans le score",
+                    key='replacement_spatial_weight'
+                )
         
         if st.button("🔍 Trouver des remplaçants", type="primary", use_container_width=True, key='replacement_search'):
             with st.spinner(f"🤖 Recherche de remplaçants pour {departing}..."):
                 results = recommender.recommend_replacement(
-                    departing, df, top_n=results_count_replacement, upgrade_factor=upgrade
+                    departing, df, top_n=results_count_replacement, upgrade_factor=upgrade,
+                    spatial_index=season_spatial_similarity() if replacement_spatial_weight > 0 else None,
+                    spatial_weight=replacement_spatial_weight
                 )
                 
                 if not results.empty:
@@ -1027,7 +1326,8 @@ with tab4:
                 fig = viz.create_complete_player_profile(
                     player_data=player_data,
                     league_data=df,
-                    player_name=player_profile
+                    player_name=player_profile,
+                    spatial_grid=season_spatial_grid()
                 )
                 
                 st.pyplot(fig)
@@ -1051,6 +1351,60 @@ with tab4:
     
     st.markdown("---")
     
+    # Projection : modèle ML + forme récente (séries par match)
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        st.subheader("🔮 Projection de Performance")
+    
+    with col2:
+        months_ahead = st.selectbox("Horizon (mois)", [3, 6, 12], index=1, key='projection_months')
+    
+    if st.button("🔮 Projeter", use_container_width=True, key='projection_button'):
+        with st.spinner("🧠 Entraînement du modèle de projection..."):
+            advanced_ml = season_advanced_ml()
+        
+        if advanced_ml is None:
+            st.error("❌ Modèle de projection indisponible (pas assez de données)")
+        else:
+            form_store = analyzer.get_form_store()
+            form_stats = (form_store.form_table(metrics=['goals'])
+                          if form_store is not None and 'goals' in form_store.metrics else None)
+            
+            prediction = advanced_ml.predict_future_performance(
+                player_profile, df, months_ahead=months_ahead, form_stats=form_stats
+            )
+            
+            if not prediction or 'error' in prediction:
+                st.error(f"❌ Projection impossible: {prediction.get('error', 'erreur inconnue')}")
+            else:
+                col1, col2, col3, col4 = st.columns(4)
+                
+                with col1:
+                    st.metric("Buts/90 (saison)", f"{prediction['current_goals_per_90']:.3f}")
+                
+                with col2:
+                    st.metric("Buts/90 (modèle)", f"{prediction['predicted_goals_per_90']:.3f}")
+                
+                with col3:
+                    st.metric(
+                        f"Projection à {months_ahead} mois",
+                        f"{prediction['future_prediction']:.3f}",
+                        delta=round(prediction['future_prediction'] - prediction['current_goals_per_90'], 3)
+                    )
+                
+                with col4:
+                    st.metric("Confiance", f"{prediction['confidence']:.0f}%")
+                
+                if 'form_delta' in prediction:
+                    st.caption(f"Forme récente (EWM) : {prediction['recent_goals_per_90']:.3f} buts/match "
+                               f"({prediction['form_delta']:+.3f} vs moyenne de la période) - "
+                               "la tendance combine le modèle et cette dynamique")
+                else:
+                    st.caption("Forme récente indisponible : tendance issue du modèle seul")
+    
+    st.markdown("---")
+    
     # Stats détaillées par catégorie avec graphiques
     st.subheader("📊 Statistiques Détaillées par Catégorie")
     
@@ -1284,8 +1638,42 @@ with tab4:
                             st.metric(f"{icon} {label}", f"{float(value):.2f}")
         
         with col2:
+            # Heatmap haute résolution (événements de la saison chargée)
+            resolution = None
+            if st.session_state.get('loaded_season') is not None:
+                resolution_label = st.radio(
+                    "Résolution de la heatmap",
+                    ['3×3 (zones)'] + list(RESOLUTIONS),
+                    horizontal=True,
+                    key='heatmap_resolution'
+                )
+                resolution = RESOLUTIONS.get(resolution_label)
+            
+            spatial_grid = season_spatial_grid(resolution) if resolution else None
+            if spatial_grid is not None and player_profile in spatial_grid:
+                nx, ny = spatial_grid.shape
+                grid = spatial_grid.player_grid(player_profile, normalize=True)
+                x_centers = (spatial_grid.x_edges[:-1] + spatial_grid.x_edges[1:]) / 2
+                y_centers = (spatial_grid.y_edges[:-1] + spatial_grid.y_edges[1:]) / 2
+                
+                st.markdown("#### 🗺️ Heatmap d'activité")
+                fig = go.Figure(data=go.Heatmap(
+                    z=grid.T,
+                    x=x_centers,
+                    y=y_centers,
+                    colorscale='YlOrRd',
+                    hovertemplate='x=%{x:.0f} y=%{y:.0f}<br>%{z:.1f}%<extra></extra>'
+                ))
+                fig.update_layout(
+                    title=f"Part de l'activité par case ({nx}×{ny}, attaque vers la droite)",
+                    xaxis=dict(range=[0, 120], title=''),
+                    yaxis=dict(range=[80, 0], title='', showticklabels=False),
+                    height=350
+                )
+                st.plotly_chart(fig, use_container_width=True)
+            
             # Heatmap simplifié
-            if any(f'zone_{z}' in player_data.index for z in ['att_left', 'att_center', 'att_right']):
+            elif any(f'zone_{z}' in player_data.index for z in ['att_left', 'att_center', 'att_right']):
                 st.markdown("#### 🗺️ Heatmap d'activité")
                 
                 zones_data = []
@@ -1361,6 +1749,29 @@ with tab5:
     st.markdown("---")
     st.subheader("💾 Export CSV")
     
+    compress_csv = st.checkbox(
+        "🗜️ Compresser en gzip (.csv.gz)",
+        value=False,
+        help="Compression à la volée pendant l'écriture, fichier beaucoup plus léger"
+    )
+    csv_extension = 'csv.gz' if compress_csv else 'csv'
+    csv_mime = 'application/gzip' if compress_csv else 'text/csv'
+    
+    def _csv_download_button(export_df, label, file_name):
+        """Écrit le CSV par blocs dans un fichier temporaire et le sert au téléchargement"""
+        csv_path = DataExporter.write_csv_stream(export_df, compress=compress_csv)
+        try:
+            with open(csv_path, 'rb') as f:
+                st.download_button(
+                    label=label,
+                    data=f,
+                    file_name=file_name,
+                    mime=csv_mime,
+                    use_container_width=True
+                )
+        finally:
+            os.remove(csv_path)
+    
     col1, col2 = st.columns(2)
     
     with col1:
@@ -1368,13 +1779,10 @@ with tab5:
         st.markdown("Téléchargez toutes les données de la compétition")
         
         if st.button("📥 Télécharger CSV Complet", use_container_width=True):
-            csv = df.to_csv(index=False)
-            st.download_button(
-                label="⬇️ Télécharger le fichier CSV",
-                data=csv,
-                file_name=f"football_data_{competition_choice.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv",
-                use_container_width=True
+            _csv_download_button(
+                df,
+                "⬇️ Télécharger le fichier CSV",
+                f"football_data_{competition_choice.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.{csv_extension}"
             )
     
     with col2:
@@ -1389,14 +1797,142 @@ with tab5:
         
         if selected_players_export:
             filtered_export = df[df['player'].isin(selected_players_export)]
-            csv = filtered_export.to_csv(index=False)
+            _csv_download_button(
+                filtered_export,
+                f"⬇️ Télécharger {len(selected_players_export)} joueur(s)",
+                f"selection_{len(selected_players_export)}_joueurs_{datetime.now().strftime('%Y%m%d')}.{csv_extension}"
+            )
+    
+    # Export colonnaire
+    st.markdown("---")
+    st.subheader("🗜️ Export Parquet / Arrow")
+    
+    if not ARROW_AVAILABLE:
+        st.info("📦 Installez pyarrow pour activer l'export Parquet/Arrow")
+    else:
+        st.markdown("Format typé et compressé, lu directement par les entrepôts de données")
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            columnar_format = st.radio(
+                "📁 Format",
+                options=['Parquet', 'Arrow IPC'],
+                horizontal=True
+            )
+        
+        with col2:
+            compression_options = (DataExporter.PARQUET_COMPRESSIONS if columnar_format == 'Parquet'
+                                   else DataExporter.ARROW_COMPRESSIONS)
+            compression = st.selectbox("🗜️ Compression", options=compression_options)
+        
+        with col3:
+            use_float32 = st.checkbox(
+                "🔢 Décimales en float32",
+                value=False,
+                help="Divise par deux la taille des métriques décimales (précision ~7 chiffres)"
+            )
+        
+        export_columns = st.multiselect(
+            "📋 Colonnes à exporter",
+            options=list(df.columns),
+            default=list(df.columns),
+            help="Seules les colonnes sélectionnées sont écrites"
+        )
+        
+        if export_columns and st.button("🗜️ Préparer l'export", use_container_width=True):
+            try:
+                if columnar_format == 'Parquet':
+                    data = DataExporter.export_parquet(df, export_columns, compression, use_float32)
+                    extension, mime = 'parquet', 'application/vnd.apache.parquet'
+                else:
+                    data = DataExporter.export_arrow_ipc(df, export_columns, compression, use_float32)
+                    extension, mime = 'arrow', 'application/vnd.apache.arrow.file'
+                
+                st.success(f"✅ {len(export_columns)} colonnes - {len(data) / 1024:.0f} Ko")
+                st.download_button(
+                    label=f"⬇️ Télécharger le fichier {columnar_format}",
+                    data=data,
+                    file_name=f"football_data_{competition_choice.replace(' ', '_')}_{datetime.now().strftime('%Y%m%d')}.{extension}",
+                    mime=mime,
+                    use_container_width=True
+                )
+            except Exception as e:
+                st.error(f"❌ Erreur export: {e}")
+    
+    # Rapports PDF en lot
+    st.markdown("---")
+    st.subheader("📄 Rapports PDF en lot")
+    st.markdown("Générez les rapports de scouting d'une shortlist (un process par rapport)")
+    
+    shortlist_players = st.multiselect(
+        "Joueurs de la shortlist",
+        options=sorted(df['player'].unique()),
+        max_selections=30,
+        key='pdf_shortlist',
+        help="Un rapport PDF par joueur, regroupés dans une archive zip"
+    )
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        club_name = st.text_input("🏟️ Nom du club", value="Football Club", key='pdf_club')
+    with col2:
+        include_profile = st.checkbox(
+            "🎨 Inclure le profil visuel complet",
+            value=False,
+            help="Ajoute le profil 6-en-1 à chaque rapport (plus long)"
+        )
+    
+    if shortlist_players and st.button("📄 Générer les rapports", use_container_width=True):
+        # Homonymes (autre équipe, autre saison d'un pool) : un rapport chacun
+        report_keys = [col for col in ['player', 'team', 'competition', 'season'] if col in df.columns]
+        shortlist_df = df[df['player'].isin(shortlist_players)].drop_duplicates(report_keys)
+        
+        # Joueurs similaires calculés une seule fois dans le process principal
+        similar_players = {}
+        for player in shortlist_df['player'].unique():
+            try:
+                similar_players[player] = analyzer.find_similar_players(player, top_n=10)
+            except Exception:
+                similar_players[player] = pd.DataFrame()
+        
+        progress = st.progress(0.0, text="📄 Génération des rapports...")
+        
+        def _update_progress(done, total, player):
+            progress.progress(done / total, text=f"📄 {done}/{total} - {player}")
+        
+        try:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                zip_path = os.path.join(tmp_dir, 'rapports.zip')
+                generator = ScoutingReportGenerator(club_name)
+                batch = generator.generate_batch_reports(
+                    shortlist_df,
+                    similar_players=similar_players,
+                    league_data=df if include_profile else None,
+                    zip_path=zip_path,
+                    progress_callback=_update_progress
+                )
+                
+                with open(zip_path, 'rb') as f:
+                    zip_bytes = f.read()
+            
+            st.success(f"✅ {len(batch['generated'])} rapport(s) générés en {batch['duration']:.1f}s")
+            
+            if batch['failed']:
+                st.warning(f"⚠️ {len(batch['failed'])} rapport(s) en échec")
+                with st.expander("🔍 Détails des échecs"):
+                    for player, error in batch['failed'].items():
+                        st.text(f"• {player}: {error}")
+            
             st.download_button(
-                label=f"⬇️ Télécharger {len(selected_players_export)} joueur(s)",
-                data=csv,
-                file_name=f"selection_{len(selected_players_export)}_joueurs_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv",
+                label="⬇️ Télécharger les rapports (ZIP)",
+                data=zip_bytes,
+                file_name=f"rapports_scouting_{datetime.now().strftime('%Y%m%d')}.zip",
+                mime="application/zip",
                 use_container_width=True
             )
+        except Exception as e:
+            st.error(f"❌ Erreur génération des rapports: {e}")
     
     st.markdown("---")
     
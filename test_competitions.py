@@ -3,25 +3,25 @@
 Script pour tester les combinaisons competition_id/season_id disponibles
 """
 
-import requests
+from event_sources import get_event_source
 
-def test_competition(comp_id, season_id, name):
-    """Teste si une combinaison existe"""
-    url = f"https://raw.githubusercontent.com/statsbomb/open-data/master/data/matches/{comp_id}/{season_id}.json"
-    try:
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            print(f"✅ {name}: ({comp_id}, {season_id}) - OK")
-            return True
-        else:
-            print(f"❌ {name}: ({comp_id}, {season_id}) - NOT FOUND")
-            return False
-    except Exception as e:
-        print(f"❌ {name}: ({comp_id}, {season_id}) - ERROR: {e}")
+# Miroir local si STATSBOMB_OPEN_DATA est défini, sinon GitHub
+source = get_event_source()
+
+def test_competition(comp_id, season_id, name, available):
+    """Affiche le résultat du test d'une combinaison"""
+    if available is None:
+        print(f"❌ {name}: ({comp_id}, {season_id}) - ERROR")
+        return False
+    elif available:
+        print(f"✅ {name}: ({comp_id}, {season_id}) - OK")
+        return True
+    else:
+        print(f"❌ {name}: ({comp_id}, {season_id}) - NOT FOUND")
         return False
 
 # Tester toutes les combinaisons
-print("🔍 Test des compétitions StatsBomb...\n")
+print(f"🔍 Test des compétitions StatsBomb ({source.describe()})...\n")
 
 competitions_to_test = [
     # Premier League
@@ -63,8 +63,11 @@ competitions_to_test = [
 
 valid_competitions = {}
 
+# Toutes les combinaisons testées en parallèle (une seule session HTTP avec la source asynchrone)
+results = source.has_seasons([(comp_id, season_id) for comp_id, season_id, _ in competitions_to_test])
+
 for comp_id, season_id, name in competitions_to_test:
-    if test_competition(comp_id, season_id, name):
+    if test_competition(comp_id, season_id, name, results[(comp_id, season_id)]):
         valid_competitions[name] = (comp_id, season_id)
 
 print("\n" + "="*50)
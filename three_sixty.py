@@ -0,0 +1,181 @@
+# three_sixty.py
+"""
+Freeze frames StatsBomb 360 et métriques de contexte spatial
+Les joueurs visibles de tous les événements d'un match sont stockés dans des tableaux
+plats (x, y, coéquipier, acteur, gardien) ; chaque événement pointe vers sa tranche
+(offsets). Les métriques de contexte sont calculées pour tous les événements en une passe.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, List
+
+from pitch import GOAL_X, GOAL_POSTS_Y, point_xy
+import warnings
+warnings.filterwarnings('ignore')
+
+
+RECEPTION_RADIUS = 5.0        # Rayon (yards) des adversaires proches du receveur
+LINE_BREAK_MIN_OPPONENTS = 2  # Adversaires de champ dépassés pour une passe qui casse une ligne
+
+# Colonnes ajoutées aux événements par FreezeFrames.annotate (NaN sans freeze frame)
+CONTEXT_COLUMNS = ['ff_visible_players', 'ff_defenders_between', 'ff_opponents_nearby',
+                   'ff_opponents_bypassed', 'ff_line_breaking']
+
+
+class FreezeFrames:
+    """
+    Freeze frames 360 d'un match en tableaux plats
+    Les joueurs de l'événement k sont les lignes offsets[k]:offsets[k + 1]
+    """
+    
+    def __init__(self, event_ids: List[str], offsets: np.ndarray, x: np.ndarray, y: np.ndarray,
+                 teammate: np.ndarray, actor: np.ndarray, keeper: np.ndarray):
+        self.event_ids = list(event_ids)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.teammate = np.asarray(teammate, dtype=bool)
+        self.actor = np.asarray(actor, dtype=bool)
+        self.keeper = np.asarray(keeper, dtype=bool)
+        self._lookup = {event_id: k for k, event_id in enumerate(self.event_ids)}
+    
+    @classmethod
+    def from_raw(cls, raw: list) -> 'FreezeFrames':
+        """Depuis le JSON three-sixty/<match_id>.json (liste de frames)"""
+        event_ids = []
+        sizes = []
+        players = []
+        for frame in raw:
+            freeze_frame = frame.get('freeze_frame') or []
+            event_ids.append(frame['event_uuid'])
+            sizes.append(len(freeze_frame))
+            players.extend(freeze_frame)
+        
+        offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+        locations = np.array([player.get('location') or [np.nan, np.nan] for player in players],
+                             dtype=float).reshape(-1, 2)
+        return cls(
+            event_ids, offsets, locations[:, 0], locations[:, 1],
+            [bool(player.get('teammate')) for player in players],
+            [bool(player.get('actor')) for player in players],
+            [bool(player.get('keeper')) for player in players],
+        )
+    
+    @classmethod
+    def from_frame(cls, frames: pd.DataFrame) -> 'FreezeFrames':
+        """Depuis le format sb.frames (une ligne par joueur visible, colonne id = événement)"""
+        if frames is None or frames.empty:
+            return cls([], np.zeros(1, dtype=np.int64), [], [], [], [], [])
+        
+        codes, event_ids = pd.factorize(frames['id'], sort=False)
+        order = np.argsort(codes, kind='stable')
+        frames = frames.iloc[order]
+        offsets = np.searchsorted(codes[order], np.arange(len(event_ids) + 1))
+        x, y = point_xy(frames, 'location')
+        flags = {col: frames[col].fillna(False).astype(bool).to_numpy() if col in frames.columns
+                 else np.zeros(len(frames), dtype=bool) for col in ['teammate', 'actor', 'keeper']}
+        return cls(list(event_ids), offsets, x, y, flags['teammate'], flags['actor'], flags['keeper'])
+    
+    def __len__(self) -> int:
+        return len(self.event_ids)
+    
+    def __contains__(self, event_id) -> bool:
+        return event_id in self._lookup
+    
+    def positions(self, event_ids) -> np.ndarray:
+        """Numéro de frame de chaque événement (-1 sans freeze frame)"""
+        return np.array([self._lookup.get(event_id, -1) for event_id in event_ids], dtype=np.int64)
+    
+    def event_players(self, event_id) -> pd.DataFrame:
+        """Joueurs visibles d'un événement (x, y, teammate, actor, keeper)"""
+        k = self._lookup.get(event_id)
+        start, stop = (self.offsets[k], self.offsets[k + 1]) if k is not None else (0, 0)
+        return pd.DataFrame({
+            'x': self.x[start:stop], 'y': self.y[start:stop],
+            'teammate': self.teammate[start:stop], 'actor': self.actor[start:stop],
+            'keeper': self.keeper[start:stop],
+        })
+    
+    def context_metrics(self, events: pd.DataFrame) -> pd.DataFrame:
+        """
+        Métriques de contexte de chaque événement (index des événements, colonnes CONTEXT_COLUMNS)
+        
+        - ff_visible_players : joueurs visibles sur la freeze frame
+        - ff_defenders_between : adversaires (gardien compris) dans le triangle ballon - poteaux
+        - ff_opponents_nearby : adversaires à moins de RECEPTION_RADIUS du ballon
+        - ff_opponents_bypassed : passes, adversaires de champ entre le départ et l'arrivée (en x)
+        - ff_line_breaking : passe réussie vers l'avant dépassant LINE_BREAK_MIN_OPPONENTS adversaires
+        """
+        result = pd.DataFrame(np.nan, index=events.index, columns=CONTEXT_COLUMNS)
+        if len(self) == 0 or 'id' not in events.columns or events.empty:
+            return result
+        
+        frame_pos = self.positions(events['id'].to_numpy())
+        rows = np.flatnonzero(frame_pos >= 0)
+        if len(rows) == 0:
+            return result
+        
+        # Une ligne par (événement, joueur visible) : tranches concaténées
+        starts = self.offsets[frame_pos[rows]]
+        sizes = self.offsets[frame_pos[rows] + 1] - starts
+        owner = np.repeat(np.arange(len(rows)), sizes)
+        flat = np.repeat(starts - (np.cumsum(sizes) - sizes), sizes) + np.arange(sizes.sum())
+        
+        px, py = self.x[flat], self.y[flat]
+        opponent = ~self.teammate[flat]
+        outfield_opponent = opponent & ~self.keeper[flat]
+        
+        ball_x, ball_y = point_xy(events, 'location')
+        bx, by = ball_x[rows][owner], ball_y[rows][owner]
+        
+        # Triangle ballon - poteaux : même signe des trois produits vectoriels
+        vertices = [(bx, by), (np.full_like(bx, GOAL_X), np.full_like(bx, GOAL_POSTS_Y[0])),
+                    (np.full_like(bx, GOAL_X), np.full_like(bx, GOAL_POSTS_Y[1]))]
+        crosses = [
+            (x2 - x1) * (py - y1) - (y2 - y1) * (px - x1)
+            for (x1, y1), (x2, y2) in zip(vertices, vertices[1:] + vertices[:1])
+        ]
+        inside = ((crosses[0] >= 0) & (crosses[1] >= 0) & (crosses[2] >= 0)) | \
+                 ((crosses[0] <= 0) & (crosses[1] <= 0) & (crosses[2] <= 0))
+        
+        nearby = np.hypot(px - bx, py - by) <= RECEPTION_RADIUS
+        
+        end_x = point_xy(events, 'pass_end_location')[0][rows]
+        bypassed = outfield_opponent & (px > bx) & (px < end_x[owner])
+        
+        def count(mask: np.ndarray) -> np.ndarray:
+            return np.bincount(owner, weights=mask, minlength=len(rows))
+        
+        result.iloc[rows, 0] = sizes
+        result.iloc[rows, 1] = count(opponent & inside)
+        result.iloc[rows, 2] = count(opponent & nearby)
+        
+        is_pass = np.isfinite(end_x)
+        n_bypassed = count(bypassed)
+        result.iloc[rows, 3] = np.where(is_pass, n_bypassed, np.nan)
+        
+        completed = events['pass_outcome'].isna().to_numpy()[rows] if 'pass_outcome' in events.columns \
+            else np.ones(len(rows), dtype=bool)
+        forward = end_x > ball_x[rows]
+        line_breaking = completed & forward & (n_bypassed >= LINE_BREAK_MIN_OPPONENTS)
+        result.iloc[rows, 4] = np.where(is_pass, line_breaking.astype(float), np.nan)
+        return result
+    
+    def annotate(self, events: pd.DataFrame) -> pd.DataFrame:
+        """Copie des événements avec les colonnes CONTEXT_COLUMNS"""
+        context = self.context_metrics(events)
+        return events.assign(**{col: context[col] for col in CONTEXT_COLUMNS})
+    
+    def summary(self) -> Dict:
+        return {
+            'frames': len(self),
+            'players': int(self.offsets[-1]),
+            'players_per_frame': round(float(self.offsets[-1]) / max(len(self), 1), 1),
+        }
+
+
+if __name__ == "__main__":
+    print("✅ Module three_sixty.py chargé avec succès!")
+    print("Classe disponible: FreezeFrames")
@@ -6,7 +6,13 @@ Version robuste qui ne crashe JAMAIS
 
 import pandas as pd
 import numpy as np
-from typing import Dict
+from typing import Dict, List, Optional, Set, Tuple
+from profiling import profiled
+from event_store import PlayerEventIndex
+from three_sixty import FreezeFrames, CONTEXT_COLUMNS
+from possession_chains import PossessionChains, CHAIN_COLUMNS
+from expected_threat import ExpectedThreatModel, XT_COLUMN, default_model
+from expected_goals import ExpectedGoalsModel, fill_missing_xg
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -15,41 +21,79 @@ class UltraAdvancedMetricsExtractor:
     """Extracteur complet et robuste de 100+ métriques avancées"""
     
     @staticmethod
-    def extract_all_metrics(events: pd.DataFrame, match_id: int) -> pd.DataFrame:
+    def extract_all_metrics(events: pd.DataFrame, match_id: int,
+                            metrics: Optional[List[str]] = None,
+                            freeze_frames: Optional[FreezeFrames] = None,
+                            xt_model: Optional[ExpectedThreatModel] = None,
+                            xg_model: Optional[ExpectedGoalsModel] = None,
+                            use_default_models: bool = True) -> pd.DataFrame:
         """
         Extrait 100+ métriques avec gestion d'erreur maximale
         Retourne TOUJOURS un DataFrame valide
+        
+        Args:
+            metrics: Métriques, familles ou features agrégées à calculer (voir METRIC_REGISTRY).
+                None : toutes les familles. Sinon seules les familles nécessaires sont
+                calculées, sur les seuls types d'événements et colonnes qu'elles lisent.
+            freeze_frames: Freeze frames 360 du match (famille three_sixty, voir three_sixty.py).
+                Sans freeze frames, la famille three_sixty ne produit aucune colonne.
+            xt_model: Grille xT (famille expected_threat, voir expected_threat.py). Défaut :
+                modèle persisté par `python expected_threat.py` ; sans modèle, aucune colonne.
+            xg_model: Modèle xG local pour les tirs sans shot_statsbomb_xg (voir expected_goals.py).
+                Défaut : modèle persisté par `python expected_goals.py` ; sans modèle, xG inchangés.
+            use_default_models: False : ni grille xT ni modèle xG persistés, seuls xt_model / xg_model
+                fournis sont utilisés (benchmarks, goldens indépendants du dossier courant)
         """
         try:
             if events is None or len(events) == 0:
                 return pd.DataFrame()
             
+            families, keep = METRIC_REGISTRY.resolve(metrics)
+            
+            # xG local des tirs sans shot_statsbomb_xg, en un lot pour tout le match
+            events = fill_missing_xg(events, xg_model, use_default_models)
+            
+            # Contexte 360 de chaque événement, calculé sur tout le match avant le découpage par joueur
+            if freeze_frames is not None and any(family.name == 'three_sixty' for family in families):
+                events = freeze_frames.annotate(events)
+            
+            # Crédits des chaînes de possession (xGChain, SCA...), une passe sur tout le match
+            if 'possession' in events.columns and any(family.name == 'possession' for family in families):
+                events = PossessionChains(events).annotate(events)
+            
+            # xT ajouté par chaque passe / conduite : lecture vectorisée de la grille
+            if any(family.name == 'expected_threat' for family in families):
+                if xt_model is None and use_default_models:
+                    xt_model = default_model()
+                if xt_model is not None:
+                    events = xt_model.annotate(events)
+            
+            scoped = METRIC_REGISTRY.scope_events(events, families) if metrics is not None else events
+            
+            # Équipe : premier événement du joueur, tous types confondus
+            players = events.drop_duplicates('player').dropna(subset=['player'])
+            index = PlayerEventIndex(scoped)
+            
             stats_list = []
             
-            for player in events['player'].dropna().unique():
-                player_events = events[events['player'] == player]
-                
-                if len(player_events) == 0:
-                    continue
+            for player, team in zip(players['player'], players['team']):
+                # Ordre chronologique : xA cherche le tir dans les événements suivants
+                player_events = index.player_events(player, chronological=True)
                 
                 # Informations de base
                 stats = {
                     'match_id': match_id,
                     'player': player,
-                    'team': player_events['team'].iloc[0] if len(player_events) > 0 else None,
+                    'team': team,
                 }
                 
-                # TOUTES LES MÉTRIQUES
-                stats.update(UltraAdvancedMetricsExtractor._extract_basic_metrics(player_events))
-                stats.update(UltraAdvancedMetricsExtractor._extract_pass_metrics(player_events))
-                stats.update(UltraAdvancedMetricsExtractor._extract_shot_metrics(player_events))
-                stats.update(UltraAdvancedMetricsExtractor._extract_defensive_metrics(player_events))
-                stats.update(UltraAdvancedMetricsExtractor._extract_dribble_carry_metrics(player_events))
-                stats.update(UltraAdvancedMetricsExtractor._extract_duel_metrics(player_events))
-                stats.update(UltraAdvancedMetricsExtractor._extract_positional_metrics(player_events))
-                stats.update(UltraAdvancedMetricsExtractor._extract_pressure_metrics(player_events))
-                stats.update(UltraAdvancedMetricsExtractor._extract_special_events(player_events))
-                stats.update(UltraAdvancedMetricsExtractor._extract_expected_metrics(player_events))
+                # Familles demandées (TOUTES par défaut)
+                for family in families:
+                    stats.update(family.extract(player_events))
+                
+                if keep is not None:
+                    stats = {key: value for key, value in stats.items()
+                             if key in keep or key in ('match_id', 'player', 'team')}
                 
                 stats_list.append(stats)
             
@@ -60,6 +104,7 @@ class UltraAdvancedMetricsExtractor:
             return pd.DataFrame()
     
     @staticmethod
+    @profiled('ultra._extract_basic_metrics')
     def _extract_basic_metrics(events: pd.DataFrame) -> Dict:
         """📊 Métriques de base (8 métriques)"""
         try:
@@ -77,6 +122,7 @@ class UltraAdvancedMetricsExtractor:
             return {}
     
     @staticmethod
+    @profiled('ultra._extract_pass_metrics')
     def _extract_pass_metrics(events: pd.DataFrame) -> Dict:
         """🎯 PASSES : 25+ métriques détaillées"""
         try:
@@ -253,6 +299,7 @@ class UltraAdvancedMetricsExtractor:
             return {}
     
     @staticmethod
+    @profiled('ultra._extract_shot_metrics')
     def _extract_shot_metrics(events: pd.DataFrame) -> Dict:
         """⚽ TIRS : 20+ métriques détaillées"""
         try:
@@ -388,6 +435,7 @@ class UltraAdvancedMetricsExtractor:
             return {}
     
     @staticmethod
+    @profiled('ultra._extract_defensive_metrics')
     def _extract_defensive_metrics(events: pd.DataFrame) -> Dict:
         """🛡️ DÉFENSE : 20+ métriques détaillées"""
         try:
@@ -484,6 +532,7 @@ class UltraAdvancedMetricsExtractor:
             return {}
     
     @staticmethod
+    @profiled('ultra._extract_dribble_carry_metrics')
     def _extract_dribble_carry_metrics(events: pd.DataFrame) -> Dict:
         """🏃 DRIBBLES & CARRIES : 15+ métriques"""
         try:
@@ -578,6 +627,7 @@ class UltraAdvancedMetricsExtractor:
             return {}
     
     @staticmethod
+    @profiled('ultra._extract_duel_metrics')
     def _extract_duel_metrics(events: pd.DataFrame) -> Dict:
         """⚔️ DUELS : 12+ métriques"""
         try:
@@ -653,6 +703,7 @@ class UltraAdvancedMetricsExtractor:
             return {}
     
     @staticmethod
+    @profiled('ultra._extract_positional_metrics')
     def _extract_positional_metrics(events: pd.DataFrame) -> Dict:
         """📍 POSITION & ZONES : 18+ métriques"""
         try:
@@ -733,6 +784,7 @@ class UltraAdvancedMetricsExtractor:
             return {}
     
     @staticmethod
+    @profiled('ultra._extract_pressure_metrics')
     def _extract_pressure_metrics(events: pd.DataFrame) -> Dict:
         """💪 PRESSING : 8+ métriques"""
         try:
@@ -796,6 +848,7 @@ class UltraAdvancedMetricsExtractor:
             return {}
     
     @staticmethod
+    @profiled('ultra._extract_special_events')
     def _extract_special_events(events: pd.DataFrame) -> Dict:
         """⭐ ÉVÉNEMENTS SPÉCIAUX : 10+ métriques"""
         try:
@@ -837,6 +890,7 @@ class UltraAdvancedMetricsExtractor:
             return {}
     
     @staticmethod
+    @profiled('ultra._extract_expected_metrics')
     def _extract_expected_metrics(events: pd.DataFrame) -> Dict:
         """📊 xG & xA AVANCÉS : 10+ métriques"""
         try:
@@ -932,10 +986,281 @@ class UltraAdvancedMetricsExtractor:
             return metrics
         except:
             return {}
+    
+    @staticmethod
+    @profiled('ultra._extract_360_metrics')
+    def _extract_360_metrics(events: pd.DataFrame) -> Dict:
+        """🛰️ CONTEXTE 360 : 10 métriques (événements annotés par FreezeFrames.annotate)"""
+        try:
+            if 'ff_visible_players' not in events.columns:
+                return {}
+            
+            framed = events[events['ff_visible_players'].notna()]
+            shots = framed[framed['type'] == 'Shot']
+            passes = framed[framed['type'] == 'Pass']
+            receptions = framed[framed['type'] == 'Ball Receipt*']
+            
+            return {
+                # Tirs : adversaires entre le ballon et le but
+                'shots_360': len(shots),
+                'shot_defenders_between': float(shots['ff_defenders_between'].sum()),
+                'shots_unobstructed': int((shots['ff_defenders_between'] <= 1).sum()),
+                
+                # Passes : lignes cassées
+                'passes_360': len(passes),
+                'pass_defenders_between': float(passes['ff_defenders_between'].sum()),
+                'line_breaking_passes': int(passes['ff_line_breaking'].sum()),
+                'opponents_bypassed': float(passes['ff_opponents_bypassed'].sum()),
+                
+                # Réceptions : adversaires proches du receveur
+                'receptions_360': len(receptions),
+                'receptions_under_pressure_360': int((receptions['ff_opponents_nearby'] > 0).sum()),
+                'reception_opponents_nearby': float(receptions['ff_opponents_nearby'].sum()),
+            }
+        except:
+            return {}
+    
+    @staticmethod
+    @profiled('ultra._extract_possession_metrics')
+    def _extract_possession_metrics(events: pd.DataFrame) -> Dict:
+        """🔗 CHAÎNES DE POSSESSION : 7 métriques (événements annotés par PossessionChains.annotate)"""
+        try:
+            if 'chain_xg_credit' not in events.columns:
+                return {}
+            
+            sca = events['sca_credit']
+            return {
+                'possessions_involved': int(events['chain_involvement'].sum()),
+                'xg_chain': float(events['chain_xg_credit'].sum()),
+                'xg_buildup': float(events['chain_buildup_credit'].sum()),
+                'shot_creating_actions': int(sca.sum()),
+                'goal_creating_actions': int(events['gca_credit'].sum()),
+                'sca_passes': int(sca[events['type'] == 'Pass'].sum()),
+                'sca_dribbles': int(sca[events['type'] == 'Dribble'].sum()),
+            }
+        except:
+            return {}
+    
+    @staticmethod
+    @profiled('ultra._extract_expected_threat_metrics')
+    def _extract_expected_threat_metrics(events: pd.DataFrame) -> Dict:
+        """📈 EXPECTED THREAT : 4 métriques (événements annotés par ExpectedThreatModel.annotate)"""
+        try:
+            if XT_COLUMN not in events.columns:
+                return {}
+            
+            xt = events[XT_COLUMN]
+            return {
+                'xt_added': float(xt.sum()),
+                'xt_added_passes': float(xt[events['type'] == 'Pass'].sum()),
+                'xt_added_carries': float(xt[events['type'] == 'Carry'].sum()),
+                'xt_positive_actions': int((xt > 0).sum()),
+            }
+        except:
+            return {}
+
+
+
+class MetricFamily:
+    """
+    Famille de métriques ULTRA : méthode _extract_* et entrées qu'elle lit
+    event_types=None : la famille a besoin de tous les événements du joueur
+    """
+    
+    def __init__(self, name: str, extractor: str, metrics: List[str],
+                 event_types: Optional[List[str]] = None, columns: Optional[List[str]] = None):
+        self.name = name
+        self.extractor = extractor
+        self.metrics = list(metrics)
+        self.event_types = set(event_types) if event_types is not None else None
+        self.columns = ['type'] + list(columns or [])
+    
+    def extract(self, events: pd.DataFrame) -> Dict:
+        return getattr(UltraAdvancedMetricsExtractor, self.extractor)(events)
+
+
+class MetricRegistry:
+    """
+    Registre des métriques ULTRA : famille, types d'événements et colonnes lus par chaque
+    métrique, dépendances des features calculées après agrégation
+    """
+    
+    PER_MATCH_SUFFIX = '_per_90'
+    
+    # Ratios calculés par _aggregate_season_stats à partir des sommes de la saison
+    DERIVED_METRICS = {
+        'pass_completion_rate': ['passes', 'passes_completed'],
+        'shot_accuracy': ['shots', 'shots_on_target'],
+        'dribble_success_rate': ['dribbles', 'dribbles_completed'],
+        'goal_conversion': ['goals', 'shots'],
+    }
+    
+    def __init__(self, families: List[MetricFamily]):
+        self.families = {family.name: family for family in families}
+        self._family_of = {}
+        for family in families:
+            for metric in family.metrics:
+                self._family_of[metric] = family.name
+    
+    def metric_names(self) -> List[str]:
+        """Toutes les métriques par match, dans l'ordre des colonnes extraites"""
+        return list(self._family_of)
+    
+    def family_of(self, metric: str) -> Optional[str]:
+        return self._family_of.get(metric)
+    
+    def dependencies(self, name: str) -> List[str]:
+        """
+        Métriques par match nécessaires à une métrique, une famille ou une feature agrégée
+        (xG_per_90 -> xG, pass_completion_rate -> passes + passes_completed)
+        """
+        if name in self.families:
+            return list(self.families[name].metrics)
+        if name in self._family_of:
+            return [name]
+        if name in self.DERIVED_METRICS:
+            return list(self.DERIVED_METRICS[name])
+        if name.endswith(self.PER_MATCH_SUFFIX):
+            return self.dependencies(name[:-len(self.PER_MATCH_SUFFIX)])
+        return []
+    
+    def unknown(self, requested: List[str]) -> List[str]:
+        """Noms demandés qui ne correspondent à aucune métrique (ignorés par resolve)"""
+        return [name for name in requested if not self.dependencies(name)]
+    
+    def resolve(self, requested: Optional[List[str]]) -> Tuple[List[MetricFamily], Optional[Set[str]]]:
+        """
+        Familles à calculer (ordre du registre) et métriques à conserver
+        requested=None : toutes les familles, toutes les colonnes
+        """
+        if requested is None:
+            return list(self.families.values()), None
+        
+        keep = set()
+        for name in requested:
+            keep.update(self.dependencies(name))
+        
+        needed = {self._family_of[metric] for metric in keep}
+        return [family for name, family in self.families.items() if name in needed], keep
+    
+    def scope_events(self, events: pd.DataFrame, families: List[MetricFamily]) -> pd.DataFrame:
+        """
+        Événements lus par les familles : filtre sur les types (sauf si une famille a besoin
+        de tous les événements) et sur les colonnes, avant le découpage par joueur
+        """
+        columns = ['player', 'team']
+        event_types = set()
+        for family in families:
+            columns += [col for col in family.columns if col not in columns]
+            if family.event_types is None:
+                event_types = None
+            elif event_types is not None:
+                event_types |= family.event_types
+        
+        columns = [col for col in columns if col in events.columns]
+        if event_types is None or 'type' not in events.columns:
+            return events[columns]
+        return events.loc[events['type'].isin(event_types), columns]
+
 
+METRIC_REGISTRY = MetricRegistry([
+    MetricFamily('basic', '_extract_basic_metrics',
+                 ['passes', 'passes_completed', 'shots', 'goals', 'tackles', 'interceptions',
+                  'clearances', 'dribbles'],
+                 event_types=['Pass', 'Shot', 'Duel', 'Interception', 'Clearance', 'Dribble'],
+                 columns=['pass_outcome', 'shot_outcome']),
+    MetricFamily('passing', '_extract_pass_metrics',
+                 ['key_passes', 'assists', 'short_passes', 'medium_passes', 'long_passes',
+                  'through_balls', 'crosses', 'switches', 'cutbacks', 'passes_under_pressure',
+                  'ground_passes', 'high_passes', 'lofted_passes', 'forward_passes',
+                  'backward_passes', 'lateral_passes', 'passes_into_box', 'passes_into_final_third',
+                  'progressive_passes', 'progressive_distance_passes', 'corners', 'free_kick_passes',
+                  'throw_ins'],
+                 event_types=['Pass'],
+                 columns=['location', 'pass_end_location', 'pass_length', 'pass_height', 'pass_type',
+                          'pass_shot_assist', 'pass_goal_assist', 'pass_through_ball', 'pass_cross',
+                          'pass_switch', 'pass_cut_back', 'under_pressure']),
+    MetricFamily('shooting', '_extract_shot_metrics',
+                 ['shots_on_target', 'xG', 'shots_open_play', 'shots_free_kick', 'shots_penalty',
+                  'shots_corner', 'shots_right_foot', 'shots_left_foot', 'shots_head', 'shots_other',
+                  'shots_first_time', 'shots_volley', 'shots_one_on_one', 'shots_deflected',
+                  'shots_saved', 'shots_blocked', 'shots_off_target', 'shots_post', 'shots_wayward',
+                  'big_chances', 'shots_from_outside_box'],
+                 event_types=['Shot'],
+                 columns=['location', 'shot_outcome', 'shot_statsbomb_xg', 'shot_type', 'shot_body_part',
+                          'shot_technique', 'shot_first_time', 'shot_one_on_one', 'shot_deflected']),
+    MetricFamily('defensive', '_extract_defensive_metrics',
+                 ['blocks', 'ball_recoveries', 'ball_recoveries_defensive_third',
+                  'ball_recoveries_middle_third', 'ball_recoveries_attacking_third', 'errors',
+                  'dispossessed', 'miscontrol', 'fouls_committed', 'fouls_won', 'goalkeeper_actions',
+                  'goalkeeper_saves', 'goalkeeper_punches', 'goalkeeper_high_claims',
+                  'goalkeeper_smother', 'goalkeeper_shot_saved', 'goalkeeper_success',
+                  'yellow_cards', 'red_cards', 'second_yellow'],
+                 event_types=['Block', 'Ball Recovery', 'Error', 'Dispossessed', 'Miscontrol',
+                              'Foul Committed', 'Foul Won', 'Goal Keeper'],
+                 columns=['location', 'goalkeeper_type', 'foul_committed_card']),
+    MetricFamily('dribbling', '_extract_dribble_carry_metrics',
+                 ['dribbles_completed', 'dribbles_failed', 'dribbles_past_opponent', 'nutmegs',
+                  'carries', 'carry_distance', 'carry_progressive_distance', 'progressive_carries',
+                  'carries_into_box', 'carries_into_final_third', 'carries_into_attacking_third',
+                  'dribbles_under_pressure'],
+                 event_types=['Dribble', 'Carry'],
+                 columns=['location', 'carry_end_location', 'dribble_outcome', 'dribble_nutmeg',
+                          'under_pressure']),
+    MetricFamily('duels', '_extract_duel_metrics',
+                 ['duels_total', 'duels_won', 'duels_lost', 'duels_neutral', 'aerial_duels',
+                  'aerial_duels_won', 'ground_duels', 'ground_duels_won', 'loose_ball_duels',
+                  'loose_ball_duels_won', 'duels_under_pressure'],
+                 event_types=['Duel'],
+                 columns=['duel_type', 'duel_outcome', 'under_pressure']),
+    MetricFamily('positional', '_extract_positional_metrics',
+                 ['actions_defensive_third', 'actions_middle_third', 'actions_attacking_third',
+                  'zone_def_left', 'zone_def_center', 'zone_def_right', 'zone_mid_left',
+                  'zone_mid_center', 'zone_mid_right', 'zone_att_left', 'zone_att_center',
+                  'zone_att_right', 'touches', 'touches_in_box', 'touches_in_box_attacking',
+                  'touches_in_box_defensive', 'touches_central_areas', 'touches_wing_left',
+                  'touches_wing_right'],
+                 columns=['location']),
+    MetricFamily('pressing', '_extract_pressure_metrics',
+                 ['pressures', 'pressures_successful', 'pressures_failed', 'pressures_defensive_third',
+                  'pressures_middle_third', 'pressures_attacking_third', 'pressures_high',
+                  'pressures_intensity'],
+                 event_types=['Pressure'],
+                 columns=['location', 'pressure_outcome']),
+    MetricFamily('special', '_extract_special_events',
+                 ['offsides', '50_50', 'bad_behaviour', 'substitution_on', 'substitution_off',
+                  'injury_stoppage', 'shield', 'player_on', 'player_off', 'starting_xi'],
+                 event_types=['Offside', '50/50', 'Bad Behaviour', 'Substitution', 'Injury Stoppage',
+                              'Shield', 'Player On', 'Player Off', 'Starting XI', 'Tactical Shift'],
+                 columns=['substitution_replacement', 'tactics']),
+    # xA : tir suivant une passe clé parmi les 10 événements suivants du joueur (tous types)
+    MetricFamily('expected', '_extract_expected_metrics',
+                 ['xG_total', 'xG_open_play', 'xG_set_piece', 'xG_per_shot', 'xG_head', 'xG_foot',
+                  'xA_total', 'xA_from_crosses', 'xA_from_through_balls', 'xA_per_key_pass'],
+                 columns=['shot_statsbomb_xg', 'shot_type', 'shot_body_part', 'pass_shot_assist',
+                          'pass_cross', 'pass_through_ball']),
+    # Freeze frames 360 : colonnes ff_* ajoutées par extract_all_metrics (voir three_sixty.py)
+    MetricFamily('three_sixty', '_extract_360_metrics',
+                 ['shots_360', 'shot_defenders_between', 'shots_unobstructed', 'passes_360',
+                  'pass_defenders_between', 'line_breaking_passes', 'opponents_bypassed',
+                  'receptions_360', 'receptions_under_pressure_360', 'reception_opponents_nearby'],
+                 event_types=['Shot', 'Pass', 'Ball Receipt*'],
+                 columns=CONTEXT_COLUMNS),
+    # Chaînes de possession : colonnes de crédit ajoutées par extract_all_metrics (voir possession_chains.py)
+    MetricFamily('possession', '_extract_possession_metrics',
+                 ['possessions_involved', 'xg_chain', 'xg_buildup', 'shot_creating_actions',
+                  'goal_creating_actions', 'sca_passes', 'sca_dribbles'],
+                 columns=CHAIN_COLUMNS),
+    # Expected Threat : colonne xt_added ajoutée par extract_all_metrics (voir expected_threat.py)
+    MetricFamily('expected_threat', '_extract_expected_threat_metrics',
+                 ['xt_added', 'xt_added_passes', 'xt_added_carries', 'xt_positive_actions'],
+                 event_types=['Pass', 'Carry'],
+                 columns=[XT_COLUMN]),
+])
 
 if __name__ == "__main__":
     print("✅ Module ultra_advanced_metrics.py COMPLET chargé !")
     print("📊 Extrait 100+ métriques depuis StatsBomb")
     print("🛡️ Version ultra-robuste qui ne crashe jamais")
+    print(f"🧩 Registre: {len(METRIC_REGISTRY.families)} familles, {len(METRIC_REGISTRY.metric_names())} métriques")
     print("🚀 Prêt pour le mode ULTRA !")